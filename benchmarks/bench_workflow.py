@@ -0,0 +1,274 @@
+"""End-to-end benchmark of the plan/review loop.
+
+Drives WorkflowController.write_plan, review_plan, respond_to_comments and
+execute_step through many iterations against stand-in agent executables
+(see fake_agent.py) and reports time-to-first-chunk, per-phase wall time,
+chunk throughput, peak RSS and state-save cost.
+
+Usage:
+    python benchmarks/bench_workflow.py --output results.json
+    python benchmarks/bench_workflow.py --baseline results.json --threshold 0.2
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "src"))
+
+from agent_collab.config import Config  # noqa: E402
+from agent_collab.engine import Phase, WorkflowController  # noqa: E402
+from agent_collab.persistence import WorkflowState, save_state  # noqa: E402
+
+# Metrics where a larger value is better; everything else is lower-is-better.
+HIGHER_IS_BETTER = {"chunks_per_sec", "bytes_per_sec"}
+
+
+def _summary(samples: list[float]) -> dict[str, float]:
+    """Summarize timing samples (seconds)."""
+    if not samples:
+        return {"count": 0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+    ordered = sorted(samples)
+    return {
+        "count": len(samples),
+        "mean": statistics.fmean(samples),
+        "p50": ordered[len(ordered) // 2],
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "max": ordered[-1],
+    }
+
+
+def _install_fake_agents(bin_dir: Path) -> None:
+    """Create `claude` and `codex` executables that run fake_agent.py."""
+    for name in ("claude", "codex"):
+        path = bin_dir / name
+        path.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{BENCH_DIR / "fake_agent.py"}" "$@"\n')
+        path.chmod(0o755)
+
+
+class TurnTimer:
+    """Records time-to-first-chunk and throughput across agent turns."""
+
+    def __init__(self) -> None:
+        self.ttfc: list[float] = []
+        self.chunks = 0
+        self.bytes = 0
+        self.stream_time = 0.0
+        self._start = 0.0
+        self._first_seen = False
+
+    def start(self) -> None:
+        self._start = time.perf_counter()
+        self._first_seen = False
+
+    def on_output(self, text: str) -> None:
+        if not self._first_seen:
+            self.ttfc.append(time.perf_counter() - self._start)
+            self._first_seen = True
+        self.chunks += 1
+        self.bytes += len(text.encode())
+
+    def stop(self) -> None:
+        self.stream_time += time.perf_counter() - self._start
+
+
+async def _run_workflow(args: argparse.Namespace, timer: TurnTimer,
+                        phases: dict[str, list[float]], saves: list[float]) -> None:
+    """Run one full plan -> review loop -> execute workflow."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_root = Path(tmpdir)
+        os.environ["FAKE_AGENT_STATE_DIR"] = tmpdir
+
+        config = Config()
+        config.workflow.max_iterations = args.iterations
+        config.agents.structured_output = args.structured
+        config.get_workdir(project_root).mkdir(parents=True, exist_ok=True)
+
+        controller = WorkflowController(project_root, config, on_output=timer.on_output)
+        controller.state.phase = Phase.REFINE_GOAL
+
+        original_save = controller._save_state
+
+        def timed_save() -> None:
+            start = time.perf_counter()
+            original_save()
+            saves.append(time.perf_counter() - start)
+
+        controller._save_state = timed_save
+
+        async def timed(phase: str, coro) -> None:
+            timer.start()
+            start = time.perf_counter()
+            await coro
+            phases.setdefault(phase, []).append(time.perf_counter() - start)
+            timer.stop()
+
+        await timed("write_plan", controller.write_plan())
+        while True:
+            await timed("review_plan", controller.review_plan())
+            if controller.state.phase == Phase.APPROVED or controller.is_max_iterations():
+                break
+            await timed("respond_to_comments", controller.respond_to_comments())
+
+        if controller.state.phase == Phase.APPROVED:
+            for step in range(1, args.steps + 1):
+                await timed("execute_step", controller.execute_step(step, f"Step {step}"))
+
+        await controller.close()
+
+
+def _bench_save_state(count: int) -> list[float]:
+    """Time raw save_state calls."""
+    samples = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "state.json"
+        state = WorkflowState(phase=Phase.REVIEW, iteration=3, planner_session="p", reviewer_session="r")
+        for i in range(count):
+            state.iteration = i
+            start = time.perf_counter()
+            save_state(state, path)
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+def run_benchmark(args: argparse.Namespace) -> dict:
+    """Run the benchmark and return results as a dict."""
+    os.environ.update({
+        "FAKE_AGENT_STARTUP": str(args.startup),
+        "FAKE_AGENT_CHUNKS": str(args.chunks),
+        "FAKE_AGENT_CHUNK_SIZE": str(args.chunk_size),
+        "FAKE_AGENT_DELAY": str(args.delay),
+        "FAKE_AGENT_PLAN_STEPS": str(args.steps),
+        "FAKE_AGENT_APPROVE_AFTER": str(args.iterations),
+    })
+
+    timer = TurnTimer()
+    phases: dict[str, list[float]] = {}
+    saves: list[float] = []
+
+    with tempfile.TemporaryDirectory() as bin_dir:
+        _install_fake_agents(Path(bin_dir))
+        os.environ["PATH"] = f"{bin_dir}{os.pathsep}{os.environ['PATH']}"
+        start = time.perf_counter()
+        for _ in range(args.runs):
+            asyncio.run(_run_workflow(args, timer, phases, saves))
+        total = time.perf_counter() - start
+
+    save_samples = _bench_save_state(args.save_samples)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "runs": args.runs,
+            "iterations": args.iterations,
+            "steps": args.steps,
+            "chunks": args.chunks,
+            "chunk_size": args.chunk_size,
+            "delay": args.delay,
+            "startup": args.startup,
+            "structured": args.structured,
+        },
+        "metrics": {
+            "total_wall": total,
+            "ttfc": _summary(timer.ttfc),
+            "phases": {name: _summary(samples) for name, samples in sorted(phases.items())},
+            "chunks_per_sec": timer.chunks / timer.stream_time if timer.stream_time else 0.0,
+            "bytes_per_sec": timer.bytes / timer.stream_time if timer.stream_time else 0.0,
+            "state_save_in_workflow": _summary(saves),
+            "state_save": _summary(save_samples),
+            "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            "peak_child_rss_kb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+        },
+    }
+
+
+def _flatten(metrics: dict, prefix: str = "") -> dict[str, float]:
+    """Flatten nested metrics into dotted keys, skipping sample counts."""
+    flat: dict[str, float] = {}
+    for key, value in metrics.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{name}."))
+        elif key != "count":
+            flat[name] = float(value)
+    return flat
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Compare results to a baseline.
+
+    Args:
+        results: Current benchmark results.
+        baseline: Previously stored results.
+        threshold: Allowed relative regression (0.2 = 20% worse).
+
+    Returns:
+        Descriptions of metrics that regressed beyond the threshold.
+    """
+    params = {k: v for k, v in results["meta"].items() if k not in ("python", "platform")}
+    old_params = {k: v for k, v in baseline["meta"].items() if k not in ("python", "platform")}
+    if params != old_params:
+        print(f"warning: benchmark parameters differ from baseline: {old_params} -> {params}")
+
+    current = _flatten(results["metrics"])
+    previous = _flatten(baseline["metrics"])
+    regressions = []
+    for name in sorted(current.keys() & previous.keys()):
+        old, new = previous[name], current[name]
+        if old <= 0:
+            continue
+        change = (new - old) / old
+        worse = -change if name.split(".")[0] in HIGHER_IS_BETTER else change
+        marker = ""
+        if worse > threshold:
+            marker = "  REGRESSION"
+            regressions.append(f"{name}: {old:.6g} -> {new:.6g} ({change:+.1%})")
+        print(f"{name:45} {old:12.6g} {new:12.6g} {change:+8.1%}{marker}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="full workflows to run")
+    parser.add_argument("--iterations", type=int, default=5, help="review rounds per workflow")
+    parser.add_argument("--steps", type=int, default=3, help="plan steps to execute per workflow")
+    parser.add_argument("--chunks", type=int, default=50, help="output chunks per agent turn")
+    parser.add_argument("--chunk-size", type=int, default=256, help="characters per chunk")
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds between chunks")
+    parser.add_argument("--startup", type=float, default=0.0, help="simulated CLI startup seconds")
+    parser.add_argument("--structured", action="store_true", help="use structured JSON output")
+    parser.add_argument("--save-samples", type=int, default=500, help="raw save_state calls to time")
+    parser.add_argument("--output", type=Path, help="write results JSON here")
+    parser.add_argument("--baseline", type=Path, help="compare against stored results JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative regression")
+    args = parser.parse_args()
+
+    results = run_benchmark(args)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+    else:
+        print(json.dumps(results, indent=2))
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} metric(s) regressed more than {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""Stand-in for the `claude` / `codex` CLIs used by the benchmarks.
+
+Reads the prompt from stdin, performs the file side effects the real agent
+would (writing plan.md / comments.md) and streams a configurable amount of
+output. Behaviour is controlled through environment variables:
+
+    FAKE_AGENT_STARTUP        seconds to sleep before any output (CLI boot)
+    FAKE_AGENT_CHUNKS         number of output chunks per turn
+    FAKE_AGENT_CHUNK_SIZE     characters per chunk
+    FAKE_AGENT_DELAY          seconds between chunks
+    FAKE_AGENT_PLAN_STEPS     number of steps written to the plan
+    FAKE_AGENT_APPROVE_AFTER  review round on which the reviewer approves
+    FAKE_AGENT_STATE_DIR      directory for the review-round counter
+
+Structured output is emitted when invoked with `--output-format stream-json`
+(Claude) or `exec --json` (Codex).
+"""
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+
+def _env(name: str, default: str) -> str:
+    return os.environ.get(name, default)
+
+
+def _review_round() -> int:
+    """Increment and return the persistent review-round counter."""
+    counter = Path(_env("FAKE_AGENT_STATE_DIR", ".")) / "fake_agent_reviews"
+    count = int(counter.read_text()) + 1 if counter.exists() else 1
+    counter.write_text(str(count))
+    return count
+
+
+def _side_effects(prompt: str) -> None:
+    """Write the files the real agent would write for this prompt."""
+    steps = int(_env("FAKE_AGENT_PLAN_STEPS", "5"))
+
+    review = re.search(r"Write your review to `([^`]+)`", prompt)
+    if review:
+        approve_after = int(_env("FAKE_AGENT_APPROVE_AFTER", "3"))
+        verdict = "[APPROVED]" if _review_round() >= approve_after else "[CHANGES_REQUIRED]"
+        Path(review.group(1)).write_text(f"{verdict}\n\n- Step 2 needs more detail.\n")
+        return
+
+    write = re.search(r"Write the plan to `([^`]+)`", prompt)
+    if write:
+        lines = ["# Plan", ""] + [f"- [ ] Step {i}: do thing {i}" for i in range(1, steps + 1)]
+        Path(write.group(1)).write_text("\n".join(lines) + "\n")
+        return
+
+    respond = re.search(r"update `([^`]+)` accordingly", prompt)
+    if respond:
+        plan = Path(respond.group(1))
+        if plan.exists():
+            with open(plan, "a") as f:
+                f.write("  - clarified after review\n")
+
+
+def _emit_text(chunks: int, size: int, delay: float) -> None:
+    body = ("计划 review " * (size // 8 + 1))[:size]
+    for _ in range(chunks):
+        sys.stdout.write(body)
+        sys.stdout.flush()
+        if delay:
+            time.sleep(delay)
+
+
+def _emit_claude_json(chunks: int, size: int, delay: float) -> None:
+    body = ("计划 review " * (size // 8 + 1))[:size]
+    print(json.dumps({"type": "system", "subtype": "init", "session_id": "bench-session"}), flush=True)
+    for _ in range(chunks):
+        message = {"type": "assistant", "message": {"content": [{"type": "text", "text": body}]}}
+        print(json.dumps(message, ensure_ascii=False), flush=True)
+        if delay:
+            time.sleep(delay)
+    print(json.dumps({"type": "result", "result": "", "session_id": "bench-session",
+                      "usage": {"input_tokens": 100, "output_tokens": chunks}}), flush=True)
+
+
+def _emit_codex_json(chunks: int, size: int, delay: float) -> None:
+    body = ("计划 review " * (size // 8 + 1))[:size]
+    print(json.dumps({"type": "thread.started", "thread_id": "bench-thread"}), flush=True)
+    for i in range(chunks):
+        item = {"id": f"item_{i}", "type": "agent_message", "text": body}
+        print(json.dumps({"type": "item.completed", "item": item}, ensure_ascii=False), flush=True)
+        if delay:
+            time.sleep(delay)
+    print(json.dumps({"type": "turn.completed",
+                      "usage": {"input_tokens": 100, "output_tokens": chunks}}), flush=True)
+
+
+def main() -> None:
+    prompt = sys.stdin.read()
+    time.sleep(float(_env("FAKE_AGENT_STARTUP", "0")))
+    _side_effects(prompt)
+
+    chunks = int(_env("FAKE_AGENT_CHUNKS", "50"))
+    size = int(_env("FAKE_AGENT_CHUNK_SIZE", "256"))
+    delay = float(_env("FAKE_AGENT_DELAY", "0"))
+
+    args = sys.argv[1:]
+    if "stream-json" in args:
+        _emit_claude_json(chunks, size, delay)
+    elif args[:1] == ["exec"] and "--json" in args:
+        _emit_codex_json(chunks, size, delay)
+    else:
+        _emit_text(chunks, size, delay)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,33 @@
 """Agent adapters for CLI tools."""
 from .base import AgentAdapter
+from .errors import AgentProcessError
+from .events import AgentEvent, SessionStarted, TextDelta, ToolCall, TurnResult, Usage
 from .codex import CodexAdapter
 from .claude import ClaudeAdapter
 from .factory import create_adapter
+from .pool import ProcessPool, PooledProcess
+from .replay import ReplayAdapter, TranscriptRecorder, load_transcript
+from .scheduler import AgentScheduler, Lane, Priority, TokenBucket
 
-__all__ = ["AgentAdapter", "CodexAdapter", "ClaudeAdapter", "create_adapter"]
+__all__ = [
+    "AgentAdapter",
+    "AgentProcessError",
+    "CodexAdapter",
+    "ClaudeAdapter",
+    "ReplayAdapter",
+    "TranscriptRecorder",
+    "load_transcript",
+    "create_adapter",
+    "ProcessPool",
+    "PooledProcess",
+    "AgentScheduler",
+    "Lane",
+    "Priority",
+    "TokenBucket",
+    "AgentEvent",
+    "TextDelta",
+    "ToolCall",
+    "SessionStarted",
+    "Usage",
+    "TurnResult",
+]
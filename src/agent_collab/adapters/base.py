@@ -1,26 +1,68 @@
 """Abstract base class for agent adapters."""
+import asyncio
+import contextlib
+import logging
+import time
 from abc import ABC, abstractmethod
-from typing import AsyncIterator
+from typing import TYPE_CHECKING, AsyncIterator
+
+from .errors import AgentProcessError
+from .events import AgentEvent, SessionStarted, TextDelta, TurnResult
+from .pool import PooledProcess, ProcessPool
+from .process import kill_process_group, spawn_options
+from .stream import AdaptiveReader, LineDecoder, StderrDrain, Utf8Decoder
+
+if TYPE_CHECKING:
+    from ..telemetry import Tracer
+    from .replay import TranscriptRecorder
+    from .scheduler import Lane
+
+logger = logging.getLogger(__name__)
 
 
 class AgentAdapter(ABC):
-    """Abstract base class for CLI agent adapters."""
+    """Abstract base class for CLI agent adapters.
+
+    Subclasses describe how to invoke their CLI (``build_command``) and how
+    to parse its structured output (``parse_events``); the base class runs
+    the process and turns its output into text chunks or typed events.
+    """
 
-    def __init__(self, working_dir: str):
+    def __init__(
+        self,
+        working_dir: str,
+        pool: ProcessPool | None = None,
+        structured: bool = False,
+    ):
         """Initialize adapter with working directory.
 
         Args:
             working_dir: The project root directory where agent should execute.
+            pool: Optional process pool. When given and the adapter supports a
+                persistent mode, turns reuse a warm agent process.
+            structured: Use the CLI's structured (JSON-lines) output format
+                instead of plain text.
         """
         self.working_dir = working_dir
+        self.pool = pool
+        self.structured = structured
         self._session_id: str | None = None
+        self.last_returncode: int | None = None
+        self.last_stderr = ""
+        # Seconds to start (or acquire) the agent process for the last turn
+        self.last_spawn_seconds: float | None = None
+        self.recorder: "TranscriptRecorder | None" = None
+        self.tracer: "Tracer | None" = None
+        # Scheduler admission for turns (concurrency and rate limits)
+        self.lane: "Lane | None" = None
+        # Seconds the last turn waited for admission before starting
+        self.last_queue_seconds = 0.0
 
     @property
     def session_id(self) -> str | None:
         """Get current session ID."""
         return self._session_id
 
-    @abstractmethod
     async def send(self, prompt: str) -> AsyncIterator[str]:
         """Send prompt to agent and stream response.
 
@@ -30,7 +72,71 @@ class AgentAdapter(ABC):
         Yields:
             Response chunks as they arrive.
         """
-        pass
+        async for event in self.stream(prompt):
+            if isinstance(event, TextDelta):
+                yield event.text
+
+    async def stream(self, prompt: str) -> AsyncIterator[AgentEvent]:
+        """Send prompt to agent and stream typed events.
+
+        In plain-text mode output arrives as TextDelta events only. With a
+        scheduler lane set, the turn first waits for admission (the wait is
+        kept in ``last_queue_seconds``).
+
+        Args:
+            prompt: The prompt to send to the agent.
+
+        Yields:
+            AgentEvent instances as they arrive.
+        """
+        self.last_spawn_seconds = None
+        self.last_queue_seconds = 0.0
+        lane = self.lane
+        if lane is not None:
+            queued = (
+                self.tracer.span(
+                    "adapter.queue", "adapter", agent=lane.agent, priority=lane.priority.name.lower()
+                )
+                if self.tracer is not None
+                else contextlib.nullcontext()
+            )
+            with queued:
+                self.last_queue_seconds = await lane.acquire()
+        # Not made current: the stream may be finished from another task
+        span = (
+            self.tracer.start_span(
+                "adapter.stream", "adapter", adapter=type(self).__name__, pooled=self.pooled
+            )
+            if self.tracer is not None
+            else None
+        )
+        if self.recorder is not None:
+            self.recorder.start_turn(prompt)
+        events = 0
+        try:
+            async for event in self._open_stream(prompt):
+                if span is not None and not events:
+                    span.event("first_event", spawn_seconds=self.last_spawn_seconds)
+                events += 1
+                if isinstance(event, SessionStarted):
+                    self._session_id = event.session_id
+                if self.recorder is not None:
+                    self.recorder.record(event)
+                yield event
+        finally:
+            if lane is not None:
+                lane.release()
+            if self.recorder is not None:
+                self.recorder.end_turn()
+            if span is not None:
+                span.set(events=events, returncode=self.last_returncode)
+                span.end()
+
+    def _open_stream(self, prompt: str) -> AsyncIterator[AgentEvent]:
+        """Start the underlying event stream for one turn."""
+        if self.pooled:
+            return self._stream_pooled(prompt)
+        return self._stream_process(prompt)
 
     @abstractmethod
     async def resume_session(self, session_id: str) -> bool:
@@ -53,6 +159,18 @@ class AgentAdapter(ABC):
         """
         pass
 
+    @abstractmethod
+    def build_command(self) -> list[str]:
+        """Get the full command for a single non-interactive turn.
+
+        The prompt is written to the process's stdin. Honors
+        ``self.structured`` and the current session ID.
+
+        Returns:
+            Command list.
+        """
+        pass
+
     @abstractmethod
     async def check_available(self) -> bool:
         """Check if the agent CLI is available.
@@ -61,3 +179,198 @@ class AgentAdapter(ABC):
             True if CLI is installed and accessible.
         """
         pass
+
+    def parse_events(self, line: str) -> list[AgentEvent]:
+        """Parse one line of structured output into events.
+
+        The default treats each line as plain text; adapters for CLIs with
+        a JSON-lines format override this.
+
+        Args:
+            line: A single decoded JSON line.
+
+        Returns:
+            Events described by the line (possibly none).
+        """
+        return [TextDelta(line + "\n")]
+
+    def get_persistent_command(self) -> list[str] | None:
+        """Get the command for a long-lived, multi-turn agent process.
+
+        Returns:
+            Command list, or None if the agent has no persistent mode.
+        """
+        return None
+
+    def encode_turn(self, prompt: str) -> bytes:
+        """Encode a prompt as one input message for the persistent process.
+
+        The default sends the prompt as a newline-terminated line; adapters
+        whose persistent mode frames messages (e.g. as JSON) override this.
+        """
+        return prompt.encode() + b"\n"
+
+    @property
+    def pooled(self) -> bool:
+        """Whether turns run on a warm pooled process."""
+        return self.pool is not None and self.get_persistent_command() is not None
+
+    async def _stream_process(self, prompt: str) -> AsyncIterator[AgentEvent]:
+        """Run one turn in a fresh process.
+
+        Stderr is drained concurrently so the agent can never block on a
+        full pipe.
+
+        Yields:
+            Events parsed from structured output, or TextDelta chunks.
+
+        Raises:
+            AgentProcessError: If the process can't be started or exits with
+                a non-zero code.
+        """
+        command = self.build_command()
+        start = time.perf_counter()
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=self.working_dir,
+                **spawn_options(),
+            )
+        except OSError as e:
+            raise AgentProcessError.spawn_failed(command, e) from e
+        self.last_spawn_seconds = time.perf_counter() - start
+        stderr = StderrDrain(process.stderr, name=command[0])
+
+        try:
+            # Send prompt and close stdin
+            if process.stdin:
+                try:
+                    process.stdin.write(prompt.encode())
+                    await process.stdin.drain()
+                except (BrokenPipeError, ConnectionResetError):
+                    # Exited before reading its input; reported via exit code below
+                    pass
+                process.stdin.close()
+
+            # Stream stdout
+            if process.stdout:
+                if self.structured:
+                    lines = LineDecoder()
+                    async for chunk in AdaptiveReader(process.stdout):
+                        for line in lines.feed(chunk):
+                            for event in self.parse_events(line):
+                                yield event
+                    for line in lines.flush():
+                        for event in self.parse_events(line):
+                            yield event
+                else:
+                    decoder = Utf8Decoder()
+                    async for chunk in AdaptiveReader(process.stdout):
+                        text = decoder.feed(chunk)
+                        if text:
+                            yield TextDelta(text)
+                    tail = decoder.flush()
+                    if tail:
+                        yield TextDelta(tail)
+
+            returncode = await process.wait()
+            await stderr.wait()
+        finally:
+            if process.returncode is None:
+                # Abandoned mid-turn (cancelled or consumer stopped early):
+                # stop the agent and any tools it is running
+                await kill_process_group(process)
+            stderr.cancel()
+            self.last_returncode = process.returncode
+            self.last_stderr = stderr.tail()
+
+        if returncode != 0:
+            logger.warning("%s exited with code %s: %s", command[0], returncode, self.last_stderr)
+            raise AgentProcessError(command, returncode, self.last_stderr)
+
+    async def _stream_pooled(self, prompt: str) -> AsyncIterator[AgentEvent]:
+        """Run one turn on the pooled process, respawning it if it has died.
+
+        Yields:
+            Events parsed from the process's structured output.
+
+        Raises:
+            AgentProcessError: If the process can't be started or exits
+                before finishing the turn.
+        """
+        assert self.pool is not None
+        command = self.get_persistent_command()
+        assert command is not None
+
+        entry = await self._start_pooled_turn(command, prompt)
+        finished = False
+        try:
+            while not finished:
+                try:
+                    raw = await entry.process.stdout.readline()
+                except ValueError as e:
+                    # A line over the stream limit; the process is killed below
+                    raise AgentProcessError(
+                        command, None, message=f"{command[0]} wrote an output line too long to read: {e}"
+                    ) from e
+                if not raw:
+                    returncode = await entry.process.wait()
+                    await entry.stderr.wait()
+                    self.last_returncode = returncode
+                    self.last_stderr = entry.stderr.tail()
+                    logger.warning(
+                        "%s exited mid-turn with code %s: %s",
+                        command[0], returncode, self.last_stderr,
+                    )
+                    raise AgentProcessError(command, returncode, self.last_stderr)
+                for event in self.parse_events(raw.decode("utf-8", errors="replace")):
+                    finished = finished or isinstance(event, TurnResult)
+                    yield event
+        finally:
+            try:
+                if finished:
+                    self.pool.release(self)
+                else:
+                    # Mid-turn output would leak into the next turn
+                    await self.pool.kill(self)
+            finally:
+                entry.lock.release()
+
+    async def _start_pooled_turn(self, command: list[str], prompt: str) -> PooledProcess:
+        """Acquire the pooled process, lock it and write the prompt to it.
+
+        A process that died between the health check and the write is
+        respawned once; the replacement is locked like any other.
+
+        Returns:
+            The process, with its lock held for the rest of the turn.
+
+        Raises:
+            AgentProcessError: If no process could be started or written to.
+        """
+        assert self.pool is not None
+        respawned = False
+        while True:
+            start = time.perf_counter()
+            entry = await self.pool.acquire(self, command, self.working_dir)
+            self.last_spawn_seconds = time.perf_counter() - start
+            await entry.lock.acquire()
+            try:
+                entry.process.stdin.write(self.encode_turn(prompt))
+                await entry.process.stdin.drain()
+                return entry
+            except (BrokenPipeError, ConnectionResetError) as e:
+                entry.lock.release()
+                await self.pool.discard(self)
+                if respawned:
+                    self.last_returncode = entry.process.returncode
+                    self.last_stderr = entry.stderr.tail()
+                    raise AgentProcessError(command, self.last_returncode, self.last_stderr) from e
+                # Died between the health check and the write: respawn once
+                respawned = True
+            except BaseException:
+                entry.lock.release()
+                raise
@@ -1,9 +1,9 @@
 """Claude Code CLI adapter."""
-import asyncio
+import json
 import shutil
-from typing import AsyncIterator
 
 from .base import AgentAdapter
+from .events import AgentEvent, SessionStarted, TextDelta, ToolCall, TurnResult, Usage
 
 
 class ClaudeAdapter(AgentAdapter):
@@ -17,48 +17,94 @@ class ClaudeAdapter(AgentAdapter):
         """Get base CLI command."""
         return ["claude"]
 
-    async def send(self, prompt: str) -> AsyncIterator[str]:
-        """Send prompt to Claude and stream response.
-
-        Args:
-            prompt: The prompt to send.
-
-        Yields:
-            Response chunks as they arrive.
-        """
+    def build_command(self) -> list[str]:
+        """Get command for one non-interactive turn."""
         cmd = self.get_cli_command()
 
         # Claude uses --print for non-interactive mode
         cmd.append("--print")
 
+        if self.structured:
+            cmd.extend(["--output-format", "stream-json", "--verbose"])
+
         if self._session_id:
-            cmd.append("--resume")
-
-        # Create subprocess with stdin pipe
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdin=asyncio.subprocess.PIPE,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            cwd=self.working_dir,
-        )
-
-        # Send prompt and close stdin
-        if process.stdin:
-            process.stdin.write(prompt.encode())
-            await process.stdin.drain()
-            process.stdin.close()
-
-        # Stream stdout
-        if process.stdout:
-            while True:
-                chunk = await process.stdout.read(1024)
-                if not chunk:
-                    break
-                text = chunk.decode("utf-8", errors="replace")
-                yield text
-
-        await process.wait()
+            cmd.extend(["--resume", self._session_id])
+
+        return cmd
+
+    def get_persistent_command(self) -> list[str] | None:
+        """Get command for a long-lived stream-json Claude process."""
+        cmd = self.get_cli_command()
+        cmd.extend([
+            "--print",
+            "--input-format", "stream-json",
+            "--output-format", "stream-json",
+            "--verbose",
+        ])
+        if self._session_id:
+            # Respawned after eviction or crash: continue the same conversation
+            cmd.extend(["--resume", self._session_id])
+        return cmd
+
+    def encode_turn(self, prompt: str) -> bytes:
+        """Encode prompt as a stream-json user message."""
+        message = {
+            "type": "user",
+            "message": {"role": "user", "content": [{"type": "text", "text": prompt}]},
+        }
+        return (json.dumps(message) + "\n").encode()
+
+    def parse_events(self, line: str) -> list[AgentEvent]:
+        """Parse a stream-json output line.
+
+        Handles the system init message (session ID), assistant messages
+        (text and tool_use blocks) and the final result message.
+        """
+        try:
+            message = json.loads(line)
+        except json.JSONDecodeError:
+            return []
+        if not isinstance(message, dict):
+            return []
+
+        events: list[AgentEvent] = []
+        msg_type = message.get("type")
+
+        if msg_type == "system" and message.get("session_id"):
+            events.append(SessionStarted(message["session_id"]))
+        elif msg_type == "assistant":
+            body = message.get("message")
+            content = body.get("content") if isinstance(body, dict) else None
+            if not isinstance(content, list):
+                return []
+            for block in content:
+                if not isinstance(block, dict):
+                    continue
+                if block.get("type") == "text" and block.get("text"):
+                    events.append(TextDelta(block["text"]))
+                elif block.get("type") == "tool_use":
+                    events.append(ToolCall(
+                        name=block.get("name", ""),
+                        input=block.get("input") or {},
+                        call_id=block.get("id"),
+                    ))
+        elif msg_type == "result":
+            if message.get("session_id"):
+                events.append(SessionStarted(message["session_id"]))
+            usage = message.get("usage")
+            if not isinstance(usage, dict):
+                usage = {}
+            events.append(Usage(
+                input_tokens=usage.get("input_tokens", 0),
+                output_tokens=usage.get("output_tokens", 0),
+                cached_input_tokens=usage.get("cache_read_input_tokens", 0),
+            ))
+            events.append(TurnResult(
+                text=message.get("result"),
+                is_error=bool(message.get("is_error")),
+            ))
+
+        return events
 
     async def resume_session(self, session_id: str) -> bool:
         """Attempt to resume a Claude session.
@@ -69,7 +115,6 @@ class ClaudeAdapter(AgentAdapter):
         Returns:
             True if session can be resumed.
         """
-        # For Claude, --resume uses the most recent session
-        # We store the session_id for state tracking
+        # The stored ID is passed to --resume on the next turn
         self._session_id = session_id
         return True
@@ -1,14 +1,17 @@
 """Codex CLI adapter."""
-import asyncio
+import itertools
+import json
 import shutil
-from typing import AsyncIterator
 
 from .base import AgentAdapter
+from .events import AgentEvent, SessionStarted, TextDelta, ToolCall, TurnResult, Usage
 
 
 class CodexAdapter(AgentAdapter):
     """Adapter for OpenAI Codex CLI."""
 
+    _submission_ids = itertools.count(1)
+
     async def check_available(self) -> bool:
         """Check if codex CLI is available."""
         return shutil.which("codex") is not None
@@ -17,45 +20,106 @@ class CodexAdapter(AgentAdapter):
         """Get base CLI command."""
         return ["codex"]
 
-    async def send(self, prompt: str) -> AsyncIterator[str]:
-        """Send prompt to Codex and stream response.
+    def build_command(self) -> list[str]:
+        """Get command for one non-interactive turn."""
+        cmd = self.get_cli_command()
 
-        Args:
-            prompt: The prompt to send.
+        if self.structured:
+            # `codex exec --json` emits JSON-lines events; "-" reads the prompt from stdin
+            cmd.extend(["exec", "--json", "--cd", self.working_dir])
+            if self._session_id:
+                cmd.extend(["resume", self._session_id])
+            cmd.append("-")
+            return cmd
 
-        Yields:
-            Response chunks as they arrive.
-        """
-        cmd = self.get_cli_command()
         cmd.extend(["--cwd", self.working_dir])
 
         if self._session_id:
             cmd.extend(["--session", self._session_id])
 
-        # Create subprocess with stdin pipe
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdin=asyncio.subprocess.PIPE,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-
-        # Send prompt and close stdin
-        if process.stdin:
-            process.stdin.write(prompt.encode())
-            await process.stdin.drain()
-            process.stdin.close()
-
-        # Stream stdout
-        if process.stdout:
-            while True:
-                chunk = await process.stdout.read(1024)
-                if not chunk:
-                    break
-                text = chunk.decode("utf-8", errors="replace")
-                yield text
-
-        await process.wait()
+        return cmd
+
+    def get_persistent_command(self) -> list[str] | None:
+        """Get command for a long-lived Codex protocol-mode process."""
+        cmd = self.get_cli_command()
+        cmd.append("proto")
+        return cmd
+
+    def encode_turn(self, prompt: str) -> bytes:
+        """Encode prompt as a protocol-mode user_input submission."""
+        submission = {
+            "id": str(next(self._submission_ids)),
+            "op": {"type": "user_input", "items": [{"type": "text", "text": prompt}]},
+        }
+        return (json.dumps(submission) + "\n").encode()
+
+    def parse_events(self, line: str) -> list[AgentEvent]:
+        """Parse a JSON event line.
+
+        Handles both `codex exec --json` events and protocol-mode
+        (`codex proto`) events, which wrap their payload in ``msg``.
+        """
+        try:
+            event = json.loads(line)
+        except json.JSONDecodeError:
+            return []
+        if not isinstance(event, dict):
+            return []
+
+        if "msg" in event:
+            return self._parse_proto_event(event["msg"])
+        return self._parse_exec_event(event)
+
+    def _parse_exec_event(self, event: dict) -> list[AgentEvent]:
+        """Parse a `codex exec --json` event."""
+        event_type = event.get("type")
+        item = event.get("item") or {}
+
+        if event_type == "thread.started" and event.get("thread_id"):
+            return [SessionStarted(event["thread_id"])]
+        if event_type == "item.started" and item.get("type") == "command_execution":
+            return [ToolCall(name="command_execution", input={"command": item.get("command")},
+                             call_id=item.get("id"))]
+        if event_type == "item.completed" and item.get("type") == "agent_message":
+            return [TextDelta(item.get("text", ""))]
+        if event_type == "turn.completed":
+            usage = event.get("usage") or {}
+            return [
+                Usage(
+                    input_tokens=usage.get("input_tokens", 0),
+                    output_tokens=usage.get("output_tokens", 0),
+                    cached_input_tokens=usage.get("cached_input_tokens", 0),
+                ),
+                TurnResult(),
+            ]
+        if event_type in ("turn.failed", "error"):
+            error = event.get("error") or {}
+            message = error.get("message") or event.get("message", "")
+            return [TurnResult(text=message, is_error=True)]
+        return []
+
+    def _parse_proto_event(self, msg: dict) -> list[AgentEvent]:
+        """Parse a protocol-mode event payload."""
+        msg_type = msg.get("type")
+
+        if msg_type == "session_configured" and msg.get("session_id"):
+            return [SessionStarted(msg["session_id"])]
+        if msg_type == "agent_message_delta":
+            return [TextDelta(msg.get("delta", ""))]
+        if msg_type == "exec_command_begin":
+            return [ToolCall(name="exec_command", input={"command": msg.get("command")},
+                             call_id=msg.get("call_id"))]
+        if msg_type == "token_count":
+            return [Usage(
+                input_tokens=msg.get("input_tokens", 0),
+                output_tokens=msg.get("output_tokens", 0),
+                cached_input_tokens=msg.get("cached_input_tokens", 0),
+            )]
+        if msg_type == "error":
+            return [TurnResult(text=msg.get("message", ""), is_error=True)]
+        if msg_type == "task_complete":
+            return [TurnResult(text=msg.get("last_agent_message"))]
+        return []
 
     async def resume_session(self, session_id: str) -> bool:
         """Attempt to resume a Codex session.
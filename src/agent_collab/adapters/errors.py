@@ -0,0 +1,34 @@
+"""Adapter errors."""
+
+
+class AgentProcessError(RuntimeError):
+    """An agent CLI process failed or died before finishing its turn."""
+
+    def __init__(
+        self,
+        command: list[str],
+        returncode: int | None,
+        stderr: str = "",
+        message: str | None = None,
+    ) -> None:
+        """Initialize error.
+
+        Args:
+            command: The command that was run.
+            returncode: Process exit code (None if still running or never started).
+            stderr: Tail of the process's stderr output.
+            message: Description to use instead of the exit code.
+        """
+        self.command = command
+        self.returncode = returncode
+        self.stderr = stderr
+        if message is None:
+            message = f"{command[0]} exited with code {returncode}"
+            if stderr:
+                message += f":\n{stderr}"
+        super().__init__(message)
+
+    @classmethod
+    def spawn_failed(cls, command: list[str], error: OSError) -> "AgentProcessError":
+        """Error for a process that could not be started (e.g. CLI not installed)."""
+        return cls(command, None, message=f"{command[0]} could not be started: {error}")
@@ -0,0 +1,64 @@
+"""Typed events parsed from agent CLI structured output."""
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+
+@dataclass
+class TextDelta:
+    """A piece of assistant text."""
+    text: str
+
+
+@dataclass
+class ToolCall:
+    """The agent invoked a tool (file edit, shell command, ...)."""
+    name: str
+    input: dict[str, Any] = field(default_factory=dict)
+    call_id: str | None = None
+
+
+@dataclass
+class SessionStarted:
+    """The agent reported the session ID for this conversation."""
+    session_id: str
+
+
+@dataclass
+class Usage:
+    """Token usage reported by the agent."""
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_input_tokens: int = 0
+
+
+@dataclass
+class TurnResult:
+    """The turn finished."""
+    text: str | None = None
+    is_error: bool = False
+
+
+AgentEvent = TextDelta | ToolCall | SessionStarted | Usage | TurnResult
+
+_EVENT_TYPES: dict[str, type] = {
+    cls.__name__: cls for cls in (TextDelta, ToolCall, SessionStarted, Usage, TurnResult)
+}
+
+
+def event_to_dict(event: AgentEvent) -> dict[str, Any]:
+    """Convert an event to a JSON-serializable dict."""
+    return {"type": type(event).__name__, **asdict(event)}
+
+
+def event_from_dict(data: dict[str, Any]) -> AgentEvent:
+    """Create an event from a dict produced by event_to_dict.
+
+    Raises:
+        ValueError: If the event type is unknown.
+    """
+    fields = dict(data)
+    event_type = fields.pop("type", None)
+    cls = _EVENT_TYPES.get(event_type)
+    if cls is None:
+        raise ValueError(f"Unknown event type: {event_type}")
+    return cls(**fields)
@@ -1,29 +1,51 @@
 """Factory for creating agent adapters."""
+from pathlib import Path
+
 from .base import AgentAdapter
 from .codex import CodexAdapter
 from .claude import ClaudeAdapter
+from .pool import ProcessPool
+from .replay import ReplayAdapter
 
 
-def create_adapter(agent_type: str, working_dir: str) -> AgentAdapter:
+def create_adapter(
+    agent_type: str,
+    working_dir: str,
+    pool: ProcessPool | None = None,
+    structured: bool = False,
+    transcript: Path | str | None = None,
+    replay_speed: float = 1.0,
+) -> AgentAdapter:
     """Create an agent adapter based on type.
 
     Args:
-        agent_type: Type of agent ("codex" or "claude").
+        agent_type: Type of agent ("codex", "claude" or "replay").
         working_dir: Working directory for the agent.
+        pool: Optional process pool enabling warm, reused agent processes.
+        structured: Use the CLI's structured JSON-lines output format.
+        transcript: Transcript to play back (required for "replay").
+        replay_speed: Playback speed multiplier for "replay".
 
     Returns:
         Configured AgentAdapter instance.
 
     Raises:
-        ValueError: If agent_type is not recognized.
+        ValueError: If agent_type is not recognized, or "replay" is
+            requested without a transcript.
     """
     adapters = {
         "codex": CodexAdapter,
         "claude": ClaudeAdapter,
+        "replay": ReplayAdapter,
     }
 
     adapter_class = adapters.get(agent_type.lower())
     if adapter_class is None:
         raise ValueError(f"Unknown agent type: {agent_type}. Valid types: {list(adapters.keys())}")
 
-    return adapter_class(working_dir)
+    if adapter_class is ReplayAdapter:
+        if transcript is None:
+            raise ValueError("Replay adapter requires a transcript path")
+        return ReplayAdapter(working_dir, transcript, speed=replay_speed, structured=structured)
+
+    return adapter_class(working_dir, pool=pool, structured=structured)
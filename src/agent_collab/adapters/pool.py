@@ -0,0 +1,154 @@
+"""Warm process pool for long-lived agent CLI processes."""
+import asyncio
+import time
+from typing import Hashable
+
+from .errors import AgentProcessError
+from .process import kill_process_group, spawn_options
+from .stream import MAX_LINE, StderrDrain
+
+
+class PooledProcess:
+    """A long-lived agent process that is reused across turns."""
+
+    def __init__(self, process: asyncio.subprocess.Process, command: list[str]) -> None:
+        """Wrap a spawned process.
+
+        Args:
+            process: The running agent process (stdin/stdout/stderr piped).
+            command: The command the process was spawned with.
+        """
+        self.process = process
+        self.command = command
+        self.stderr = StderrDrain(process.stderr, name=command[0])
+        self.last_used = time.monotonic()
+        self.turns = 0
+        self.lock = asyncio.Lock()
+
+    @property
+    def alive(self) -> bool:
+        """Health check: process is running and its stdin is still writable."""
+        if self.process.returncode is not None:
+            return False
+        stdin = self.process.stdin
+        return stdin is not None and not stdin.is_closing()
+
+    def idle_for(self) -> float:
+        """Seconds since the process last finished a turn."""
+        return time.monotonic() - self.last_used
+
+    async def terminate(self, timeout: float = 5.0) -> None:
+        """Stop the process, closing stdin first and killing if it lingers."""
+        if self.process.returncode is not None:
+            self.stderr.cancel()
+            return
+        if self.process.stdin and not self.process.stdin.is_closing():
+            self.process.stdin.close()
+        try:
+            await asyncio.wait_for(self.process.wait(), timeout)
+        except asyncio.TimeoutError:
+            await kill_process_group(self.process)
+        await self.stderr.wait()
+
+    async def kill(self) -> None:
+        """Stop the process and its children immediately (e.g. mid-turn)."""
+        if self.process.returncode is None:
+            await kill_process_group(self.process)
+        await self.stderr.wait()
+
+
+class ProcessPool:
+    """Keeps one warm agent process per key (typically one per role).
+
+    Processes are spawned lazily on first use, health-checked on every
+    acquire, respawned if they have died, and evicted after sitting idle
+    for longer than ``idle_timeout`` seconds.
+    """
+
+    def __init__(self, idle_timeout: float = 300.0) -> None:
+        """Initialize an empty pool.
+
+        Args:
+            idle_timeout: Seconds a process may sit unused before eviction.
+                Zero or negative disables idle eviction.
+        """
+        self.idle_timeout = idle_timeout
+        self.spawn_count = 0
+        self._processes: dict[Hashable, PooledProcess] = {}
+
+    def __len__(self) -> int:
+        return len(self._processes)
+
+    def get(self, key: Hashable) -> PooledProcess | None:
+        """Get the pooled process for key without spawning."""
+        return self._processes.get(key)
+
+    async def acquire(self, key: Hashable, command: list[str], cwd: str) -> PooledProcess:
+        """Get a healthy process for key, spawning or respawning as needed.
+
+        Args:
+            key: Pool key identifying the owner (e.g. the adapter instance).
+            command: Command used to spawn the process if none is warm.
+            cwd: Working directory for a newly spawned process.
+
+        Returns:
+            A live PooledProcess.
+        """
+        await self.evict_idle()
+
+        entry = self._processes.get(key)
+        if entry is not None and not entry.alive:
+            await self.discard(key)
+            entry = None
+
+        if entry is None:
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *command,
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    cwd=cwd,
+                    limit=MAX_LINE,
+                    **spawn_options(),
+                )
+            except OSError as e:
+                raise AgentProcessError.spawn_failed(command, e) from e
+            entry = PooledProcess(process, command)
+            self._processes[key] = entry
+            self.spawn_count += 1
+
+        return entry
+
+    def release(self, key: Hashable) -> None:
+        """Mark the process for key as having just finished a turn."""
+        entry = self._processes.get(key)
+        if entry is not None:
+            entry.last_used = time.monotonic()
+            entry.turns += 1
+
+    async def discard(self, key: Hashable) -> None:
+        """Terminate and forget the process for key, if any."""
+        entry = self._processes.pop(key, None)
+        if entry is not None:
+            await entry.terminate()
+
+    async def kill(self, key: Hashable) -> None:
+        """Kill and forget the process for key without waiting for it to exit cleanly."""
+        entry = self._processes.pop(key, None)
+        if entry is not None:
+            await entry.kill()
+
+    async def evict_idle(self) -> None:
+        """Terminate processes that are dead or have been idle too long."""
+        for key, entry in list(self._processes.items()):
+            if entry.lock.locked():
+                continue
+            expired = self.idle_timeout > 0 and entry.idle_for() > self.idle_timeout
+            if expired or not entry.alive:
+                await self.discard(key)
+
+    async def close(self) -> None:
+        """Terminate all pooled processes."""
+        for key in list(self._processes):
+            await self.discard(key)
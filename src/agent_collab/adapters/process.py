@@ -0,0 +1,47 @@
+"""Spawning and stopping agent processes."""
+import asyncio
+import os
+import signal
+import sys
+from typing import Any
+
+
+def spawn_options() -> dict[str, Any]:
+    """Extra create_subprocess_exec arguments for agent processes.
+
+    On POSIX each agent runs in its own session (and process group) so it
+    can be stopped together with the shells and tools it has spawned.
+    """
+    if sys.platform == "win32":
+        return {}
+    return {"start_new_session": True}
+
+
+def _signal_group(process: asyncio.subprocess.Process, sig: int) -> None:
+    try:
+        if sys.platform == "win32":
+            process.kill()
+        else:
+            os.killpg(process.pid, sig)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+async def kill_process_group(process: asyncio.subprocess.Process, grace: float = 1.0) -> None:
+    """Stop a process and everything in its process group.
+
+    Sends SIGTERM to the group, then SIGKILL to whatever is left after
+    ``grace`` seconds. Children are signalled even if the leader has
+    already exited.
+
+    Args:
+        process: A process started with spawn_options().
+        grace: Seconds to wait for a clean exit before killing.
+    """
+    _signal_group(process, signal.SIGTERM)
+    try:
+        await asyncio.wait_for(process.wait(), grace)
+    except asyncio.TimeoutError:
+        pass
+    _signal_group(process, signal.SIGKILL)
+    await process.wait()
@@ -0,0 +1,155 @@
+"""Record agent turns to transcripts and replay them without the real CLIs."""
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, AsyncIterator
+
+from .base import AgentAdapter
+from .events import AgentEvent, event_from_dict, event_to_dict
+
+
+@dataclass
+class TranscriptTurn:
+    """One recorded turn: the prompt and the timed events it produced."""
+    prompt: str
+    events: list[tuple[float, AgentEvent]] = field(default_factory=list)
+
+
+def load_transcript(path: Path) -> list[TranscriptTurn]:
+    """Load a transcript file.
+
+    The transcript is JSON lines: a ``{"kind": "turn", "prompt": ...}`` line
+    starts each turn, followed by ``{"kind": "event", "delay": ..., "event": {...}}``
+    lines where delay is seconds since the previous event (or turn start).
+
+    Args:
+        path: Path to the transcript.
+
+    Returns:
+        Recorded turns in order.
+
+    Raises:
+        FileNotFoundError: If the transcript doesn't exist.
+        ValueError: If the transcript is malformed.
+    """
+    turns: list[TranscriptTurn] = []
+    with open(path, encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record.get("kind") == "turn":
+                turns.append(TranscriptTurn(prompt=record.get("prompt", "")))
+            elif record.get("kind") == "event":
+                if not turns:
+                    raise ValueError(f"{path}:{lineno}: event before first turn")
+                turns[-1].events.append((record.get("delay", 0.0), event_from_dict(record["event"])))
+            else:
+                raise ValueError(f"{path}:{lineno}: unknown record kind {record.get('kind')!r}")
+    return turns
+
+
+class TranscriptRecorder:
+    """Tees an adapter's events, with timing, to a transcript file."""
+
+    def __init__(self, path: Path) -> None:
+        """Initialize recorder.
+
+        Args:
+            path: Transcript file to append to (created if missing).
+        """
+        self.path = path
+        self._file: IO[str] | None = None
+        self._last = 0.0
+
+    def start_turn(self, prompt: str) -> None:
+        """Begin recording a turn."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._write({"kind": "turn", "prompt": prompt})
+        self._last = time.monotonic()
+
+    def record(self, event: AgentEvent) -> None:
+        """Record one event with the delay since the previous one."""
+        now = time.monotonic()
+        self._write({"kind": "event", "delay": round(now - self._last, 6), "event": event_to_dict(event)})
+        self._last = now
+
+    def end_turn(self) -> None:
+        """Finish the current turn."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write(self, record: dict) -> None:
+        if self._file is not None:
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._file.flush()
+
+
+class ReplayAdapter(AgentAdapter):
+    """Adapter that replays a recorded transcript instead of running a CLI.
+
+    Each send() replays the next recorded turn, reproducing chunk contents
+    and inter-chunk timing. After the last turn, playback wraps around.
+    """
+
+    def __init__(
+        self,
+        working_dir: str,
+        transcript: Path | str,
+        speed: float = 1.0,
+        **kwargs,
+    ):
+        """Initialize replay adapter.
+
+        Args:
+            working_dir: The project root directory.
+            transcript: Path to a transcript written by TranscriptRecorder.
+            speed: Playback speed multiplier; 0 replays without delays.
+            **kwargs: Passed through to AgentAdapter.
+        """
+        super().__init__(working_dir, **kwargs)
+        self.transcript = Path(transcript)
+        self.speed = speed
+        self._turns: list[TranscriptTurn] | None = None
+        self._next_turn = 0
+
+    async def check_available(self) -> bool:
+        """Check the transcript exists."""
+        return self.transcript.exists()
+
+    def get_cli_command(self) -> list[str]:
+        """Get base CLI command (replay has no real CLI)."""
+        return ["replay"]
+
+    def build_command(self) -> list[str]:
+        """Get command for one turn (replay has no real CLI)."""
+        return self.get_cli_command()
+
+    @property
+    def pooled(self) -> bool:
+        """Replay never uses the process pool."""
+        return False
+
+    async def _open_stream(self, prompt: str) -> AsyncIterator[AgentEvent]:
+        """Replay the next recorded turn."""
+        if self._turns is None:
+            self._turns = load_transcript(self.transcript)
+        if not self._turns:
+            raise ValueError(f"Transcript has no turns: {self.transcript}")
+
+        turn = self._turns[self._next_turn % len(self._turns)]
+        self._next_turn += 1
+
+        for delay, event in turn.events:
+            if self.speed > 0 and delay > 0:
+                await asyncio.sleep(delay / self.speed)
+            yield event
+
+    async def resume_session(self, session_id: str) -> bool:
+        """Set the session ID (replayed events may override it)."""
+        self._session_id = session_id
+        return True
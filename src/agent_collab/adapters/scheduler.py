@@ -0,0 +1,224 @@
+"""Shared scheduling of agent turns: concurrency caps, rate limits, fair queuing."""
+import asyncio
+import time
+from collections import OrderedDict, deque
+from enum import IntEnum
+from typing import TYPE_CHECKING, Callable, Mapping
+
+if TYPE_CHECKING:
+    from ..config import AgentLimit
+
+
+class Priority(IntEnum):
+    """Scheduling class of a turn; lower values are served first."""
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+class TokenBucket:
+    """Token-bucket rate limiter: ``rate`` tokens per second, up to ``capacity``."""
+
+    def __init__(
+        self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_take(self) -> bool:
+        """Take a token if one is available."""
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    def wait_time(self) -> float:
+        """Seconds until the next token is available."""
+        self._refill()
+        return max(0.0, (1 - self._tokens) / self.rate)
+
+
+class _AgentQueue:
+    """Turns running and waiting for one agent type."""
+
+    def __init__(self, limit: "AgentLimit") -> None:
+        self.max_concurrent = limit.max_concurrent
+        self.bucket = (
+            TokenBucket(limit.requests_per_minute / 60, max(1, limit.burst))
+            if limit.requests_per_minute > 0
+            else None
+        )
+        self.running = 0
+        # Per priority class, each flow's waiters in arrival order. Flows are
+        # served round-robin: a flow moves to the back after each grant.
+        self.waiting: dict[Priority, OrderedDict[str, deque[asyncio.Future]]] = {
+            priority: OrderedDict() for priority in Priority
+        }
+        self.timer: asyncio.TimerHandle | None = None
+        self.timer_loop: asyncio.AbstractEventLoop | None = None
+
+    def has_capacity(self) -> bool:
+        return self.max_concurrent <= 0 or self.running < self.max_concurrent
+
+    def has_waiters(self) -> bool:
+        return any(self.waiting.values())
+
+    def pop_next(self) -> asyncio.Future | None:
+        """Next waiter: highest priority class, then round-robin over flows."""
+        for priority in Priority:
+            flows = self.waiting[priority]
+            while flows:
+                flow, waiters = next(iter(flows.items()))
+                del flows[flow]
+                waiter = waiters.popleft()
+                if waiters:
+                    flows[flow] = waiters
+                if not waiter.done():
+                    return waiter
+        return None
+
+    def remove(self, priority: Priority, flow: str, waiter: asyncio.Future) -> None:
+        waiters = self.waiting[priority].get(flow)
+        if waiters is not None and waiter in waiters:
+            waiters.remove(waiter)
+            if not waiters:
+                del self.waiting[priority][flow]
+
+
+class AgentScheduler:
+    """Admits agent turns under per-agent-type limits.
+
+    Each agent type may cap its concurrent turns and its turn start rate
+    (a token bucket refilled at ``requests_per_minute`` and holding up to
+    ``burst`` tokens). Turns that can't start yet wait in a queue: higher
+    priority classes first, and within a class the waiting flows (usually
+    one per workflow) take turns, so one busy workflow can't starve the
+    others. Agent types without limits are admitted immediately.
+
+    Limits apply within one process.
+    """
+
+    def __init__(self, limits: Mapping[str, "AgentLimit"] | None = None) -> None:
+        """Initialize scheduler.
+
+        Args:
+            limits: Limits by agent type ("claude", "codex", ...).
+        """
+        self._queues = {
+            agent.lower(): _AgentQueue(limit)
+            for agent, limit in (limits or {}).items()
+            if limit.max_concurrent > 0 or limit.requests_per_minute > 0
+        }
+
+    def lane(self, agent: str, flow: str = "", priority: Priority = Priority.INTERACTIVE) -> "Lane":
+        """Handle for scheduling one flow's turns of an agent type."""
+        return Lane(self, agent.lower(), flow, priority)
+
+    def running(self, agent: str) -> int:
+        """Turns of an agent type currently admitted (limited types only)."""
+        queue = self._queues.get(agent.lower())
+        return queue.running if queue is not None else 0
+
+    def waiting(self, agent: str) -> int:
+        """Turns of an agent type waiting to be admitted."""
+        queue = self._queues.get(agent.lower())
+        if queue is None:
+            return 0
+        return sum(len(waiters) for flows in queue.waiting.values() for waiters in flows.values())
+
+    async def acquire(
+        self, agent: str, flow: str = "", priority: Priority = Priority.INTERACTIVE
+    ) -> float:
+        """Wait until a turn of an agent type may start.
+
+        Every successful call must be paired with ``release``.
+
+        Args:
+            agent: Agent type.
+            flow: Who the turn is for; waiting flows are served in turn.
+            priority: Scheduling class.
+
+        Returns:
+            Seconds spent waiting in the queue.
+        """
+        queue = self._queues.get(agent.lower())
+        if queue is None:
+            return 0.0
+        if not queue.has_waiters() and queue.has_capacity() and (
+            queue.bucket is None or queue.bucket.try_take()
+        ):
+            queue.running += 1
+            return 0.0
+
+        start = time.perf_counter()
+        waiter = asyncio.get_running_loop().create_future()
+        queue.waiting[priority].setdefault(flow, deque()).append(waiter)
+        self._dispatch(queue)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Admitted just as the caller gave up: hand the slot on
+                self.release(agent)
+            else:
+                queue.remove(priority, flow, waiter)
+            raise
+        return time.perf_counter() - start
+
+    def release(self, agent: str) -> None:
+        """Mark a turn admitted by ``acquire`` as finished."""
+        queue = self._queues.get(agent.lower())
+        if queue is None:
+            return
+        queue.running -= 1
+        self._dispatch(queue)
+
+    def _dispatch(self, queue: _AgentQueue) -> None:
+        """Admit waiters while there is capacity and rate budget."""
+        while queue.has_waiters() and queue.has_capacity():
+            if queue.bucket is not None and (wait := queue.bucket.wait_time()) > 0:
+                loop = asyncio.get_running_loop()
+                # A timer left by an earlier (closed) loop will never fire
+                if queue.timer is None or queue.timer_loop is not loop:
+                    queue.timer = loop.call_later(wait, self._on_timer, queue)
+                    queue.timer_loop = loop
+                return
+            # Only spend a token on a waiter that is still there (the rest
+            # may all have been cancelled)
+            waiter = queue.pop_next()
+            if waiter is None:
+                return
+            if queue.bucket is not None:
+                queue.bucket.try_take()
+            queue.running += 1
+            waiter.set_result(None)
+
+    def _on_timer(self, queue: _AgentQueue) -> None:
+        queue.timer = None
+        self._dispatch(queue)
+
+
+class Lane:
+    """One flow's handle on the scheduler for one agent type."""
+
+    def __init__(self, scheduler: AgentScheduler, agent: str, flow: str, priority: Priority) -> None:
+        self.scheduler = scheduler
+        self.agent = agent
+        self.flow = flow
+        self.priority = priority
+
+    async def acquire(self) -> float:
+        """Wait for admission; returns seconds spent queued."""
+        return await self.scheduler.acquire(self.agent, self.flow, self.priority)
+
+    def release(self) -> None:
+        """Finish an admitted turn."""
+        self.scheduler.release(self.agent)
@@ -0,0 +1,172 @@
+"""Incremental decoding of agent process output."""
+import asyncio
+import codecs
+import logging
+from collections import deque
+from typing import AsyncIterator
+
+logger = logging.getLogger(__name__)
+
+# Streaming JSON modes emit one message per line and tool results can be large,
+# so allow much longer lines than asyncio's 64 KiB default.
+MAX_LINE = 16 * 1024 * 1024
+# Stderr lines are only kept for error reports
+STDERR_MAX_LINE = 64 * 1024
+
+
+class Utf8Decoder:
+    """Incremental UTF-8 decoder.
+
+    Multibyte characters split across read boundaries are held back until
+    the rest of their bytes arrive instead of being replaced.
+    """
+
+    def __init__(self) -> None:
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    def feed(self, data: bytes) -> str:
+        """Decode as much of data as forms complete characters."""
+        return self._decoder.decode(data)
+
+    def flush(self) -> str:
+        """Decode any trailing bytes at end of stream."""
+        return self._decoder.decode(b"", final=True)
+
+
+class LineDecoder:
+    """Splits a byte stream into decoded lines (for JSON-lines output).
+
+    A line longer than max_line bytes is truncated to its first max_line
+    bytes and the rest is dropped up to the next newline, so output that
+    never ends a line can't grow the buffer without bound.
+    """
+
+    def __init__(self, max_line: int = MAX_LINE) -> None:
+        self.max_line = max_line
+        self._buffer = bytearray()
+        self._truncated = False
+
+    def feed(self, data: bytes) -> list[str]:
+        """Add data and return all newly completed lines."""
+        lines = []
+        start = 0
+        while start < len(data):
+            end = data.find(b"\n", start)
+            stop = len(data) if end < 0 else end
+            self._append(data, start, stop)
+            if end < 0:
+                break
+            lines.extend(self._take())
+            start = end + 1
+        return lines
+
+    def flush(self) -> list[str]:
+        """Return any final unterminated line."""
+        return self._take()
+
+    def _append(self, data: bytes, start: int, stop: int) -> None:
+        if self._truncated:
+            return
+        room = self.max_line - len(self._buffer)
+        if stop - start > room:
+            stop = start + room
+            self._truncated = True
+            logger.warning("Output line longer than %d bytes truncated", self.max_line)
+        self._buffer.extend(data[start:stop])
+
+    def _take(self) -> list[str]:
+        line = self._buffer.decode("utf-8", errors="replace")
+        self._buffer.clear()
+        self._truncated = False
+        return [line] if line.strip() else []
+
+
+class AdaptiveReader:
+    """Reads a stream with a read size that follows the producer's rate.
+
+    Reads that fill the buffer double the next read size (up to max_size);
+    reads far below it halve it (down to min_size). Slow trickles of output
+    stay responsive while bulk output is read in few large chunks.
+    """
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        min_size: int = 1024,
+        max_size: int = 64 * 1024,
+    ) -> None:
+        self.reader = reader
+        self.min_size = min_size
+        self.max_size = max_size
+        self.size = min_size
+
+    async def read(self) -> bytes:
+        """Read the next chunk; empty bytes means end of stream."""
+        chunk = await self.reader.read(self.size)
+        if len(chunk) >= self.size:
+            self.size = min(self.size * 2, self.max_size)
+        elif len(chunk) < self.size // 4:
+            self.size = max(self.size // 2, self.min_size)
+        return chunk
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        while True:
+            chunk = await self.read()
+            if not chunk:
+                return
+            yield chunk
+
+
+class StderrDrain:
+    """Reads a process's stderr concurrently into a bounded ring buffer.
+
+    Keeping stderr drained prevents a chatty agent from filling the pipe
+    buffer and stalling; the most recent lines are kept for error reports.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, name: str, max_lines: int = 200) -> None:
+        """Start draining.
+
+        Args:
+            reader: The process's stderr stream.
+            name: Label used in log messages (usually the CLI name).
+            max_lines: Number of most recent lines to keep.
+        """
+        self.name = name
+        self.lines: deque[str] = deque(maxlen=max_lines)
+        self._task = asyncio.create_task(self._run(reader))
+
+    async def _run(self, reader: asyncio.StreamReader) -> None:
+        lines = LineDecoder(max_line=STDERR_MAX_LINE)
+        while True:
+            chunk = await reader.read(4096)
+            if not chunk:
+                break
+            for line in lines.feed(chunk):
+                self._add(line)
+        for line in lines.flush():
+            self._add(line)
+
+    def _add(self, line: str) -> None:
+        line = line.rstrip()
+        self.lines.append(line)
+        logger.debug("%s stderr: %s", self.name, line)
+
+    def tail(self) -> str:
+        """Get the buffered stderr lines."""
+        return "\n".join(self.lines)
+
+    async def wait(self, timeout: float = 1.0) -> None:
+        """Wait for stderr to reach EOF.
+
+        Gives up after timeout, since a grandchild process may keep the
+        pipe open after the agent itself has exited.
+        """
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+
+    def cancel(self) -> None:
+        """Stop draining."""
+        self._task.cancel()
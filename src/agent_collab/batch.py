@@ -0,0 +1,279 @@
+"""Batch runner: many headless workflows concurrently in one process."""
+import asyncio
+import copy
+import json
+import logging
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, TextIO
+
+from .adapters import AgentScheduler
+from .config import Config
+from .engine import Phase
+from .headless import EXIT_OK, HeadlessRunner
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatchJob:
+    """One project to plan (and optionally execute) a goal in."""
+    name: str
+    project_root: Path
+    goal: str
+    execute: bool = False
+
+
+@dataclass
+class JobProgress:
+    """Where one job is, for progress reports."""
+    job: BatchJob
+    state: str = "queued"  # "queued" | "running" | "finished"
+    phase: str = ""
+    iteration: int = 0
+    status: str = ""  # result status once finished (see HeadlessRunner)
+    exit_code: int | None = None
+    error: str = ""
+    started: float | None = None
+    seconds: float = 0.0
+    agent_seconds: float = 0.0  # agent turns, excluding time queued for the scheduler
+    queue_seconds: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Record for JSON reports."""
+        return {
+            "name": self.job.name,
+            "project": str(self.job.project_root),
+            "state": self.state,
+            "phase": self.phase,
+            "iteration": self.iteration,
+            "status": self.status,
+            "exit_code": self.exit_code,
+            "error": self.error,
+            "seconds": round(self.seconds, 3),
+            "agent_seconds": self.agent_seconds,
+            "queue_seconds": self.queue_seconds,
+        }
+
+
+def load_jobs(path: Path) -> list[BatchJob]:
+    """Load jobs from a JSON-lines file.
+
+    Each line is an object with ``project`` (relative to the file's
+    directory) and ``goal`` or ``goal_file``, and optionally ``name``
+    (default: the project directory name) and ``execute``. Blank lines and
+    lines starting with ``#`` are skipped. Repeated names get a numeric
+    suffix.
+
+    Raises:
+        ValueError: If a line is not a valid job.
+    """
+    jobs = []
+    names: dict[str, int] = {}
+    base = path.parent
+    for number, line in enumerate(path.read_text().splitlines(), 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path}:{number}: invalid JSON: {e}") from e
+        if not isinstance(data, dict) or "project" not in data:
+            raise ValueError(f"{path}:{number}: job needs a \"project\"")
+
+        project_root = (base / data["project"]).resolve()
+        goal = data.get("goal")
+        if goal is None and "goal_file" in data:
+            goal = (base / data["goal_file"]).read_text()
+        if not goal or not goal.strip():
+            raise ValueError(f"{path}:{number}: job needs a \"goal\" or \"goal_file\"")
+
+        name = data.get("name") or project_root.name
+        count = names.get(name, 0) + 1
+        names[name] = count
+        if count > 1:
+            name = f"{name}-{count}"
+        jobs.append(BatchJob(name, project_root, goal.strip(), bool(data.get("execute", False))))
+    return jobs
+
+
+class BatchRunner:
+    """Runs a queue of jobs as concurrent headless workflows.
+
+    At most ``batch.max_jobs`` workflows are in progress at once. Their
+    agent turns go through one shared scheduler, which applies the
+    per-agent-type ``limits`` across all jobs and takes waiting jobs in
+    turn, so a job waiting on a busy agent type doesn't hold up jobs using
+    another and no job starves the rest. Each job's agent output is
+    written to ``run.log`` in its own workdir; ``out`` gets a progress line
+    (or JSON record) whenever a job starts, changes phase or finishes, and
+    a summary at the end.
+    """
+
+    def __init__(
+        self,
+        jobs: list[BatchJob],
+        config: Config,
+        state_dir: Path | None = None,
+        execute: bool = False,
+        out: TextIO | None = None,
+        json_output: bool = False,
+    ) -> None:
+        """Initialize runner.
+
+        Args:
+            jobs: Jobs, in the order they are started.
+            config: Configuration shared by all jobs.
+            state_dir: If set, each job's workdir is ``<state_dir>/<name>``
+                instead of the configured workdir inside its project.
+            execute: Execute every job's plan once approved (in addition to
+                jobs that ask for it).
+            out: Stream for progress reports (default: stdout).
+            json_output: Write JSON lines instead of plain text.
+
+        Raises:
+            ValueError: If two jobs would share a workdir.
+        """
+        self.config = config
+        self.state_dir = state_dir
+        self.execute = execute
+        self.out = out or sys.stdout
+        self.json_output = json_output
+        self.progress = [JobProgress(job) for job in jobs]
+        self._configs = {job.name: self._job_config(job) for job in jobs}
+
+        workdirs: dict[Path, str] = {}
+        for job in jobs:
+            workdir = self._configs[job.name].get_workdir(job.project_root).resolve()
+            if workdir in workdirs:
+                raise ValueError(
+                    f"Jobs {workdirs[workdir]!r} and {job.name!r} share workdir {workdir}"
+                    " (use a state directory to run them separately)"
+                )
+            workdirs[workdir] = job.name
+
+    def _job_config(self, job: BatchJob) -> Config:
+        if self.state_dir is None:
+            return self.config
+        config = copy.deepcopy(self.config)
+        config.paths.workdir = str((self.state_dir / job.name).resolve())
+        return config
+
+    def counts(self) -> dict[str, int]:
+        """Number of jobs queued, running and finished."""
+        counts = {"queued": 0, "running": 0, "finished": 0}
+        for progress in self.progress:
+            counts[progress.state] += 1
+        return counts
+
+    async def run(self) -> int:
+        """Run every job to completion.
+
+        Returns:
+            0 if every job succeeded (see HeadlessRunner), else 1.
+        """
+        start = time.perf_counter()
+        scheduler = AgentScheduler(self.config.limits)
+        queue: asyncio.Queue[JobProgress] = asyncio.Queue()
+        for progress in self.progress:
+            queue.put_nowait(progress)
+
+        async def worker() -> None:
+            while not queue.empty():
+                await self._run_job(queue.get_nowait(), scheduler)
+
+        workers = max(1, min(self.config.batch.max_jobs, len(self.progress)))
+        await asyncio.gather(*(worker() for _ in range(workers)))
+
+        failed = [p for p in self.progress if p.exit_code != EXIT_OK]
+        self._summary(time.perf_counter() - start, failed)
+        return 1 if failed else 0
+
+    async def _run_job(self, progress: JobProgress, scheduler: AgentScheduler) -> None:
+        """Run one job, recording its outcome instead of raising."""
+        job = progress.job
+        config = self._configs[job.name]
+        progress.state = "running"
+        progress.started = time.perf_counter()
+        self._report(progress)
+
+        def on_phase_change(phase: Phase) -> None:
+            progress.phase = phase.value
+            progress.iteration = runner.workflow.state.iteration
+            self._report(progress)
+
+        try:
+            workdir = config.get_workdir(job.project_root)
+            workdir.mkdir(parents=True, exist_ok=True)
+            with open(config.get_run_log_path(job.project_root), "a") as log:
+                runner = HeadlessRunner(
+                    job.project_root,
+                    config,
+                    out=log,
+                    scheduler=scheduler,
+                    on_phase_change=on_phase_change,
+                )
+                progress.exit_code = await runner.run(job.goal, execute=job.execute or self.execute)
+            result = runner.result or {}
+            progress.status = result.get("status", "")
+            progress.phase = result.get("phase", progress.phase)
+            progress.iteration = result.get("iteration", progress.iteration)
+            progress.error = result.get("error", "")
+            progress.agent_seconds = result.get("agent_seconds", 0.0)
+            progress.queue_seconds = result.get("queue_seconds", 0.0)
+        except Exception as e:
+            # One broken project (bad config, unreadable workdir) mustn't stop the batch
+            logger.exception("Batch job %s failed", job.name)
+            progress.status = "error"
+            progress.error = str(e)
+        finally:
+            progress.state = "finished"
+            progress.seconds = time.perf_counter() - progress.started
+        self._report(progress)
+
+    def _report(self, progress: JobProgress) -> None:
+        counts = self.counts()
+        if self.json_output:
+            record = {"type": "job", **progress.to_dict(), "counts": counts}
+            self.out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        else:
+            if progress.state == "finished":
+                detail = f"{progress.status} (exit {progress.exit_code}, {progress.seconds:.1f}s)"
+            elif progress.phase:
+                detail = f"{progress.phase} (iteration {progress.iteration})"
+            else:
+                detail = "started"
+            self.out.write(
+                f"[{counts['finished']}/{len(self.progress)} finished, {counts['running']} running]"
+                f" {progress.job.name}: {detail}\n"
+            )
+        self.out.flush()
+
+    def _summary(self, seconds: float, failed: list[JobProgress]) -> None:
+        statuses: dict[str, int] = {}
+        for progress in self.progress:
+            statuses[progress.status] = statuses.get(progress.status, 0) + 1
+        if self.json_output:
+            record = {
+                "type": "summary",
+                "jobs": len(self.progress),
+                "failed": [p.job.name for p in failed],
+                "statuses": statuses,
+                "seconds": round(seconds, 3),
+                "agent_seconds": round(sum(p.agent_seconds for p in self.progress), 3),
+                "queue_seconds": round(sum(p.queue_seconds for p in self.progress), 3),
+            }
+            self.out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        else:
+            totals = ", ".join(f"{count} {status}" for status, count in sorted(statuses.items()))
+            self.out.write(f"\n{len(self.progress)} jobs in {seconds:.1f}s: {totals}\n")
+            agent_seconds = sum(p.agent_seconds for p in self.progress)
+            queue_seconds = sum(p.queue_seconds for p in self.progress)
+            self.out.write(f"agent time {agent_seconds:.1f}s, queued for agents {queue_seconds:.1f}s\n")
+            for progress in failed:
+                error = f": {progress.error.splitlines()[0]}" if progress.error else ""
+                self.out.write(f"  {progress.job.name} ({progress.job.project_root}): {progress.status}{error}\n")
+        self.out.flush()
@@ -14,12 +14,81 @@ class RolesConfig:
     """Role to agent mapping configuration."""
     planner: str = "codex"
     reviewer: str = "claude"
+    reviewers: list[str] = field(default_factory=list)
+
+    def get_reviewers(self) -> list[str]:
+        """Get reviewer agent types (``reviewers`` if set, else ``[reviewer]``)."""
+        return self.reviewers or [self.reviewer]
 
 
 @dataclass
 class WorkflowConfig:
     """Workflow settings."""
     max_iterations: int = 5
+    autopilot: bool = False
+    pause_on: list[str] = field(default_factory=list)
+    time_budget: float = 0.0
+    early_verdict: bool = False
+    review_policy: str = "all"
+    max_parallel_steps: int = 1
+    incremental_review: bool = True
+    stall_detection: bool = True
+    min_plan_change: float = 0.02
+    stall_patience: int = 2
+
+
+@dataclass
+class AgentsConfig:
+    """Agent process settings."""
+    pooled: bool = False
+    pool_idle_timeout: float = 300.0
+    structured_output: bool = False
+    replay_dir: str = ""
+    replay_speed: float = 1.0
+    record_dir: str = ""
+
+
+@dataclass
+class TuiConfig:
+    """TUI settings."""
+    conversation_lines: int = 5000
+    output_interval: float = 0.033
+    output_max_pending: int = 65536
+    watch_files: bool = True
+    watch_debounce: float = 0.2
+
+
+@dataclass
+class PersistenceConfig:
+    """Workflow state persistence settings."""
+    backend: str = "snapshot"  # "snapshot" rewrites state.json, "journal" appends changes
+    fsync: str = "never"
+    compact_every: int = 100
+
+
+@dataclass
+class TelemetryConfig:
+    """Instrumentation settings."""
+    export_metrics: bool = True
+    trace: bool = False
+
+
+@dataclass
+class BatchConfig:
+    """Batch (many workflows at once) settings."""
+    max_jobs: int = 4
+
+
+@dataclass
+class AgentLimit:
+    """Scheduling limits for one agent type (0 means unlimited)."""
+    max_concurrent: int = 0
+    requests_per_minute: float = 0.0
+    burst: int = 1
+
+
+def _default_limits() -> dict[str, AgentLimit]:
+    return {"claude": AgentLimit(max_concurrent=4), "codex": AgentLimit(max_concurrent=4)}
 
 
 @dataclass
@@ -29,6 +98,7 @@ class PathsConfig:
     plan: str = "plan.md"
     comments: str = "comments.md"
     log: str = "log.md"
+    transcript: str = "conversation.log"
 
 
 @dataclass
@@ -36,6 +106,12 @@ class Config:
     """Main configuration container."""
     roles: RolesConfig = field(default_factory=RolesConfig)
     workflow: WorkflowConfig = field(default_factory=WorkflowConfig)
+    agents: AgentsConfig = field(default_factory=AgentsConfig)
+    tui: TuiConfig = field(default_factory=TuiConfig)
+    persistence: PersistenceConfig = field(default_factory=PersistenceConfig)
+    telemetry: TelemetryConfig = field(default_factory=TelemetryConfig)
+    batch: BatchConfig = field(default_factory=BatchConfig)
+    limits: dict[str, AgentLimit] = field(default_factory=_default_limits)
     paths: PathsConfig = field(default_factory=PathsConfig)
 
     def get_workdir(self, project_root: Path) -> Path:
@@ -50,34 +126,120 @@ class Config:
         """Get absolute path to comments.md."""
         return self.get_workdir(project_root) / self.paths.comments
 
+    def get_reviewer_comments_path(self, project_root: Path, index: int) -> Path:
+        """Get path to one reviewer's comments when several review in parallel.
+
+        Args:
+            project_root: Project root directory.
+            index: Zero-based reviewer index.
+        """
+        comments = Path(self.paths.comments)
+        return self.get_workdir(project_root) / f"{comments.stem}.{index + 1}{comments.suffix}"
+
     def get_log_path(self, project_root: Path) -> Path:
         """Get absolute path to log.md."""
         return self.get_workdir(project_root) / self.paths.log
 
+    def get_transcript_path(self, project_root: Path) -> Path:
+        """Get absolute path to the conversation transcript spill file."""
+        return self.get_workdir(project_root) / self.paths.transcript
+
     def get_state_path(self, project_root: Path) -> Path:
         """Get absolute path to state.json."""
         return self.get_workdir(project_root) / "state.json"
 
+    def get_metrics_path(self, project_root: Path) -> Path:
+        """Get absolute path to the JSON metrics summary."""
+        return self.get_workdir(project_root) / "metrics.json"
+
+    def get_prometheus_path(self, project_root: Path) -> Path:
+        """Get absolute path to the Prometheus text-format metrics file."""
+        return self.get_workdir(project_root) / "metrics.prom"
+
+    def get_trace_path(self, project_root: Path) -> Path:
+        """Get absolute path to the trace event file."""
+        return self.get_workdir(project_root) / "trace.json"
+
+    def get_objects_path(self, project_root: Path) -> Path:
+        """Get absolute path to the plan/comments version store."""
+        return self.get_workdir(project_root) / "objects"
+
+    def get_run_log_path(self, project_root: Path) -> Path:
+        """Get absolute path to the agent output log of a batch job."""
+        return self.get_workdir(project_root) / "run.log"
+
 
 def _dict_to_config(data: dict[str, Any]) -> Config:
     """Convert raw dict to Config dataclass."""
     roles_data = data.get("roles", {})
     workflow_data = data.get("workflow", {})
+    agents_data = data.get("agents", {})
+    tui_data = data.get("tui", {})
+    persistence_data = data.get("persistence", {})
+    telemetry_data = data.get("telemetry", {})
+    batch_data = data.get("batch", {})
+    limits = _default_limits()
+    for agent, limit_data in data.get("limits", {}).items():
+        limits[agent] = AgentLimit(
+            max_concurrent=limit_data.get("max_concurrent", 0),
+            requests_per_minute=limit_data.get("requests_per_minute", 0.0),
+            burst=limit_data.get("burst", 1),
+        )
     paths_data = data.get("paths", {})
 
     return Config(
         roles=RolesConfig(
             planner=roles_data.get("planner", "codex"),
             reviewer=roles_data.get("reviewer", "claude"),
+            reviewers=list(roles_data.get("reviewers", [])),
         ),
         workflow=WorkflowConfig(
             max_iterations=workflow_data.get("max_iterations", 5),
+            autopilot=workflow_data.get("autopilot", False),
+            pause_on=list(workflow_data.get("pause_on", [])),
+            time_budget=workflow_data.get("time_budget", 0.0),
+            early_verdict=workflow_data.get("early_verdict", False),
+            review_policy=workflow_data.get("review_policy", "all"),
+            max_parallel_steps=workflow_data.get("max_parallel_steps", 1),
+            incremental_review=workflow_data.get("incremental_review", True),
+            stall_detection=workflow_data.get("stall_detection", True),
+            min_plan_change=workflow_data.get("min_plan_change", 0.02),
+            stall_patience=workflow_data.get("stall_patience", 2),
+        ),
+        agents=AgentsConfig(
+            pooled=agents_data.get("pooled", False),
+            pool_idle_timeout=agents_data.get("pool_idle_timeout", 300.0),
+            structured_output=agents_data.get("structured_output", False),
+            replay_dir=agents_data.get("replay_dir", ""),
+            replay_speed=agents_data.get("replay_speed", 1.0),
+            record_dir=agents_data.get("record_dir", ""),
+        ),
+        tui=TuiConfig(
+            conversation_lines=tui_data.get("conversation_lines", 5000),
+            output_interval=tui_data.get("output_interval", 0.033),
+            output_max_pending=tui_data.get("output_max_pending", 65536),
+            watch_files=tui_data.get("watch_files", True),
+            watch_debounce=tui_data.get("watch_debounce", 0.2),
+        ),
+        persistence=PersistenceConfig(
+            backend=persistence_data.get("backend", "snapshot"),
+            fsync=persistence_data.get("fsync", "never"),
+            compact_every=persistence_data.get("compact_every", 100),
+        ),
+        telemetry=TelemetryConfig(
+            export_metrics=telemetry_data.get("export_metrics", True),
+            trace=telemetry_data.get("trace", False),
+        ),
+        batch=BatchConfig(
+            max_jobs=batch_data.get("max_jobs", 4),
         ),
+        limits=limits,
         paths=PathsConfig(
             workdir=paths_data.get("workdir", ".agent-collab"),
             plan=paths_data.get("plan", "plan.md"),
             comments=paths_data.get("comments", "comments.md"),
             log=paths_data.get("log", "log.md"),
+            transcript=paths_data.get("transcript", "conversation.log"),
         ),
     )
 
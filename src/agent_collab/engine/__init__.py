@@ -1,7 +1,21 @@
 """Workflow engine."""
 from .state_machine import Phase, can_transition, get_next_phases, TRANSITIONS
-from .prompt_loader import load_prompt, substitute_variables, list_prompts
-from .workflow import WorkflowController
+from .prompt_loader import (
+    MissingVariablesError,
+    PromptRegistry,
+    PromptTemplate,
+    load_prompt,
+    substitute_variables,
+    list_prompts,
+)
+from .comments import Comment, CommentIndex, CommentStatus, parse_comments
+from .convergence import Stall, StallReason, detect_stall
+from .plan_diff import PlanDiff, diff_plans
+from .plan_parser import PlanCache, PlanIndex, PlanStep, mark_step_done, parse_plan
+from .parallel_exec import ParallelExecutor, StepOutcome, StepStatus, dependency_order
+from .worktree import GitError
+from .verdict import Verdict, VerdictParser, parse_verdict, read_verdict
+from .workflow import AutopilotResult, WorkflowController
 
 __all__ = [
     "Phase",
@@ -11,5 +25,32 @@ __all__ = [
     "load_prompt",
     "substitute_variables",
     "list_prompts",
+    "PromptTemplate",
+    "PromptRegistry",
+    "MissingVariablesError",
     "WorkflowController",
+    "AutopilotResult",
+    "Verdict",
+    "VerdictParser",
+    "parse_verdict",
+    "read_verdict",
+    "PlanStep",
+    "PlanIndex",
+    "PlanCache",
+    "parse_plan",
+    "mark_step_done",
+    "ParallelExecutor",
+    "StepOutcome",
+    "StepStatus",
+    "dependency_order",
+    "GitError",
+    "Comment",
+    "CommentIndex",
+    "CommentStatus",
+    "parse_comments",
+    "PlanDiff",
+    "diff_plans",
+    "Stall",
+    "StallReason",
+    "detect_stall",
 ]
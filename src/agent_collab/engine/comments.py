@@ -0,0 +1,147 @@
+"""Structured review comments with stable IDs and status."""
+import re
+from dataclasses import dataclass
+from enum import Enum
+from typing import Iterator
+
+SEVERITIES = ("critical", "major", "minor")
+DEFAULT_SEVERITY = "major"
+
+# "- [C3] (major) [open] Step 2 has no rollback."
+_COMMENT_RE = re.compile(
+    r"^[-*+]\s+\[C(\d+)\]\s+(?:\((\w+)\)\s+)?\[(\w+)\]\s*(.*)$", re.IGNORECASE
+)
+_BARE_ITEM_RE = re.compile(r"^([-*+]|\d+[.)])\s+(.*)$")
+
+
+class CommentStatus(Enum):
+    """Lifecycle of a review comment."""
+    OPEN = "open"
+    FIXED = "fixed"  # the planner says it is addressed
+    RESOLVED = "resolved"  # the reviewer confirmed the fix
+
+
+@dataclass
+class Comment:
+    """One review comment."""
+    id: int
+    severity: str
+    status: CommentStatus
+    text: str
+
+    @property
+    def label(self) -> str:
+        """The comment's ID as written in comments.md."""
+        return f"C{self.id}"
+
+    def render(self) -> str:
+        """Format the comment as a comments.md list item."""
+        return f"- [{self.label}] ({self.severity}) [{self.status.value}] {self.text}"
+
+
+class CommentIndex:
+    """Parsed comments of a comments.md file, indexed by ID."""
+
+    def __init__(self, comments: list[Comment]) -> None:
+        self.comments = comments
+        self._by_id = {comment.id: comment for comment in comments}
+
+    def __len__(self) -> int:
+        return len(self.comments)
+
+    def __iter__(self) -> Iterator[Comment]:
+        return iter(self.comments)
+
+    def get(self, comment_id: int) -> Comment | None:
+        """Look up a comment by number."""
+        return self._by_id.get(comment_id)
+
+    def with_status(self, status: CommentStatus) -> list[Comment]:
+        """Comments with the given status, in file order."""
+        return [comment for comment in self.comments if comment.status == status]
+
+    @property
+    def open_count(self) -> int:
+        """Comments not yet resolved (open, or fixed but unverified)."""
+        return sum(1 for comment in self.comments if comment.status != CommentStatus.RESOLVED)
+
+    @property
+    def max_id(self) -> int:
+        """Highest comment number (0 if there are none)."""
+        return max(self._by_id, default=0)
+
+
+def parse_comment_item(line: str) -> Comment | None:
+    """Parse one structured comments.md list item, or None if it isn't one."""
+    match = _COMMENT_RE.match(line)
+    if not match:
+        return None
+    number, severity, status, text = match.groups()
+    try:
+        parsed_status = CommentStatus(status.lower())
+    except ValueError:
+        parsed_status = CommentStatus.OPEN
+    severity = (severity or DEFAULT_SEVERITY).lower()
+    if severity not in SEVERITIES:
+        severity = DEFAULT_SEVERITY
+    return Comment(int(number), severity, parsed_status, text.strip())
+
+
+def parse_comments(content: str) -> CommentIndex:
+    """Parse the structured items of a comments file.
+
+    Indented lines following an item are joined onto its text. Unknown
+    statuses count as open and unknown severities as the default.
+
+    Args:
+        content: Raw comments.md content.
+
+    Returns:
+        CommentIndex of the items (later duplicates of an ID are ignored).
+    """
+    comments: list[Comment] = []
+    seen: set[int] = set()
+    current: Comment | None = None
+    for line in content.splitlines():
+        comment = parse_comment_item(line)
+        if comment is not None:
+            current = None
+            if comment.id not in seen:
+                seen.add(comment.id)
+                comments.append(comment)
+                current = comment
+        elif current is not None and line.startswith(("  ", "\t")) and line.strip():
+            current.text += " " + line.strip()
+        else:
+            current = None
+    return CommentIndex(comments)
+
+
+def assign_comment_ids(content: str, next_id: int) -> str:
+    """Give IDs to top-level list items written without one.
+
+    Reviewers are asked to use the structured format, but free-form items
+    are accepted and numbered here so every comment can be tracked.
+
+    Args:
+        content: Raw comments.md content.
+        next_id: Number for the first new ID.
+
+    Returns:
+        The content with every top-level item in the structured format.
+    """
+    lines = []
+    for line in content.splitlines(keepends=True):
+        match = _BARE_ITEM_RE.match(line)
+        if match and parse_comment_item(line) is None:
+            newline = line[len(line.rstrip("\r\n")):]
+            comment = Comment(next_id, DEFAULT_SEVERITY, CommentStatus.OPEN, match.group(2).rstrip())
+            line = comment.render() + newline
+            next_id += 1
+        lines.append(line)
+    return "".join(lines)
+
+
+def format_comments(comments: list[Comment]) -> str:
+    """Format comments as a list for prompts ("(none)" if empty)."""
+    return "\n".join(comment.render() for comment in comments) or "(none)"
@@ -0,0 +1,133 @@
+"""Detection of review loops that have stopped making progress."""
+import difflib
+import re
+from dataclasses import dataclass
+from enum import Enum
+
+from .comments import Comment, CommentStatus, parse_comments
+
+# Comments whose word shingles overlap at least this much are the same issue
+DUPLICATE_SIMILARITY = 0.8
+
+
+class StallReason(Enum):
+    """Why a review loop looks stalled."""
+    SMALL_CHANGES = "small_changes"
+    REPEATED_COMMENTS = "repeated_comments"
+    OSCILLATION = "oscillation"
+
+
+@dataclass
+class Stall:
+    """A detected stall, with a human-readable explanation."""
+    reason: StallReason
+    detail: str
+
+
+@dataclass
+class IterationRecord:
+    """The plan and comments as they were after one review."""
+    iteration: int
+    plan_hash: str
+    plan: str
+    comments: str
+
+
+def plan_change(old: str, new: str) -> float:
+    """Fraction of plan lines that changed between two versions (0.0 - 1.0)."""
+    if old == new:
+        return 0.0
+    matcher = difflib.SequenceMatcher(None, old.splitlines(), new.splitlines(), autojunk=False)
+    return 1.0 - matcher.ratio()
+
+
+def _shingles(text: str) -> frozenset[tuple[str, ...]]:
+    words = re.sub(r"[^\w\s]", " ", text.lower()).split()
+    if len(words) < 3:
+        return frozenset([tuple(words)])
+    return frozenset(zip(words, words[1:], words[2:]))
+
+
+def same_issue(a: str, b: str) -> bool:
+    """Whether two comment texts describe the same issue (near-duplicates)."""
+    sa, sb = _shingles(a), _shingles(b)
+    if not sa or not sb:
+        return sa == sb
+    return len(sa & sb) / len(sa | sb) >= DUPLICATE_SIMILARITY
+
+
+def _unresolved(comments: str) -> list[Comment]:
+    return [c for c in parse_comments(comments) if c.status != CommentStatus.RESOLVED]
+
+
+def _same_issues(a: list[Comment], b: list[Comment]) -> bool:
+    return (
+        all(any(same_issue(x.text, y.text) for y in b) for x in a)
+        and all(any(same_issue(y.text, x.text) for x in a) for y in b)
+    )
+
+
+def detect_stall(
+    records: list[IterationRecord],
+    min_plan_change: float = 0.02,
+    patience: int = 2,
+) -> Stall | None:
+    """Check whether the latest iterations show the loop has stalled.
+
+    Three signals are checked, most specific first:
+
+    - Oscillation: the plan returned to an earlier version, or an issue the
+      reviewer had resolved was raised again.
+    - Repeated comments: the same unresolved issues (by near-duplicate
+      text, ignoring IDs) came back for ``patience`` reviews in a row.
+    - Small changes: the plan changed by less than ``min_plan_change`` of
+      its lines for ``patience`` revisions in a row.
+
+    Args:
+        records: Iterations in order; only the most recent few are used.
+        min_plan_change: Revision size below which a revision counts as small.
+        patience: Consecutive unproductive revisions tolerated.
+
+    Returns:
+        The stall, or None if the loop is still making progress.
+    """
+    if len(records) < 2:
+        return None
+    latest = records[-1]
+
+    for earlier in records[:-2]:
+        if earlier.plan_hash == latest.plan_hash and records[-2].plan_hash != latest.plan_hash:
+            return Stall(
+                StallReason.OSCILLATION,
+                f"plan after iteration {latest.iteration} is identical to iteration {earlier.iteration}",
+            )
+    unresolved = _unresolved(latest.comments)
+    for earlier in records[:-1]:
+        for resolved in parse_comments(earlier.comments).with_status(CommentStatus.RESOLVED):
+            for comment in unresolved:
+                if same_issue(comment.text, resolved.text):
+                    return Stall(
+                        StallReason.OSCILLATION,
+                        f"{comment.label} reopens {resolved.label}, resolved in iteration {earlier.iteration}",
+                    )
+
+    if len(records) <= patience:
+        return None
+    window = records[-(patience + 1):]
+    pairs = list(zip(window, window[1:]))
+
+    if unresolved and all(
+        _same_issues(_unresolved(a.comments), _unresolved(b.comments)) for a, b in pairs
+    ):
+        return Stall(
+            StallReason.REPEATED_COMMENTS,
+            f"the same {len(unresolved)} unresolved comment(s) came back for {patience} reviews",
+        )
+
+    changes = [plan_change(a.plan, b.plan) for a, b in pairs]
+    if all(change < min_plan_change for change in changes):
+        return Stall(
+            StallReason.SMALL_CHANGES,
+            f"the last {patience} revisions changed under {min_plan_change:.0%} of the plan",
+        )
+    return None
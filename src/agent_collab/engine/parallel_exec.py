@@ -0,0 +1,225 @@
+"""Dependency-ordered parallel execution of plan steps in git worktrees."""
+import asyncio
+import shutil
+import tempfile
+import uuid
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from .plan_parser import PlanIndex, PlanStep
+from .worktree import GitError, Worktree, git, merge_branch
+
+
+class StepStatus(Enum):
+    """What happened to a step during parallel execution."""
+    MERGED = "merged"
+    NO_CHANGES = "no_changes"
+    CONFLICT = "conflict"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+
+_SUCCESS = (StepStatus.MERGED, StepStatus.NO_CHANGES)
+
+
+@dataclass
+class StepOutcome:
+    """Result of executing one plan step."""
+    number: int
+    status: StepStatus
+    branch: str = ""
+    conflicts: list[str] = field(default_factory=list)
+    error: str = ""
+
+
+def dependency_order(steps: list[PlanStep]) -> list[PlanStep]:
+    """Order steps so each comes after the steps it depends on.
+
+    Dependencies on steps that are not in the list (already done, or not
+    in the plan) are treated as satisfied. Ties keep plan order.
+
+    Raises:
+        ValueError: If the dependencies form a cycle.
+    """
+    numbers = {step.number for step in steps}
+    remaining = {step.number: [d for d in step.depends_on if d in numbers] for step in steps}
+    ordered: list[PlanStep] = []
+    placed: set[int] = set()
+    while remaining:
+        ready = [s for s in steps if s.number in remaining and all(d in placed for d in remaining[s.number])]
+        if not ready:
+            cycle = ", ".join(str(n) for n in sorted(remaining))
+            raise ValueError(f"Plan step dependencies form a cycle among steps {cycle}")
+        for step in ready:
+            ordered.append(step)
+            placed.add(step.number)
+            del remaining[step.number]
+    return ordered
+
+
+class ParallelExecutor:
+    """Runs independent plan steps concurrently, each in its own worktree.
+
+    A step starts once every step it depends on has been merged, on a
+    branch cut from the repository's HEAD at that moment and named after
+    the step and the run, so branches kept by earlier runs are never
+    reused. Finished steps
+    are committed on their branch and merged back one at a time; a step
+    whose merge conflicts is reported and its branch kept, and steps that
+    depend on a failed or conflicting step are skipped.
+    """
+
+    def __init__(
+        self,
+        repo: Path,
+        run_step: Callable[[PlanStep, Path], Awaitable[None]],
+        max_parallel: int = 4,
+        on_start: Callable[[PlanStep], None] | None = None,
+        on_merged: Callable[[PlanStep], None] | None = None,
+        branch_prefix: str = "agent-collab/step-",
+    ) -> None:
+        """Initialize executor.
+
+        Args:
+            repo: Root of the git repository results are merged into.
+            run_step: Runs one step with the worktree path as working directory.
+            max_parallel: Maximum number of steps running at once.
+            on_start: Called with each step as it starts.
+            on_merged: Called with each step after its changes are merged
+                (or it finished without changes).
+            branch_prefix: Prefix of the per-step branch names
+                (``<prefix><step>-<run ID>``).
+
+        Raises:
+            ValueError: If max_parallel is less than 1.
+        """
+        if max_parallel < 1:
+            raise ValueError(f"max_parallel must be at least 1, got {max_parallel}")
+        self.repo = repo
+        self.run_step = run_step
+        self.max_parallel = max_parallel
+        self.on_start = on_start or (lambda step: None)
+        self.on_merged = on_merged or (lambda step: None)
+        self.branch_prefix = branch_prefix
+        # git's worktree bookkeeping isn't safe against concurrent updates,
+        # so adding, removing and merging worktrees is serialized
+        self._git_lock = asyncio.Lock()
+
+    async def run(self, index: PlanIndex) -> list[StepOutcome]:
+        """Execute the index's pending steps.
+
+        Returns:
+            One outcome per pending step, in dependency order.
+
+        Raises:
+            ValueError: If the repository is not a git repository with at
+                least one commit, or step dependencies form a cycle.
+        """
+        steps = dependency_order(index.pending())
+        if not steps:
+            return []
+        try:
+            await git("rev-parse", "--verify", "HEAD", cwd=self.repo)
+        except GitError:
+            raise ValueError(f"Parallel execution needs a git repository with a commit: {self.repo}")
+
+        pending = {step.number for step in steps}
+        deps = {step.number: [d for d in step.depends_on if d in pending] for step in steps}
+        outcomes: dict[int, StepOutcome] = {}
+        running: dict[asyncio.Task, PlanStep] = {}
+        started: set[int] = set()
+        root = Path(tempfile.mkdtemp(prefix="agent-collab-worktrees-"))
+        run_id = uuid.uuid4().hex[:8]
+
+        try:
+            while True:
+                for step in steps:
+                    if step.number in started or step.number in outcomes:
+                        continue
+                    blocked = [
+                        str(d) for d in deps[step.number]
+                        if d in outcomes and outcomes[d].status not in _SUCCESS
+                    ]
+                    if blocked:
+                        outcomes[step.number] = StepOutcome(
+                            step.number, StepStatus.SKIPPED,
+                            error=f"depends on unfinished step {', '.join(blocked)}",
+                        )
+                    elif all(d in outcomes for d in deps[step.number]) and len(running) < self.max_parallel:
+                        base = await git("rev-parse", "HEAD", cwd=self.repo)
+                        started.add(step.number)
+                        self.on_start(step)
+                        branch = f"{self.branch_prefix}{step.number}-{run_id}"
+                        task = asyncio.create_task(self._run_in_worktree(step, root, base, branch))
+                        running[task] = step
+
+                if not running:
+                    break
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                # Merge steps that finished together in dependency order
+                for task in sorted(done, key=lambda t: steps.index(running[t])):
+                    step = running.pop(task)
+                    outcomes[step.number] = await self._finish(step, task)
+        finally:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+            shutil.rmtree(root, ignore_errors=True)
+            await git("worktree", "prune", cwd=self.repo, check=False)
+
+        return [outcomes[step.number] for step in steps]
+
+    async def _run_in_worktree(
+        self, step: PlanStep, root: Path, base: str, branch: str
+    ) -> tuple[Worktree, bool]:
+        """Create a worktree for step on branch, run it there and commit the result.
+
+        Returns:
+            The worktree and whether its branch has changes to merge.
+        """
+        async with self._git_lock:
+            worktree = await Worktree.create(self.repo, root / f"step-{step.number}", branch, base)
+        try:
+            await self.run_step(step, worktree.path)
+            changed = await worktree.commit_all(f"Step {step.number}: {step.title}")
+        except BaseException:
+            async with self._git_lock:
+                await worktree.remove()
+            raise
+        return worktree, changed
+
+    async def _finish(self, step: PlanStep, task: asyncio.Task) -> StepOutcome:
+        """Record a finished step's outcome while holding the git lock."""
+        async with self._git_lock:
+            return await self._merge(step, task)
+
+    async def _merge(self, step: PlanStep, task: asyncio.Task) -> StepOutcome:
+        """Merge a finished step's branch and clean up its worktree."""
+        try:
+            worktree, changed = task.result()
+        except Exception as e:
+            return StepOutcome(step.number, StepStatus.FAILED, error=str(e))
+        branch = worktree.branch
+
+        if not changed:
+            await worktree.remove()
+            self.on_merged(step)
+            return StepOutcome(step.number, StepStatus.NO_CHANGES)
+
+        try:
+            conflicts = await merge_branch(self.repo, branch, f"Merge step {step.number}: {step.title}")
+        except GitError as e:
+            await git("worktree", "remove", "--force", str(worktree.path), cwd=self.repo, check=False)
+            return StepOutcome(step.number, StepStatus.FAILED, branch=branch, error=str(e))
+
+        if conflicts:
+            # Keep the branch so the conflict can be resolved by hand
+            await git("worktree", "remove", "--force", str(worktree.path), cwd=self.repo, check=False)
+            return StepOutcome(step.number, StepStatus.CONFLICT, branch=branch, conflicts=conflicts)
+
+        await worktree.remove()
+        self.on_merged(step)
+        return StepOutcome(step.number, StepStatus.MERGED, branch=branch)
@@ -0,0 +1,93 @@
+"""Section-level diff between two versions of a plan."""
+import re
+from dataclasses import dataclass, field
+
+# Sections start at a markdown heading or a top-level numbered/checkbox item
+_BOUNDARY_RE = re.compile(r"^(?:#{1,6}\s|\d+[.)]\s|[-*+]\s+\[[ xX]\])")
+_CHECKBOX_RE = re.compile(r"\[[xX]\]")
+
+
+@dataclass
+class PlanSection:
+    """A heading or plan step and the lines under it."""
+    key: str
+    text: str
+
+
+@dataclass
+class PlanDiff:
+    """Sections that differ between two plan versions."""
+    changed: list[PlanSection] = field(default_factory=list)
+    removed: list[PlanSection] = field(default_factory=list)
+    total: int = 0
+
+    @property
+    def empty(self) -> bool:
+        """Whether the plans have the same sections."""
+        return not self.changed and not self.removed
+
+    @property
+    def changed_size(self) -> int:
+        """Characters in the changed sections."""
+        return sum(len(section.text) for section in self.changed)
+
+
+def split_sections(text: str) -> list[PlanSection]:
+    """Split a plan into sections.
+
+    A section starts at each markdown heading and each top-level numbered
+    or checkbox item, and runs to the next one. Text before the first
+    boundary forms a section with an empty key.
+
+    Args:
+        text: Plan markdown.
+
+    Returns:
+        Sections in order. A section's key is its first line (with checked
+        boxes normalized), numbered to keep repeated headings distinct.
+    """
+    sections: list[PlanSection] = []
+    key = ""
+    lines: list[str] = []
+    seen: dict[str, int] = {}
+
+    def close() -> None:
+        if not lines and not key:
+            return
+        count = seen.get(key, 0)
+        seen[key] = count + 1
+        sections.append(PlanSection(f"{key}#{count}" if count else key, "".join(lines)))
+
+    for line in text.splitlines(keepends=True):
+        if _BOUNDARY_RE.match(line):
+            close()
+            key = _CHECKBOX_RE.sub("[ ]", line.strip())
+            lines = []
+        lines.append(line)
+    close()
+    return sections
+
+
+def diff_plans(old: str, new: str) -> PlanDiff:
+    """Find the sections of new that were added or changed since old.
+
+    Args:
+        old: Previous plan text.
+        new: Current plan text.
+
+    Returns:
+        Changed (or added) sections of new, sections of old that are gone,
+        and the total number of sections in new.
+    """
+    old_sections = {section.key: section for section in split_sections(old)}
+    new_sections = split_sections(new)
+    new_keys = {section.key for section in new_sections}
+    return PlanDiff(
+        changed=[
+            section for section in new_sections
+            if section.key not in old_sections
+            or old_sections[section.key].text.strip() != section.text.strip()
+        ],
+        removed=[section for key, section in old_sections.items() if key not in new_keys],
+        total=len(new_sections),
+    )
@@ -0,0 +1,297 @@
+"""Plan parsing and step index."""
+import hashlib
+import re
+import textwrap
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator
+
+# "## Step 3: Title", "### 3. Title", "## Step 3 - Title"
+_HEADING_RE = re.compile(r"^#{2,6}\s+(?:Step\s+)?(\d+)\s*[:.)-]?\s*(.*)$", re.IGNORECASE)
+# "- [ ] Title", "- [x] Step 2: Title", "1. Title", "1) [ ] Title"
+_ITEM_RE = re.compile(r"^(?:[-*+]|(\d+)[.)])\s+(?:\[([ xX])\]\s+)?(.*)$")
+_STEP_PREFIX_RE = re.compile(r"^Step\s+(\d+)\s*[:.)-]?\s*", re.IGNORECASE)
+_DONE_RE = re.compile(r"\[[xX]\]")
+
+_DEPENDS_RE = re.compile(
+    r"\b(?:depends\s+on|dependencies|prerequisites?)\b\s*:?\s*(?:steps?\s*)?"
+    r"(#?\d+(?:\s*(?:,|and|&)\s*(?:steps?\s*)?#?\d+)*)",
+    re.IGNORECASE,
+)
+_AFTER_RE = re.compile(
+    r"\b(?:after|requires|needs)\s+steps?\s+(#?\d+(?:\s*(?:,|and|&)\s*#?\d+)*)",
+    re.IGNORECASE,
+)
+_BACKTICK_RE = re.compile(r"`([^`\s]+)`")
+_BARE_PATH_RE = re.compile(r"(?<![\w`/])((?:[\w.-]+/)+[\w.-]+\.\w+)")
+_PATHISH_RE = re.compile(r"^[\w./-]+(?:/[\w.-]+|\.\w{1,6})$")
+
+
+@dataclass
+class PlanStep:
+    """One step of a plan."""
+    number: int
+    title: str
+    body: str = ""
+    depends_on: list[int] = field(default_factory=list)
+    files: list[str] = field(default_factory=list)
+    done: bool = False
+
+    @property
+    def content(self) -> str:
+        """Full step text (title and body) for prompts."""
+        return f"{self.title}\n{self.body}".strip()
+
+
+class PlanIndex:
+    """Structured, numbered index of plan steps with O(1) lookup."""
+
+    def __init__(self, steps: list[PlanStep]) -> None:
+        self.steps = steps
+        self._by_number = {step.number: step for step in steps}
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def __iter__(self) -> Iterator[PlanStep]:
+        return iter(self.steps)
+
+    def get(self, number: int) -> PlanStep | None:
+        """Look up a step by number."""
+        return self._by_number.get(number)
+
+    def pending(self) -> list[PlanStep]:
+        """Steps not yet marked done, in plan order."""
+        return [step for step in self.steps if not step.done]
+
+
+def _step_style(lines: list[str]) -> str:
+    """Pick how steps are marked in this plan.
+
+    Step headings win; otherwise checkbox items, then numbered items, then
+    any top-level bullet. Picking the most specific style keeps summary
+    bullets from being mistaken for steps.
+    """
+    if any(_HEADING_RE.match(line) for line in lines):
+        return "heading"
+    items = [m for m in map(_ITEM_RE.match, lines) if m]
+    if any(m.group(2) is not None for m in items):
+        return "checkbox"
+    if any(m.group(1) for m in items):
+        return "numbered"
+    return "bullet"
+
+
+def _split_blocks(text: str) -> list[tuple[int, int | None, bool, str, str]]:
+    """Split plan text into raw step blocks.
+
+    Text after a step, up to the next step or an enclosing heading, is
+    that step's body.
+
+    Returns:
+        List of (line index, explicit number or None, done, title, body) tuples.
+    """
+    lines = text.splitlines()
+    style = _step_style(lines)
+
+    blocks: list[tuple[int, int | None, bool, str, list[str]]] = []
+    step_level = 0  # heading level of the open step; 0 = no open step
+    for line_index, line in enumerate(lines):
+        number: int | None = None
+        done = False
+        title: str | None = None
+
+        if style == "heading":
+            match = _HEADING_RE.match(line)
+            if match:
+                number, title = int(match.group(1)), match.group(2).strip()
+                done = bool(_DONE_RE.search(title))
+                title = _DONE_RE.sub("", title).strip()
+        else:
+            match = _ITEM_RE.match(line)
+            if match and (
+                style == "bullet"
+                or (style == "checkbox" and match.group(2) is not None)
+                or (style == "numbered" and match.group(1))
+            ):
+                if match.group(1):
+                    number = int(match.group(1))
+                done = (match.group(2) or " ").lower() == "x"
+                title = match.group(3).strip()
+
+        if title is not None:
+            prefix = _STEP_PREFIX_RE.match(title)
+            if prefix:
+                number = int(prefix.group(1))
+                title = title[prefix.end():]
+            blocks.append((line_index, number, done, title, []))
+            step_level = len(line) - len(line.lstrip("#")) if style == "heading" else 7
+        elif line.startswith("#") and step_level:
+            level = len(line) - len(line.lstrip("#"))
+            if level <= step_level:
+                # A heading at or above the step's level closes it
+                step_level = 0
+            else:
+                blocks[-1][4].append(line)
+        elif step_level:
+            blocks[-1][4].append(line)
+
+    return [
+        (i, n, d, t, textwrap.dedent("\n".join(body)).strip("\n"))
+        for i, n, d, t, body in blocks
+    ]
+
+
+def _parse_dependencies(text: str, own_number: int) -> list[int]:
+    deps: list[int] = []
+    for pattern in (_DEPENDS_RE, _AFTER_RE):
+        for match in pattern.finditer(text):
+            for number in re.findall(r"\d+", match.group(1)):
+                value = int(number)
+                if value != own_number and value not in deps:
+                    deps.append(value)
+    return sorted(deps)
+
+
+def _parse_files(text: str) -> list[str]:
+    files: list[str] = []
+    candidates = [m.group(1) for m in _BACKTICK_RE.finditer(text)]
+    candidates += [m.group(1) for m in _BARE_PATH_RE.finditer(text)]
+    for candidate in candidates:
+        candidate = candidate.rstrip(".,:;")
+        if _PATHISH_RE.match(candidate) and not candidate.replace(".", "").isdigit():
+            if candidate not in files:
+                files.append(candidate)
+    return files
+
+
+def _build_step(number: int, done: bool, title: str, body: str) -> PlanStep:
+    full = f"{title}\n{body}"
+    return PlanStep(
+        number=number,
+        title=title,
+        body=body,
+        depends_on=_parse_dependencies(full, number),
+        files=_parse_files(full),
+        done=done,
+    )
+
+
+def parse_plan(text: str) -> PlanIndex:
+    """Parse plan markdown into a step index.
+
+    Args:
+        text: plan.md content.
+
+    Returns:
+        PlanIndex of the plan's steps.
+    """
+    return _index_blocks(_split_blocks(text), {})
+
+
+def _number_blocks(
+    blocks: list[tuple[int, int | None, bool, str, str]],
+) -> Iterator[tuple[int, int, bool, str, str]]:
+    """Assign numbers to blocks; unnumbered steps follow the previous one."""
+    next_number = 1
+    for line_index, explicit, done, title, body in blocks:
+        number = explicit if explicit is not None else next_number
+        next_number = number + 1
+        yield line_index, number, done, title, body
+
+
+def _index_blocks(
+    blocks: list[tuple[int, int | None, bool, str, str]],
+    previous: dict[tuple[int, str], PlanStep],
+) -> PlanIndex:
+    """Build an index, reusing parsed steps whose block is unchanged."""
+    steps = []
+    for _, number, done, title, body in _number_blocks(blocks):
+        key = (number, _block_hash(done, title, body))
+        step = previous.get(key) or _build_step(number, done, title, body)
+        steps.append(step)
+    return PlanIndex(steps)
+
+
+def mark_step_done(text: str, number: int) -> str:
+    """Check off a step in plan markdown.
+
+    Checkbox items get ``[x]``, headings get a trailing ``[x]``, and plain
+    list items get a ``[x]`` after their marker.
+
+    Args:
+        text: plan.md content.
+        number: Step number.
+
+    Returns:
+        Updated plan text (unchanged if the step is missing or already done).
+    """
+    lines = text.splitlines(keepends=True)
+    for line_index, step_number, done, _, _ in _number_blocks(_split_blocks(text)):
+        if step_number != number:
+            continue
+        if done:
+            return text
+        line = lines[line_index]
+        stripped = line.rstrip("\r\n")
+        ending = line[len(stripped):]
+        if stripped.startswith("#"):
+            lines[line_index] = f"{stripped} [x]{ending}"
+        elif re.match(r"^(?:[-*+]|\d+[.)])\s+\[ \]", stripped):
+            lines[line_index] = stripped.replace("[ ]", "[x]", 1) + ending
+        else:
+            lines[line_index] = re.sub(r"^((?:[-*+]|\d+[.)])\s+)", r"\1[x] ", stripped, count=1) + ending
+        return "".join(lines)
+    return text
+
+
+def _block_hash(done: bool, title: str, body: str) -> str:
+    return hashlib.sha1(f"{done}\0{title}\0{body}".encode()).hexdigest()
+
+
+class PlanCache:
+    """Caches the parsed step index for a plan file.
+
+    The file is only re-read when its mtime or size changes, only re-split
+    when its content hash changes, and only steps whose text changed are
+    re-parsed.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Initialize cache.
+
+        Args:
+            path: Path to plan.md.
+        """
+        self.path = path
+        self._stat: tuple[int, int] | None = None
+        self._hash: str | None = None
+        self._index = PlanIndex([])
+        self._steps: dict[tuple[int, str], PlanStep] = {}
+
+    def get(self) -> PlanIndex:
+        """Get the current step index, refreshing it if the file changed."""
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            self._stat, self._hash = None, None
+            self._index, self._steps = PlanIndex([]), {}
+            return self._index
+
+        key = (stat.st_mtime_ns, stat.st_size)
+        if key == self._stat:
+            return self._index
+
+        text = self.path.read_text()
+        digest = hashlib.sha1(text.encode()).hexdigest()
+        self._stat = key
+        if digest == self._hash:
+            return self._index
+
+        self._hash = digest
+        self._index = _index_blocks(_split_blocks(text), self._steps)
+        self._steps = {
+            (step.number, _block_hash(step.done, step.title, step.body)): step
+            for step in self._index
+        }
+        return self._index
@@ -2,6 +2,118 @@
 import re
 from pathlib import Path
 
+_VARIABLE_RE = re.compile(r"\{\{(\w+)\}\}")
+
+
+class MissingVariablesError(ValueError):
+    """Raised when a prompt is rendered without all of its variables."""
+
+    def __init__(self, template: str, missing: list[str]) -> None:
+        self.template = template
+        self.missing = missing
+        names = ", ".join("{{" + name + "}}" for name in missing)
+        super().__init__(f"Prompt {template} is missing variables: {names}")
+
+
+class PromptTemplate:
+    """A prompt template split once into literal text and variable slots.
+
+    Rendering joins the precompiled segments instead of re-scanning the
+    template, and reports variables that weren't supplied.
+    """
+
+    def __init__(self, text: str, name: str = "<template>") -> None:
+        """Compile a template.
+
+        Args:
+            text: Template text with {{variable}} placeholders.
+            name: Name used in error messages.
+        """
+        self.name = name
+        parts = _VARIABLE_RE.split(text)
+        # Alternates literal, variable name, literal, ...; always odd length
+        self._literals = parts[0::2]
+        self._names = parts[1::2]
+        self.variables = frozenset(self._names)
+
+    def render(self, **variables: str) -> str:
+        """Fill in the template.
+
+        Args:
+            **variables: Variable name-value pairs. Extra names are ignored.
+
+        Returns:
+            The prompt text.
+
+        Raises:
+            MissingVariablesError: If a variable in the template wasn't given.
+        """
+        missing = sorted(self.variables - variables.keys())
+        if missing:
+            raise MissingVariablesError(self.name, missing)
+        out = [self._literals[0]]
+        for name, literal in zip(self._names, self._literals[1:]):
+            out.append(variables[name])
+            out.append(literal)
+        return "".join(out)
+
+
+class PromptRegistry:
+    """Cache of compiled prompt templates from a prompts directory.
+
+    Templates are read and compiled on first use (or all at once with
+    ``load_all``) and recompiled when a file's mtime or size changes, so
+    edits to the prompts take effect without a restart.
+    """
+
+    def __init__(self, prompts_dir: Path) -> None:
+        """Initialize registry.
+
+        Args:
+            prompts_dir: Directory containing the .md templates.
+        """
+        self.prompts_dir = prompts_dir
+        self._templates: dict[str, tuple[tuple[int, int], PromptTemplate]] = {}
+
+    def load_all(self) -> list[str]:
+        """Load and compile every template in the directory (warm start).
+
+        Returns:
+            Names of the loaded templates.
+        """
+        names = [path.name for path in list_prompts(self.prompts_dir)]
+        for name in names:
+            self.get(name)
+        return names
+
+    def get(self, name: str) -> PromptTemplate:
+        """Get a compiled template, reloading it if the file changed.
+
+        Args:
+            name: Template file name, e.g. "02_write_plan.md".
+
+        Raises:
+            FileNotFoundError: If the template file doesn't exist.
+        """
+        path = self.prompts_dir / name
+        stat = path.stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._templates.get(name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        template = PromptTemplate(path.read_text(), name)
+        self._templates[name] = (key, template)
+        return template
+
+    def render(self, name: str, /, **variables: str) -> str:
+        """Render a template by name.
+
+        Raises:
+            FileNotFoundError: If the template file doesn't exist.
+            MissingVariablesError: If a variable in the template wasn't given.
+        """
+        return self.get(name).render(**variables)
+
 
 def load_prompt(template_path: Path, **variables: str) -> str:
     """Load prompt template and substitute variables.
@@ -36,7 +148,7 @@ def substitute_variables(template: str, **variables: str) -> str:
         var_name = match.group(1).strip()
         return variables.get(var_name, match.group(0))
 
-    return re.sub(r"\{\{(\w+)\}\}", replace, template)
+    return _VARIABLE_RE.sub(replace, template)
 
 
 def list_prompts(prompts_dir: Path) -> list[Path]:
@@ -0,0 +1,197 @@
+"""Merging comments from several reviewers."""
+import re
+from dataclasses import dataclass, field
+
+from .comments import DEFAULT_SEVERITY, SEVERITIES, Comment, CommentStatus, parse_comment_item
+from .verdict import Verdict, parse_verdict
+
+REVIEW_POLICIES = ("all", "any", "majority")
+
+_ITEM_RE = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+(.*)$")
+_LABELS_RE = re.compile(r"\s*\(([^()]*)\)\s*$")
+
+# When reviewers disagree about a comment, the least settled status wins
+_STATUS_ORDER = (CommentStatus.OPEN, CommentStatus.FIXED, CommentStatus.RESOLVED)
+
+
+@dataclass
+class Review:
+    """One reviewer's parsed comments."""
+    label: str
+    verdict: Verdict | None = None
+    issues: list[str] = field(default_factory=list)
+    notes: list[str] = field(default_factory=list)
+
+
+def parse_review(label: str, content: str) -> Review:
+    """Split a comments file into verdict, list-item issues and other notes.
+
+    Args:
+        label: Reviewer label used in the merged output.
+        content: Raw comments.md content.
+
+    Returns:
+        Parsed Review.
+    """
+    review = Review(label=label)
+    lines = content.splitlines()
+
+    # Verdict is the first non-empty line
+    while lines and not lines[0].strip():
+        lines.pop(0)
+    if lines and parse_verdict(lines[0]) is not None:
+        review.verdict = parse_verdict(lines.pop(0))
+
+    for line in lines:
+        match = _ITEM_RE.match(line)
+        if match and not line.startswith(("  ", "\t")):
+            review.issues.append(match.group(1).strip())
+        elif review.issues and line.startswith(("  ", "\t")) and line.strip():
+            # Continuation of the previous item
+            review.issues[-1] += " " + line.strip()
+        elif line.strip():
+            review.notes.append(line.rstrip())
+    return review
+
+
+def _normalize(issue: str) -> str:
+    """Normalize issue text for duplicate detection."""
+    return " ".join(re.sub(r"[^\w\s]", " ", issue.lower()).split())
+
+
+def _strip_labels(text: str, labels: set[str]) -> str:
+    """Drop a trailing "(reviewer, ...)" annotation left by an earlier merge."""
+    match = _LABELS_RE.search(text)
+    if match and {part.strip() for part in match.group(1).split(",")} <= labels:
+        return text[:match.start()]
+    return text
+
+
+@dataclass
+class _MergedIssue:
+    comment: Comment
+    labels: list[str]
+    known: bool  # the ID comes from an earlier round
+
+
+def _merge_issues(parsed: list[Review], next_id: int) -> list[_MergedIssue]:
+    """Deduplicate the reviewers' issues into structured comments.
+
+    Issues are matched on an ID from an earlier round (below next_id),
+    else on their normalized text, ignoring the ID/severity/status prefix.
+    Merged issues take the most severe severity and the least settled
+    status. IDs a reviewer invented for new issues are dropped, since
+    every reviewer was offered the same one, and new issues are numbered
+    from next_id in order of first appearance.
+    """
+    labels = {review.label for review in parsed}
+    merged: list[_MergedIssue] = []
+    by_key: dict[str, _MergedIssue] = {}
+    by_id: dict[int, _MergedIssue] = {}
+    for review in parsed:
+        for issue in review.issues:
+            comment = parse_comment_item(f"- {issue}")
+            if comment is None:
+                comment = Comment(0, DEFAULT_SEVERITY, CommentStatus.OPEN, issue)
+            comment.text = _strip_labels(comment.text, labels)
+            known = 0 < comment.id < next_id
+            key = _normalize(comment.text)
+
+            entry = by_id.get(comment.id) if known else None
+            if entry is None:
+                entry = by_key.get(key)
+                if entry is not None and known and entry.known and entry.comment.id != comment.id:
+                    entry = None
+            if entry is None:
+                entry = _MergedIssue(comment, [], known)
+                merged.append(entry)
+            else:
+                current = entry.comment
+                current.severity = min(current.severity, comment.severity, key=SEVERITIES.index)
+                current.status = min(current.status, comment.status, key=_STATUS_ORDER.index)
+                if known and not entry.known:
+                    current.id = comment.id
+                    entry.known = True
+            by_key.setdefault(key, entry)
+            if entry.known:
+                by_id[entry.comment.id] = entry
+            if review.label not in entry.labels:
+                entry.labels.append(review.label)
+
+    for entry in merged:
+        if not entry.known:
+            entry.comment.id = next_id
+            next_id += 1
+    return merged
+
+
+def check_review_policy(policy: str) -> None:
+    """Reject an unknown review policy.
+
+    Raises:
+        ValueError: If policy is not one of REVIEW_POLICIES.
+    """
+    if policy not in REVIEW_POLICIES:
+        raise ValueError(f"Unknown review policy: {policy}. Valid policies: {list(REVIEW_POLICIES)}")
+
+
+def combine_verdicts(verdicts: list[Verdict | None], policy: str) -> Verdict:
+    """Combine per-reviewer verdicts.
+
+    Args:
+        verdicts: One verdict per reviewer (None counts as not approved).
+        policy: "all", "any" or "majority" must approve.
+
+    Returns:
+        The combined verdict.
+
+    Raises:
+        ValueError: If policy is unknown.
+    """
+    approvals = sum(1 for v in verdicts if v == Verdict.APPROVED)
+    if policy == "all":
+        approved = bool(verdicts) and approvals == len(verdicts)
+    elif policy == "any":
+        approved = approvals > 0
+    elif policy == "majority":
+        approved = approvals * 2 > len(verdicts)
+    else:
+        check_review_policy(policy)
+    return Verdict.APPROVED if approved else Verdict.CHANGES_REQUIRED
+
+
+def merge_reviews(
+    reviews: list[tuple[str, str]],
+    policy: str = "all",
+    next_id: int = 1,
+) -> tuple[Verdict, str]:
+    """Merge several reviewers' comments into one comments.md.
+
+    Issues (list items) are deduplicated across reviewers, written as
+    structured comments and annotated with who raised them; other text is
+    kept per reviewer.
+
+    Args:
+        reviews: (label, comments content) per reviewer.
+        policy: Combined verdict policy ("all", "any" or "majority").
+        next_id: First comment number not used by an earlier round.
+
+    Returns:
+        Tuple of (combined verdict, merged comments text).
+    """
+    parsed = [parse_review(label, content) for label, content in reviews]
+    verdict = combine_verdicts([r.verdict for r in parsed], policy)
+
+    summary = ", ".join(
+        f"{r.label} {r.verdict.value if r.verdict else '(no verdict)'}" for r in parsed
+    )
+    lines = [verdict.value, "", f"Reviewers: {summary} (policy: {policy})", ""]
+    for entry in _merge_issues(parsed, next_id):
+        lines.append(f"{entry.comment.render()} ({', '.join(entry.labels)})")
+
+    for review in parsed:
+        if review.notes:
+            lines.extend(["", f"## Notes from {review.label}", ""])
+            lines.extend(review.notes)
+
+    return verdict, "\n".join(lines) + "\n"
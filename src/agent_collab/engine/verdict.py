@@ -0,0 +1,78 @@
+"""Review verdict detection."""
+from enum import Enum
+from pathlib import Path
+
+
+class Verdict(Enum):
+    """Reviewer verdict markers."""
+    APPROVED = "[APPROVED]"
+    CHANGES_REQUIRED = "[CHANGES_REQUIRED]"
+
+
+def parse_verdict(line: str) -> Verdict | None:
+    """Parse a verdict marker at the start of a line.
+
+    Args:
+        line: A single line of text.
+
+    Returns:
+        The verdict, or None if the line doesn't start with a marker.
+    """
+    stripped = line.strip()
+    for verdict in Verdict:
+        if stripped.startswith(verdict.value):
+            return verdict
+    return None
+
+
+def read_verdict(path: Path) -> Verdict | None:
+    """Read the verdict from the first non-empty line of a comments file.
+
+    Only reads up to the first non-empty line, not the whole file.
+
+    Args:
+        path: Path to comments.md.
+
+    Returns:
+        The verdict, or None if the file is missing or has no marker.
+    """
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if line.strip():
+                return parse_verdict(line)
+    return None
+
+
+class VerdictParser:
+    """Detects a verdict marker incrementally in streamed reviewer output.
+
+    Text is fed as it arrives; the first complete line that starts with a
+    verdict marker sets ``verdict``.
+    """
+
+    def __init__(self) -> None:
+        self.verdict: Verdict | None = None
+        self._partial = ""
+
+    def feed(self, text: str) -> Verdict | None:
+        """Add streamed text.
+
+        Returns:
+            The verdict once one has been seen, otherwise None.
+        """
+        if self.verdict is not None:
+            return self.verdict
+
+        lines = (self._partial + text).split("\n")
+        self._partial = lines.pop()
+        for line in lines:
+            self.verdict = parse_verdict(line)
+            if self.verdict is not None:
+                break
+        else:
+            # A marker is complete as soon as its closing bracket arrives
+            if parse_verdict(self._partial) is not None:
+                self.verdict = parse_verdict(self._partial)
+        return self.verdict
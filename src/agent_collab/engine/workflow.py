@@ -1,12 +1,104 @@
 """Workflow controller - coordinates the entire collaboration flow."""
 import asyncio
+import contextlib
+import dataclasses
+import functools
+import inspect
+import logging
+import re
+import time
+import weakref
+from enum import Enum
 from pathlib import Path
-from typing import Callable, AsyncIterator
+from typing import Awaitable, Callable, AsyncIterator
 
 from ..config import Config
-from ..engine import Phase, can_transition, load_prompt
-from ..persistence import WorkflowState, save_state, load_state
-from ..adapters import AgentAdapter, create_adapter
+from ..engine import Phase, can_transition
+from .prompt_loader import PromptRegistry
+from .parallel_exec import ParallelExecutor, StepOutcome
+from .comments import CommentIndex, CommentStatus, assign_comment_ids, format_comments, parse_comments
+from .convergence import IterationRecord, Stall, detect_stall
+from .plan_diff import diff_plans
+from .plan_parser import PlanCache, PlanIndex, PlanStep, mark_step_done
+from .review_merge import check_review_policy, merge_reviews
+from .verdict import Verdict, VerdictParser, read_verdict
+from ..telemetry import MetricsRegistry, Tracer
+from ..persistence import BACKENDS, ObjectStore, StateJournal, WorkflowState, save_state, load_state
+from ..adapters import (
+    AgentAdapter,
+    AgentEvent,
+    AgentScheduler,
+    Priority,
+    ProcessPool,
+    SessionStarted,
+    TextDelta,
+    TranscriptRecorder,
+    TurnResult,
+    Usage,
+    create_adapter,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _traced(name: str) -> Callable:
+    """Record each call of an async WorkflowController method as a span."""
+    def decorate(method: Callable) -> Callable:
+        @functools.wraps(method)
+        async def wrapper(self: "WorkflowController", *args, **kwargs):
+            with self.tracer.span(name, phase=self.state.phase.value):
+                return await method(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _file_version(path: Path) -> tuple[int, int] | None:
+    """Modification time and size of a file, or None if it doesn't exist."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class _LabelledOutput:
+    """Forwards streamed text line by line, prefixing each line with a label.
+
+    Used when several agents stream concurrently so their output doesn't
+    interleave mid-line.
+    """
+
+    def __init__(self, label: str, output: "OutputCallback") -> None:
+        self.label = label
+        self.output = output
+        self._partial = ""
+
+    def __call__(self, text: str) -> Awaitable[None] | None:
+        lines = (self._partial + text).split("\n")
+        self._partial = lines.pop()
+        if lines:
+            return self.output("".join(f"[{self.label}] {line}\n" for line in lines))
+        return None
+
+    def flush(self) -> None:
+        """Emit any unterminated final line."""
+        if self._partial:
+            self.output(f"[{self.label}] {self._partial}\n")
+            self._partial = ""
+
+
+# Receives streamed agent text. May return an awaitable to apply
+# backpressure: the agent's stream is not read further until it completes.
+OutputCallback = Callable[[str], Awaitable[None] | None]
+
+
+class AutopilotResult(Enum):
+    """Why an autopilot review loop stopped."""
+    APPROVED = "approved"
+    MAX_ITERATIONS = "max_iterations"
+    BUDGET_EXHAUSTED = "budget_exhausted"
+    PAUSED = "paused"
+    STALLED = "stalled"
 
 
 class WorkflowController:
@@ -16,31 +108,135 @@ class WorkflowController:
         self,
         project_root: Path,
         config: Config,
-        on_output: Callable[[str], None] | None = None,
+        on_output: OutputCallback | None = None,
         on_phase_change: Callable[[Phase], None] | None = None,
+        on_event: Callable[[AgentEvent], None] | None = None,
+        scheduler: AgentScheduler | None = None,
+        priority: Priority = Priority.INTERACTIVE,
     ) -> None:
         """Initialize workflow controller.
 
         Args:
             project_root: Root directory of the project.
             config: Configuration object.
-            on_output: Callback for agent output.
+            on_output: Callback for agent output. If it returns an awaitable,
+                the stream waits for it before reading more output.
             on_phase_change: Callback when phase changes.
+            on_event: Callback for every typed agent event (tool calls,
+                usage, results) in addition to the text sent to on_output.
+            scheduler: Scheduler admitting agent turns, shared between
+                workflows running in the same process (default: a private
+                one with the configured limits).
+            priority: Scheduling class of this workflow's turns.
+
+        Raises:
+            ValueError: If the configured review policy or persistence
+                backend is unknown.
         """
+        # Checked up front so a typo can't waste a round of reviews
+        check_review_policy(config.workflow.review_policy)
+        if config.persistence.backend not in BACKENDS:
+            raise ValueError(
+                f"persistence.backend must be one of {BACKENDS}, got {config.persistence.backend!r}"
+            )
         self.project_root = project_root
         self.config = config
+        self.scheduler = scheduler or AgentScheduler(config.limits)
+        self.priority = priority
         self.on_output = on_output or (lambda x: None)
         self.on_phase_change = on_phase_change or (lambda x: None)
+        self.on_event = on_event or (lambda x: None)
+        self.last_usage: Usage | None = None
+        self.last_stall: Stall | None = None
+        self.metrics = MetricsRegistry()
+        self.tracer = Tracer(
+            config.get_trace_path(project_root) if config.telemetry.trace else None
+        )
+        self._draining: dict[AgentAdapter, asyncio.Task] = {}
+        self._adapter_roles: weakref.WeakKeyDictionary[AgentAdapter, str] = weakref.WeakKeyDictionary()
 
         # Load or create state
         self.state = self._load_or_init_state()
+        persistence = config.persistence
+        self.journal = (
+            StateJournal(
+                config.get_state_path(project_root),
+                fsync=persistence.fsync,
+                compact_every=persistence.compact_every,
+            )
+            if persistence.backend == "journal"
+            else None
+        )
 
-        # Create adapters
-        self.planner = create_adapter(config.roles.planner, str(project_root))
-        self.reviewer = create_adapter(config.roles.reviewer, str(project_root))
+        # Create adapters (sharing a warm process pool in pooled mode)
+        self.pool = (
+            ProcessPool(idle_timeout=config.agents.pool_idle_timeout)
+            if config.agents.pooled
+            else None
+        )
+        self.planner = self._create_role_adapter("planner", config.roles.planner)
+        # Extra reviewers use roles "reviewer2", "reviewer3", ... for replay/record
+        self.reviewers = [
+            self._create_role_adapter("reviewer" if i == 0 else f"reviewer{i + 1}", agent_type)
+            for i, agent_type in enumerate(config.roles.get_reviewers())
+        ]
+        if self.state.planner_session:
+            self.planner._session_id = self.state.planner_session
+        if self.state.reviewer_session:
+            self.reviewer._session_id = self.state.reviewer_session
+
+        self.plan_cache = PlanCache(config.get_plan_path(project_root))
+        self.objects = ObjectStore(config.get_objects_path(project_root))
 
         # Prompts directory
         self.prompts_dir = Path(__file__).parent.parent.parent.parent / "prompts"
+        self.prompts = PromptRegistry(self.prompts_dir)
+
+    @property
+    def reviewer(self) -> AgentAdapter:
+        """The primary reviewer (the only one unless several are configured)."""
+        return self.reviewers[0]
+
+    @reviewer.setter
+    def reviewer(self, adapter: AgentAdapter) -> None:
+        self.reviewers[0] = adapter
+
+    def _create_role_adapter(
+        self, role: str, agent_type: str, working_dir: Path | None = None
+    ) -> AgentAdapter:
+        """Create the adapter for a role.
+
+        Replay transcripts are read from, and recordings written to,
+        ``<dir>/<role>.jsonl`` under the configured replay/record directories.
+
+        Args:
+            role: Role name ("planner", "reviewer", "step3", ...).
+            agent_type: Agent type for create_adapter.
+            working_dir: Directory the agent runs in (default: project root).
+        """
+        agents = self.config.agents
+        transcript = None
+        if agents.replay_dir:
+            transcript = self.project_root / agents.replay_dir / f"{role}.jsonl"
+        adapter = create_adapter(
+            agent_type,
+            str(working_dir or self.project_root),
+            pool=self.pool,
+            structured=agents.structured_output,
+            transcript=transcript,
+            replay_speed=agents.replay_speed,
+        )
+        if agents.record_dir:
+            adapter.recorder = TranscriptRecorder(
+                self.project_root / agents.record_dir / f"{role}.jsonl"
+            )
+        adapter.tracer = self.tracer
+        # Workflows sharing a scheduler are fair-queued by workdir
+        adapter.lane = self.scheduler.lane(
+            agent_type, flow=str(self.config.get_workdir(self.project_root)), priority=self.priority
+        )
+        self._adapter_roles[adapter] = role
+        return adapter
 
     def _load_or_init_state(self) -> WorkflowState:
         """Load existing state or create new one."""
@@ -58,28 +254,249 @@ class WorkflowController:
 
     def _save_state(self) -> None:
         """Save current state to disk."""
-        save_state(self.state, self.config.get_state_path(self.project_root))
+        backend = "journal" if self.journal is not None else "snapshot"
+        with (
+            self.tracer.span("save_state", "persistence", backend=backend),
+            self.metrics.time("state_save_seconds", backend=backend, phase=self.state.phase.value),
+        ):
+            if self.journal is not None:
+                self.journal.append(self.state)
+            else:
+                save_state(self.state, self.config.get_state_path(self.project_root))
 
     def _set_phase(self, phase: Phase) -> None:
         """Transition to a new phase."""
         if not can_transition(self.state.phase, phase):
             raise ValueError(f"Invalid transition: {self.state.phase} -> {phase}")
-        self.state.phase = phase
-        self._save_state()
-        self.on_phase_change(phase)
-
-    async def _stream_agent(self, adapter: AgentAdapter, prompt: str) -> str:
+        # Includes the save and the UI's phase-change callback
+        with (
+            self.tracer.span("set_phase", **{"from": self.state.phase.value, "to": phase.value}),
+            self.metrics.time("phase_transition_seconds", phase=phase.value),
+        ):
+            self.state.phase = phase
+            self._save_state()
+            self.on_phase_change(phase)
+
+    async def _stream_agent(
+        self,
+        adapter: AgentAdapter,
+        prompt: str,
+        stop_when: Callable[[AgentEvent], bool] | None = None,
+        output: OutputCallback | None = None,
+    ) -> str:
         """Send prompt to agent and stream output.
 
+        Args:
+            adapter: The agent to send to.
+            prompt: The prompt.
+            stop_when: Optional predicate checked after each event. Once it
+                returns True this method returns immediately, and the rest
+                of the turn is drained in the background (output is still
+                forwarded). The adapter's next turn waits for that drain.
+            output: Text callback to use instead of on_output.
+
         Returns:
-            Complete response text.
+            Response text streamed so far.
         """
-        full_response = []
-        async for chunk in adapter.send(prompt):
-            self.on_output(chunk)
-            full_response.append(chunk)
+        await self._wait_drained(adapter)
+
+        output = output or self.on_output
+        full_response: list[str] = []
+        phase = self.state.phase.value
+        agent = self._agent_label(adapter)
+        with self.tracer.span("agent_turn", "agent", agent=agent, phase=phase) as span:
+            start = time.perf_counter()
+            first_chunk: float | None = None
+            events = adapter.stream(prompt)
+            async for event in events:
+                if first_chunk is None and isinstance(event, TextDelta):
+                    first_chunk = time.perf_counter() - start
+                await self._handle_event(adapter, event, full_response, output)
+                if stop_when is not None and stop_when(event):
+                    self._draining[adapter] = asyncio.create_task(self._drain(adapter, events, output))
+                    if span is not None:
+                        span.set(stopped_early=True)
+                    break
+            # Time spent queued for the scheduler is reported separately
+            queued = adapter.last_queue_seconds
+            if first_chunk is not None:
+                first_chunk -= queued
+            self._record_turn(adapter, phase, time.perf_counter() - start - queued, first_chunk, full_response)
         return "".join(full_response)
 
+    def _render_prompt(self, name: str, **variables: str) -> str:
+        """Render a prompt template from the registry."""
+        with self.tracer.span("load_prompt", "prompt", template=name):
+            return self.prompts.render(name, **variables)
+
+    def _agent_label(self, adapter: AgentAdapter) -> str:
+        """Metric label for an adapter: its role, with step numbers dropped."""
+        if adapter is self.planner:
+            return "planner"
+        for i, reviewer in enumerate(self.reviewers):
+            if adapter is reviewer:
+                return "reviewer" if i == 0 else f"reviewer{i + 1}"
+        role = self._adapter_roles.get(adapter)
+        return re.sub(r"\d+$", "", role) if role else "agent"
+
+    def _record_turn(
+        self,
+        adapter: AgentAdapter,
+        phase: str,
+        elapsed: float,
+        first_chunk: float | None,
+        chunks: list[str],
+    ) -> None:
+        """Record latency and volume metrics for a finished turn."""
+        labels = {"agent": self._agent_label(adapter), "phase": phase}
+        self.metrics.observe("agent_turn_seconds", elapsed, **labels)
+        self.metrics.observe("agent_queue_seconds", adapter.last_queue_seconds, **labels)
+        if adapter.last_spawn_seconds is not None:
+            self.metrics.observe("agent_spawn_seconds", adapter.last_spawn_seconds, **labels)
+        if first_chunk is not None:
+            self.metrics.observe("agent_first_chunk_seconds", first_chunk, **labels)
+        self.metrics.observe_size(
+            "agent_stream_bytes", sum(len(chunk.encode()) for chunk in chunks), **labels
+        )
+        self.metrics.observe_size("agent_stream_chunks", len(chunks), **labels)
+        self.export_metrics()
+
+    def export_metrics(self) -> None:
+        """Write metrics.json and metrics.prom to the workdir (if enabled)."""
+        if not self.config.telemetry.export_metrics:
+            return
+        try:
+            self.metrics.export(
+                self.config.get_metrics_path(self.project_root),
+                self.config.get_prometheus_path(self.project_root),
+            )
+        except OSError as e:
+            logger.warning("Failed to export metrics: %s", e)
+
+    async def _handle_event(
+        self,
+        adapter: AgentAdapter,
+        event: AgentEvent,
+        full_response: list[str],
+        output: OutputCallback,
+    ) -> None:
+        """Dispatch one agent event to callbacks and state."""
+        self.on_event(event)
+        pending = None
+        if isinstance(event, TextDelta):
+            full_response.append(event.text)
+            pending = output(event.text)
+        elif isinstance(event, SessionStarted):
+            self._record_session(adapter, event.session_id)
+        elif isinstance(event, Usage):
+            self.last_usage = event
+        elif isinstance(event, TurnResult) and event.is_error:
+            pending = output(f"\n[Agent error: {event.text or 'unknown'}]\n")
+        if inspect.isawaitable(pending):
+            # Output is backed up; hold off reading more until it catches up
+            with self.metrics.time(
+                "output_wait_seconds", agent=self._agent_label(adapter), phase=self.state.phase.value
+            ):
+                await pending
+
+    async def _drain(
+        self,
+        adapter: AgentAdapter,
+        events: AsyncIterator[AgentEvent],
+        output: OutputCallback,
+    ) -> None:
+        """Consume the remainder of a turn that was handed off early."""
+        try:
+            async for event in events:
+                await self._handle_event(adapter, event, [], output)
+        except Exception as e:
+            output(f"\n[Agent error after verdict: {e}]\n")
+
+    async def _wait_drained(self, adapter: AgentAdapter | None = None) -> None:
+        """Wait for background drains (of one adapter, or all)."""
+        adapters = [adapter] if adapter is not None else list(self._draining)
+        for key in adapters:
+            task = self._draining.pop(key, None)
+            if task is not None:
+                await task
+
+    def _record_session(self, adapter: AgentAdapter, session_id: str) -> None:
+        """Persist a session ID reported by an agent so it can be resumed."""
+        if adapter is self.planner:
+            changed = self.state.planner_session != session_id
+            self.state.planner_session = session_id
+        elif adapter is self.reviewer:
+            changed = self.state.reviewer_session != session_id
+            self.state.reviewer_session = session_id
+        else:
+            # Additional parallel reviewers keep their session in memory only
+            changed = False
+        if changed:
+            self._save_state()
+
+    def _artifact_paths(self) -> list[Path]:
+        """Workflow files an agent turn may rewrite."""
+        paths = [
+            self.config.get_plan_path(self.project_root),
+            self.config.get_comments_path(self.project_root),
+        ]
+        if len(self.reviewers) > 1:
+            paths += [
+                self.config.get_reviewer_comments_path(self.project_root, i)
+                for i in range(len(self.reviewers))
+            ]
+        return paths
+
+    @contextlib.asynccontextmanager
+    async def cancellable(self) -> AsyncIterator[None]:
+        """Roll back workflow state if the enclosed turn is cancelled.
+
+        On cancellation the phase, iteration, session IDs and the plan and
+        comments files are restored to what they were on entry, and any
+        background drains are stopped, so the interrupted turn can simply
+        be run again. Agent processes are killed by the adapters as the
+        cancellation unwinds their streams. Changes an agent made to other
+        project files are not undone.
+        """
+        state = dataclasses.replace(self.state, history=dict(self.state.history))
+        files = {
+            path: path.read_text() if path.exists() else None
+            for path in self._artifact_paths()
+        }
+        try:
+            yield
+        except asyncio.CancelledError:
+            for task in self._draining.values():
+                task.cancel()
+            await asyncio.gather(*self._draining.values(), return_exceptions=True)
+            self._draining.clear()
+
+            for path, content in files.items():
+                if content is None:
+                    path.unlink(missing_ok=True)
+                else:
+                    path.write_text(content)
+            self.state = state
+            self.planner._session_id = state.planner_session
+            self.reviewer._session_id = state.reviewer_session
+            self._save_state()
+            self.on_phase_change(state.phase)
+            raise
+
+    def warm_up(self) -> None:
+        """Load and compile all prompt templates ahead of the first turn."""
+        self.prompts.load_all()
+
+    async def close(self) -> None:
+        """Release agent resources (terminates pooled processes)."""
+        await self._wait_drained()
+        if self.pool is not None:
+            await self.pool.close()
+        if self.journal is not None:
+            self.journal.close()
+        self.export_metrics()
+        self.tracer.close()
+
     def get_plan_content(self) -> str:
         """Get current plan content."""
         plan_path = self.config.get_plan_path(self.project_root)
@@ -87,6 +504,14 @@ class WorkflowController:
             return plan_path.read_text()
         return ""
 
+    def get_plan_index(self) -> PlanIndex:
+        """Get the structured step index of the current plan (cached)."""
+        return self.plan_cache.get()
+
+    def get_step(self, step_number: int) -> PlanStep | None:
+        """Look up a plan step by number."""
+        return self.plan_cache.get().get(step_number)
+
     def get_comments_content(self) -> str:
         """Get current comments content."""
         comments_path = self.config.get_comments_path(self.project_root)
@@ -96,13 +521,13 @@ class WorkflowController:
 
     def is_approved(self) -> bool:
         """Check if plan is approved based on comments."""
-        content = self.get_comments_content()
-        return content.strip().startswith("[APPROVED]")
+        return read_verdict(self.config.get_comments_path(self.project_root)) == Verdict.APPROVED
 
     def is_max_iterations(self) -> bool:
         """Check if max iterations reached."""
         return self.state.iteration >= self.config.workflow.max_iterations
 
+    @_traced("refine_goal")
     async def start_refinement(self, user_input: str) -> None:
         """Start or continue goal refinement phase.
 
@@ -113,36 +538,47 @@ class WorkflowController:
             self._set_phase(Phase.REFINE_GOAL)
 
         # Load refine goal prompt
-        prompt_path = self.prompts_dir / "01_refine_goal.md"
-        base_prompt = load_prompt(prompt_path)
+        base_prompt = self._render_prompt("01_refine_goal.md")
         full_prompt = f"{base_prompt}\n\nUser: {user_input}"
 
         await self._stream_agent(self.planner, full_prompt)
 
+    @_traced("write_plan")
     async def write_plan(self) -> None:
-        """Transition to write plan phase."""
-        self._set_phase(Phase.WRITE_PLAN)
+        """Transition to write plan phase.
 
-        prompt_path = self.prompts_dir / "02_write_plan.md"
-        prompt = load_prompt(
-            prompt_path,
+        Also retries a plan turn that failed or was interrupted, when the
+        workflow is still in the write plan phase.
+        """
+        if self.state.phase != Phase.WRITE_PLAN:
+            self._set_phase(Phase.WRITE_PLAN)
+
+        prompt = self._render_prompt(
+            "02_write_plan.md",
             plan_path=str(self.config.get_plan_path(self.project_root)),
         )
 
         await self._stream_agent(self.planner, prompt)
         self._set_phase(Phase.REVIEW)
 
+    @_traced("review_plan")
     async def review_plan(self) -> None:
-        """Have reviewer review the plan."""
-        prompt_path = self.prompts_dir / "03_review_plan.md"
-        prompt = load_prompt(
-            prompt_path,
-            plan_path=str(self.config.get_plan_path(self.project_root)),
-            comments_path=str(self.config.get_comments_path(self.project_root)),
-        )
+        """Have reviewer(s) review the plan.
+
+        With several reviewers configured, all review concurrently, each
+        writing its own comments file; the results are merged into
+        comments.md under the configured review policy.
+        """
+        comments_path = self.config.get_comments_path(self.project_root)
+
+        if len(self.reviewers) == 1:
+            await self._run_review(self.reviewer, comments_path)
+        else:
+            await self._run_parallel_reviews(comments_path)
+        self._number_new_comments(comments_path)
 
-        await self._stream_agent(self.reviewer, prompt)
         self.state.iteration += 1
+        self._record_iteration()
         self._save_state()
 
         if self.is_approved():
@@ -150,31 +586,298 @@ class WorkflowController:
         else:
             self._set_phase(Phase.RESPOND)
 
+    def _record_iteration(self) -> None:
+        """Store this iteration's plan and comments in the version store."""
+        previous = self.state.history.get(self.state.iteration - 1, {})
+        versions = {}
+        for name, content in (
+            ("plan", self.get_plan_content()),
+            ("comments", self.get_comments_content()),
+        ):
+            versions[name] = self.objects.put(content.encode(), base=previous.get(name))
+        self.state.history[self.state.iteration] = versions
+
+    def get_version(self, iteration: int, name: str) -> str | None:
+        """Get the plan or comments as they were at the end of a review.
+
+        Args:
+            iteration: Review iteration (1-based).
+            name: "plan" or "comments".
+
+        Returns:
+            The stored content, or None if that iteration wasn't recorded.
+        """
+        digest = self.state.history.get(iteration, {}).get(name)
+        if digest is None:
+            return None
+        return self.objects.get(digest).decode()
+
+    async def _run_review(
+        self,
+        reviewer: AgentAdapter,
+        comments_path: Path,
+        output: OutputCallback | None = None,
+    ) -> None:
+        """Run one reviewer's turn, writing its review to comments_path."""
+        prompt = self._incremental_review_prompt(comments_path)
+        if prompt is None:
+            prompt = self._render_prompt(
+                "03_review_plan.md",
+                plan_path=str(self.config.get_plan_path(self.project_root)),
+                comments_path=str(comments_path),
+                next_id=str(self._next_comment_id()),
+            )
+
+        stop_when = None
+        if self.config.workflow.early_verdict:
+            # Snapshot once the reviewer's previous turn has fully drained
+            await self._wait_drained(reviewer)
+            stop_when = self._final_verdict_detector(comments_path)
+        await self._stream_agent(reviewer, prompt, stop_when=stop_when, output=output)
+
+    def _incremental_review_prompt(self, comments_path: Path) -> str | None:
+        """Build a review prompt covering only what changed since the last review.
+
+        Returns:
+            The prompt, or None to review the full plan: on the first review,
+            with incremental_review off, or when most of the plan changed.
+        """
+        if not self.config.workflow.incremental_review:
+            return None
+        previous_plan = self.get_version(self.state.iteration, "plan")
+        if previous_plan is None:
+            return None
+        plan = self.get_plan_content()
+        diff = diff_plans(previous_plan, plan)
+        if diff.changed_size * 2 > len(plan):
+            return None
+
+        changed = "\n".join(section.text.rstrip() for section in diff.changed) or "(none)"
+        removed = ", ".join(f"`{section.key}`" for section in diff.removed) or "none"
+        comments = self.get_comment_index()
+        return self._render_prompt(
+            "08_review_plan_incremental.md",
+            plan_path=str(self.config.get_plan_path(self.project_root)),
+            comments_path=str(comments_path),
+            changed_sections=changed,
+            removed_sections=removed,
+            fixed_comments=format_comments(comments.with_status(CommentStatus.FIXED)),
+            open_comments=format_comments(comments.with_status(CommentStatus.OPEN)),
+            next_id=str(self._next_comment_id()),
+        )
+
+    def get_comment_index(self) -> CommentIndex:
+        """Get the structured comments of the current comments.md."""
+        return parse_comments(self.get_comments_content())
+
+    def _next_comment_id(self) -> int:
+        """Number for the next new comment, unique across iterations."""
+        previous = self.get_version(self.state.iteration, "comments") or ""
+        return max(self.get_comment_index().max_id, parse_comments(previous).max_id) + 1
+
+    def _number_new_comments(self, comments_path: Path) -> None:
+        """Give IDs to any comments the reviewer wrote without one."""
+        if not comments_path.exists():
+            return
+        content = comments_path.read_text()
+        numbered = assign_comment_ids(content, self._next_comment_id())
+        if numbered != content:
+            comments_path.write_text(numbered)
+
+    def check_convergence(self) -> Stall | None:
+        """Check whether the review loop has stopped making progress.
+
+        Compares the plan and comments recorded after each review; see
+        detect_stall for the signals.
+
+        Returns:
+            The stall, or None if the loop is still converging.
+        """
+        records = [
+            IterationRecord(
+                iteration=iteration,
+                plan_hash=self.state.history[iteration].get("plan", ""),
+                plan=self.get_version(iteration, "plan") or "",
+                comments=self.get_version(iteration, "comments") or "",
+            )
+            for iteration in sorted(self.state.history)
+        ]
+        workflow = self.config.workflow
+        return detect_stall(records, workflow.min_plan_change, workflow.stall_patience)
+
+    def open_comment_counts(self) -> dict[int, int]:
+        """Get the number of unresolved comments after each review iteration."""
+        return {
+            iteration: parse_comments(self.get_version(iteration, "comments") or "").open_count
+            for iteration in sorted(self.state.history)
+        }
+
+    async def _run_parallel_reviews(self, comments_path: Path) -> None:
+        """Run all reviewers concurrently and merge their comments."""
+        agent_types = self.config.roles.get_reviewers()
+        labels = [f"{agent_type} #{i + 1}" for i, agent_type in enumerate(agent_types)]
+        paths = [
+            self.config.get_reviewer_comments_path(self.project_root, i)
+            for i in range(len(self.reviewers))
+        ]
+        for path in paths:
+            # A reviewer that fails to write must not leave last round's verdict behind
+            path.unlink(missing_ok=True)
+
+        outputs = [_LabelledOutput(label, self.on_output) for label in labels]
+        results = await asyncio.gather(
+            *(
+                self._run_review(reviewer, path, output)
+                for reviewer, path, output in zip(self.reviewers, paths, outputs)
+            ),
+            return_exceptions=True,
+        )
+        for output, result in zip(outputs, results):
+            if isinstance(result, Exception):
+                output(f"[Review failed: {result}]\n")
+            output.flush()
+
+        reviews = [
+            (label, path.read_text() if path.exists() else "")
+            for label, path in zip(labels, paths)
+        ]
+        _, merged = merge_reviews(reviews, self.config.workflow.review_policy, self._next_comment_id())
+        comments_path.write_text(merged)
+
+    def _final_verdict_detector(self, comments_path: Path) -> Callable[[AgentEvent], bool]:
+        """Build a stop_when predicate that fires once the verdict is final.
+
+        A verdict marker seen in the reviewer's stream is final when the
+        turn has reported its result (all tool calls, including the comments
+        write, are done) or when the comments file starts with it and has
+        been rewritten since the predicate was built. The file left by the
+        previous round never counts, so it is not numbered or recorded as
+        this round's review. Each event costs a stat; the file is only read
+        when its modification time or size has changed.
+        """
+        parser = VerdictParser()
+        checked = _file_version(comments_path)
+
+        def detect(event: AgentEvent) -> bool:
+            nonlocal checked
+            if isinstance(event, TextDelta):
+                parser.feed(event.text)
+            if parser.verdict is None:
+                return False
+            if isinstance(event, TurnResult):
+                return True
+            version = _file_version(comments_path)
+            if version == checked:
+                return False
+            checked = version
+            return read_verdict(comments_path) == parser.verdict
+
+        return detect
+
+    @_traced("respond_to_comments")
     async def respond_to_comments(self) -> None:
-        """Have planner respond to review comments."""
-        prompt_path = self.prompts_dir / "04_respond_comments.md"
-        prompt = load_prompt(
-            prompt_path,
+        """Have planner respond to the unresolved review comments."""
+        open_comments = self.get_comment_index().with_status(CommentStatus.OPEN)
+        prompt = self._render_prompt(
+            "04_respond_comments.md",
             plan_path=str(self.config.get_plan_path(self.project_root)),
             comments_path=str(self.config.get_comments_path(self.project_root)),
+            open_comments=format_comments(open_comments),
         )
 
         await self._stream_agent(self.planner, prompt)
         self._set_phase(Phase.REVIEW)
 
-    async def execute_step(self, step_number: int, step_content: str) -> None:
+    @_traced("autopilot")
+    async def run_autopilot(
+        self,
+        pause_on: list[str] | None = None,
+        time_budget: float | None = None,
+    ) -> AutopilotResult:
+        """Run the review/respond loop unattended.
+
+        Alternates review_plan and respond_to_comments from the current
+        REVIEW or RESPOND phase until the plan is approved, max iterations
+        are reached, the loop stalls (see check_convergence, with
+        workflow.stall_detection on), a pause point is hit or the time
+        budget runs out.
+
+        Args:
+            pause_on: Phase values ("review", "respond") before which to stop
+                and hand control back. Defaults to config.workflow.pause_on.
+            time_budget: Hard wall-clock budget in seconds; a turn still
+                running when it expires is cancelled. Defaults to
+                config.workflow.time_budget (0 means unlimited).
+
+        Returns:
+            Why the loop stopped.
+
+        Raises:
+            ValueError: If not in the REVIEW or RESPOND phase.
+        """
+        if self.state.phase not in (Phase.REVIEW, Phase.RESPOND):
+            raise ValueError(f"Autopilot requires review or respond phase, not {self.state.phase.value}")
+
+        pause_on = self.config.workflow.pause_on if pause_on is None else pause_on
+        if time_budget is None:
+            time_budget = self.config.workflow.time_budget
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + time_budget if time_budget > 0 else None
+        first_turn = True
+
+        try:
+            async with asyncio.timeout_at(deadline):
+                while True:
+                    phase = self.state.phase
+                    if phase == Phase.APPROVED:
+                        return AutopilotResult.APPROVED
+                    if phase == Phase.RESPOND and self.is_max_iterations():
+                        return AutopilotResult.MAX_ITERATIONS
+                    # Checked between turns so /auto can resume past a stall
+                    if (
+                        not first_turn
+                        and phase == Phase.RESPOND
+                        and self.config.workflow.stall_detection
+                    ):
+                        self.last_stall = self.check_convergence()
+                        if self.last_stall is not None:
+                            return AutopilotResult.STALLED
+                    # Pause points apply between turns, not before the one just requested
+                    if not first_turn and phase.value in pause_on:
+                        return AutopilotResult.PAUSED
+                    first_turn = False
+
+                    if phase == Phase.REVIEW:
+                        await self.review_plan()
+                    else:
+                        await self.respond_to_comments()
+        except TimeoutError:
+            return AutopilotResult.BUDGET_EXHAUSTED
+
+    @_traced("execute_step")
+    async def execute_step(self, step_number: int, step_content: str | None = None) -> None:
         """Execute a single step from the plan.
 
         Args:
             step_number: Step number (1-indexed).
-            step_content: Content/description of the step.
+            step_content: Content/description of the step. Looked up in the
+                plan's step index if omitted.
+
+        Raises:
+            ValueError: If step_content is omitted and the plan has no such step.
         """
+        if step_content is None:
+            step = self.get_step(step_number)
+            if step is None:
+                raise ValueError(f"Plan has no step {step_number}")
+            step_content = step.content
+
         if self.state.phase == Phase.APPROVED:
             self._set_phase(Phase.EXECUTE)
 
-        prompt_path = self.prompts_dir / "05_execute_step.md"
-        prompt = load_prompt(
-            prompt_path,
+        prompt = self._render_prompt(
+            "05_execute_step.md",
             step_number=str(step_number),
             step_content=step_content,
             plan_path=str(self.config.get_plan_path(self.project_root)),
@@ -182,15 +885,115 @@ class WorkflowController:
 
         await self._stream_agent(self.planner, prompt)
 
+    @_traced("execute_plan")
+    async def execute_plan(self, on_step: Callable[[PlanStep], None] | None = None) -> list[int]:
+        """Execute all pending plan steps in order.
+
+        Each step's text is looked up from the (re-parsed if changed) plan
+        just before it runs, so edits made by earlier steps are picked up.
+        Steps the planner has already checked off are skipped. When every
+        step is done, the workflow is marked done.
+
+        Args:
+            on_step: Called with each step before it executes.
+
+        Returns:
+            Numbers of the steps that were executed.
+        """
+        if self.state.phase == Phase.APPROVED:
+            self._set_phase(Phase.EXECUTE)
+
+        executed = []
+        for number in [step.number for step in self.get_plan_index().pending()]:
+            step = self.get_step(number)
+            if step is None or step.done:
+                continue
+            if on_step is not None:
+                on_step(step)
+            await self.execute_step(step.number, step.content)
+            executed.append(step.number)
+
+        if self.get_plan_index() and not self.get_plan_index().pending():
+            self.mark_done()
+        return executed
+
+    @_traced("execute_plan_parallel")
+    async def execute_plan_parallel(
+        self,
+        max_parallel: int | None = None,
+        on_step: Callable[[PlanStep], None] | None = None,
+    ) -> list[StepOutcome]:
+        """Execute pending plan steps concurrently in separate git worktrees.
+
+        Steps whose dependencies are satisfied run at the same time, each
+        with its own planner instance in its own worktree, and are merged
+        back into the project in dependency order. Merged steps are checked
+        off in the plan. When every step is done, the workflow is marked done.
+
+        Args:
+            max_parallel: Maximum concurrent steps (default: workflow.max_parallel_steps).
+            on_step: Called with each step as it starts.
+
+        Returns:
+            One outcome per pending step, in dependency order.
+
+        Raises:
+            ValueError: If the project is not a git repository with a commit,
+                or step dependencies form a cycle.
+        """
+        if self.state.phase == Phase.APPROVED:
+            self._set_phase(Phase.EXECUTE)
+
+        executor = ParallelExecutor(
+            self.project_root,
+            self._execute_in_worktree,
+            max_parallel=max_parallel or self.config.workflow.max_parallel_steps,
+            on_start=on_step,
+            on_merged=self._check_off_step,
+        )
+        outcomes = await executor.run(self.get_plan_index())
+
+        if self.get_plan_index() and not self.get_plan_index().pending():
+            self.mark_done()
+        return outcomes
+
+    async def _execute_in_worktree(self, step: PlanStep, worktree: Path) -> None:
+        """Run one step with a dedicated planner instance in its worktree."""
+        adapter = self._create_role_adapter(
+            f"step{step.number}", self.config.roles.planner, working_dir=worktree
+        )
+        prompt = self._render_prompt(
+            "07_execute_step_worktree.md",
+            step_number=str(step.number),
+            step_content=step.content,
+            plan_path=str(self.config.get_plan_path(self.project_root)),
+            worktree_path=str(worktree),
+        )
+        output = _LabelledOutput(f"step {step.number}", self.on_output)
+        try:
+            await self._stream_agent(adapter, prompt, output=output)
+        finally:
+            output.flush()
+            if self.pool is not None:
+                await self.pool.discard(adapter)
+
+    def _check_off_step(self, step: PlanStep) -> None:
+        """Mark a step complete in plan.md."""
+        plan_path = self.config.get_plan_path(self.project_root)
+        content = self.get_plan_content()
+        updated = mark_step_done(content, step.number)
+        if updated != content:
+            plan_path.write_text(updated)
+
     def mark_done(self) -> None:
         """Mark workflow as done."""
         self._set_phase(Phase.DONE)
 
+    @_traced("recover_context")
     async def recover_context(self) -> None:
         """Recover context for resumed session."""
-        prompt_path = self.prompts_dir / "06_recover_context.md"
-        prompt = load_prompt(
-            prompt_path,
+        prompt = self._render_prompt(
+            "06_recover_context.md",
             plan_path=str(self.config.get_plan_path(self.project_root)),
             plan_content=self.get_plan_content() or "(empty)",
             comments_path=str(self.config.get_comments_path(self.project_root)),
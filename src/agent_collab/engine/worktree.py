@@ -0,0 +1,118 @@
+"""Git worktree helpers for running plan steps in isolation."""
+import asyncio
+from pathlib import Path
+
+
+class GitError(RuntimeError):
+    """A git command failed."""
+
+    def __init__(self, args: tuple[str, ...], returncode: int | None, output: str = "") -> None:
+        """Initialize error.
+
+        Args:
+            args: The git arguments that were run.
+            returncode: Exit code of git.
+            output: Combined stdout/stderr of the command.
+        """
+        self.args_run = args
+        self.returncode = returncode
+        self.output = output
+        message = f"git {' '.join(args)} exited with code {returncode}"
+        if output:
+            message += f":\n{output}"
+        super().__init__(message)
+
+
+async def git(*args: str, cwd: Path, check: bool = True) -> str:
+    """Run a git command.
+
+    Args:
+        *args: Arguments after ``git``.
+        cwd: Directory to run in.
+        check: Raise GitError on a non-zero exit.
+
+    Returns:
+        The command's stdout (and stderr) with trailing whitespace removed.
+    """
+    process = await asyncio.create_subprocess_exec(
+        "git", *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+        cwd=str(cwd),
+    )
+    stdout, _ = await process.communicate()
+    output = stdout.decode("utf-8", errors="replace").rstrip()
+    if check and process.returncode != 0:
+        raise GitError(args, process.returncode, output)
+    return output
+
+
+class Worktree:
+    """A git worktree on its own branch, used by one plan step."""
+
+    def __init__(self, repo: Path, path: Path, branch: str) -> None:
+        self.repo = repo
+        self.path = path
+        self.branch = branch
+
+    @classmethod
+    async def create(cls, repo: Path, path: Path, branch: str, base: str = "HEAD") -> "Worktree":
+        """Add a worktree at path on a new branch starting from base.
+
+        Raises:
+            GitError: If the branch already exists (e.g. one kept from an
+                earlier run for resolving a conflict), which is left as is.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        await git("worktree", "add", "-b", branch, str(path), base, cwd=repo)
+        return cls(repo, path, branch)
+
+    async def commit_all(self, message: str) -> bool:
+        """Commit every change in the worktree.
+
+        Returns:
+            True if the branch has commits that are not in its base, either
+            from this commit or ones the agent made itself.
+        """
+        if await git("status", "--porcelain", cwd=self.path):
+            await git("add", "-A", cwd=self.path)
+            await git(
+                "-c", "user.name=agent-collab",
+                "-c", "user.email=agent-collab@localhost",
+                "commit", "--quiet", "--no-verify", "-m", message,
+                cwd=self.path,
+            )
+        ahead = await git("rev-list", "--count", f"HEAD..{self.branch}", cwd=self.repo)
+        return int(ahead or 0) > 0
+
+    async def remove(self) -> None:
+        """Remove the worktree and delete its branch."""
+        await git("worktree", "remove", "--force", str(self.path), cwd=self.repo, check=False)
+        await git("branch", "-D", self.branch, cwd=self.repo, check=False)
+
+
+async def merge_branch(repo: Path, branch: str, message: str) -> list[str]:
+    """Merge branch into the repository's checked-out branch.
+
+    A conflicting merge is aborted, leaving the checkout as it was.
+
+    Returns:
+        Paths that conflicted (empty if the merge succeeded).
+
+    Raises:
+        GitError: If the merge failed for a reason other than conflicts.
+    """
+    output = await git("merge", "--no-ff", "--no-edit", "-m", message, branch, cwd=repo, check=False)
+    conflicts = await git("diff", "--name-only", "--diff-filter=U", cwd=repo)
+    if conflicts:
+        await git("merge", "--abort", cwd=repo, check=False)
+        return conflicts.splitlines()
+    if await git("rev-parse", "-q", "--verify", "MERGE_HEAD", cwd=repo, check=False):
+        await git("merge", "--abort", cwd=repo, check=False)
+        raise GitError(("merge", branch), 1, output)
+    # A merge refused up front (e.g. local changes would be overwritten)
+    # leaves no merge state behind, so check the branch actually landed
+    merged = await git("branch", "--merged", "HEAD", "--list", branch, cwd=repo)
+    if not merged:
+        raise GitError(("merge", branch), 1, output)
+    return []
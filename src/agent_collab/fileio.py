@@ -0,0 +1,34 @@
+"""Crash-safe file writes."""
+import os
+import tempfile
+from pathlib import Path
+
+
+def write_atomic(path: Path, data: bytes | str, fsync: bool = False) -> None:
+    """Replace path's content atomically (temp file in the same directory, then rename).
+
+    Readers see either the old or the new content, never a partial write.
+    The parent directory is created if needed.
+
+    Args:
+        path: File to write.
+        data: New content; str is written as UTF-8.
+        fsync: Flush the content to disk before the rename, so the new
+            version survives a power loss once this returns.
+    """
+    if isinstance(data, str):
+        data = data.encode()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.rename(tmp_path, path)
+    except BaseException:
+        # Don't leave the temp file behind
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
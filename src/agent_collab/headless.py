@@ -0,0 +1,175 @@
+"""Headless workflow runner for CI and scheduled jobs."""
+import json
+import sys
+from pathlib import Path
+from typing import Any, Callable, TextIO
+
+from .adapters import AgentProcessError, AgentScheduler, Priority
+from .config import Config
+from .engine import AutopilotResult, Phase, StepStatus, WorkflowController
+
+# Exit codes
+EXIT_OK = 0  # plan approved (and, with execute, every step completed)
+EXIT_NOT_APPROVED = 1  # review loop ended without approval
+EXIT_USAGE = 2  # bad arguments, or no goal to start from
+EXIT_EXECUTION_FAILED = 3  # approved, but some steps didn't complete
+EXIT_AGENT_ERROR = 4  # an agent process failed
+
+_RESULT_STATUS = {
+    AutopilotResult.MAX_ITERATIONS: "max_iterations",
+    AutopilotResult.STALLED: "stalled",
+    AutopilotResult.BUDGET_EXHAUSTED: "budget_exhausted",
+    AutopilotResult.PAUSED: "paused",
+}
+
+
+class HeadlessRunner:
+    """Drives the plan/review (and optionally execute) workflow without a UI.
+
+    Agent output is streamed to ``out`` as plain text, or as JSON lines
+    (one record per output chunk, phase change, step and final result).
+    Agent turns are scheduled as batch work, behind interactive turns
+    sharing the same scheduler.
+    """
+
+    def __init__(
+        self,
+        project_root: Path,
+        config: Config,
+        out: TextIO | None = None,
+        json_output: bool = False,
+        scheduler: AgentScheduler | None = None,
+        on_phase_change: Callable[[Phase], None] | None = None,
+    ) -> None:
+        """Initialize runner.
+
+        Args:
+            project_root: Project root directory.
+            config: Configuration (autopilot pause points are ignored).
+            out: Stream for output (default: stdout).
+            json_output: Write JSON lines instead of plain text.
+            scheduler: Scheduler shared with other workflows (see WorkflowController).
+            on_phase_change: Called after each phase change is reported.
+        """
+        self.out = out or sys.stdout
+        self.json_output = json_output
+        self.on_phase_change = on_phase_change or (lambda phase: None)
+        # The final result record, once the run has finished
+        self.result: dict[str, Any] | None = None
+        self.workflow = WorkflowController(
+            project_root,
+            config,
+            on_output=self._on_output,
+            on_phase_change=self._on_phase_change,
+            scheduler=scheduler,
+            priority=Priority.BATCH,
+        )
+
+    def _emit(self, record: dict[str, Any]) -> None:
+        """Write one JSON record (JSON mode) or a bracketed status line."""
+        if self.json_output:
+            self.out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        elif record["type"] != "output":
+            details = " ".join(f"{k}={v}" for k, v in record.items() if k != "type")
+            self.out.write(f"\n[{record['type']}: {details}]\n")
+        self.out.flush()
+
+    def _on_output(self, text: str) -> None:
+        if self.json_output:
+            self._emit({"type": "output", "text": text})
+        else:
+            self.out.write(text)
+            if "\n" in text:
+                self.out.flush()
+
+    def _on_phase_change(self, phase: Phase) -> None:
+        self._emit({"type": "phase", "phase": phase.value, "iteration": self.workflow.state.iteration})
+        self.on_phase_change(phase)
+
+    async def run(self, goal: str | None = None, execute: bool = False) -> int:
+        """Run the workflow from its saved phase until it finishes or stops.
+
+        A new workflow refines the goal, writes the plan and runs the
+        review loop unattended. A workflow already in the review loop
+        resumes it. With execute, an approved plan's pending steps are
+        then executed.
+
+        Args:
+            goal: Goal description (required if no plan exists yet).
+            execute: Execute the plan once it is approved.
+
+        Returns:
+            Process exit code (one of the EXIT_* constants).
+        """
+        try:
+            code = await self._run(goal, execute)
+        except AgentProcessError as e:
+            code = self._finish("agent_error", EXIT_AGENT_ERROR, error=str(e))
+        finally:
+            await self.workflow.close()
+        return code
+
+    async def _run(self, goal: str | None, execute: bool) -> int:
+        workflow = self.workflow
+        if workflow.state.phase in (Phase.INIT, Phase.REFINE_GOAL):
+            if not goal:
+                return self._finish("no_goal", EXIT_USAGE)
+            await workflow.start_refinement(goal)
+        if workflow.state.phase in (Phase.REFINE_GOAL, Phase.WRITE_PLAN):
+            # Also retries a plan turn an earlier run didn't finish
+            await workflow.write_plan()
+
+        if workflow.state.phase in (Phase.REVIEW, Phase.RESPOND):
+            result = await workflow.run_autopilot(pause_on=[])
+            if result != AutopilotResult.APPROVED:
+                extra = {"stall": workflow.last_stall.detail} if workflow.last_stall else {}
+                return self._finish(_RESULT_STATUS[result], EXIT_NOT_APPROVED, **extra)
+
+        if execute and workflow.state.phase in (Phase.APPROVED, Phase.EXECUTE):
+            return await self._execute()
+        if workflow.state.phase == Phase.APPROVED:
+            return self._finish("approved", EXIT_OK)
+        if workflow.state.phase == Phase.DONE:
+            return self._finish("done", EXIT_OK)
+        # Execution started earlier but not finished, and not resumed here
+        return self._finish("execution_incomplete", EXIT_EXECUTION_FAILED)
+
+    async def _execute(self) -> int:
+        """Execute the pending steps and report whether all completed."""
+        workflow = self.workflow
+
+        def on_step(step) -> None:
+            self._emit({"type": "step", "number": step.number, "title": step.title})
+
+        if workflow.config.workflow.max_parallel_steps > 1:
+            try:
+                outcomes = await workflow.execute_plan_parallel(on_step=on_step)
+            except ValueError as e:
+                return self._finish("execution_failed", EXIT_EXECUTION_FAILED, error=str(e))
+            failed = [
+                outcome.number for outcome in outcomes
+                if outcome.status not in (StepStatus.MERGED, StepStatus.NO_CHANGES)
+            ]
+        else:
+            await workflow.execute_plan(on_step=on_step)
+            failed = [step.number for step in workflow.get_plan_index().pending()]
+
+        if failed:
+            return self._finish("execution_failed", EXIT_EXECUTION_FAILED, incomplete_steps=failed)
+        return self._finish("done", EXIT_OK)
+
+    def _finish(self, status: str, code: int, **details: Any) -> int:
+        """Report the final result and return its exit code."""
+        self.result = {
+            "type": "result",
+            "status": status,
+            "exit_code": code,
+            "phase": self.workflow.state.phase.value,
+            "iteration": self.workflow.state.iteration,
+            "open_comments": self.workflow.get_comment_index().open_count,
+            "agent_seconds": round(self.workflow.metrics.total("agent_turn_seconds"), 3),
+            "queue_seconds": round(self.workflow.metrics.total("agent_queue_seconds"), 3),
+            **details,
+        }
+        self._emit(self.result)
+        return code
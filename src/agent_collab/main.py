@@ -1,25 +1,160 @@
 """Agent Collab - Dual-agent collaboration workflow automation tool."""
+import argparse
+import asyncio
 import sys
 from pathlib import Path
 
-from .config import load_config
-from .tui import AgentCollabApp
+from .config import Config, load_config
 
 
-def main() -> None:
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="agent-collab",
+        description="Dual-agent plan/review workflow. Starts the TUI unless a subcommand is given.",
+    )
+    parser.add_argument(
+        "--project", type=Path, default=None,
+        help="project root directory (default: current directory)",
+    )
+    parser.add_argument(
+        "--config", type=Path, default=None,
+        help="config file (default: config.toml in the project root, if present)",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    run = subparsers.add_parser(
+        "run",
+        help="run the workflow headless (no TUI)",
+        description=(
+            "Refine the goal, write the plan and run the review loop unattended "
+            "(or resume a saved workflow), streaming agent output to stdout. "
+            "Exit status: 0 approved/done, 1 not approved, 2 usage error, "
+            "3 execution incomplete, 4 agent error."
+        ),
+    )
+    run.add_argument(
+        "goal_file", nargs="?", default=None,
+        help="file containing the goal, or - for stdin (read from stdin if piped)",
+    )
+    run.add_argument("--execute", action="store_true", help="execute the plan once approved")
+    run.add_argument("--json", action="store_true", help="write JSON lines instead of plain text")
+    run.add_argument(
+        "--max-iterations", type=int, default=None,
+        help="override workflow.max_iterations",
+    )
+    run.add_argument(
+        "--time-budget", type=float, default=None,
+        help="override workflow.time_budget (seconds)",
+    )
+
+    batch = subparsers.add_parser(
+        "batch",
+        help="run many headless workflows concurrently",
+        description=(
+            "Run a queue of jobs, one headless workflow per project, concurrently. "
+            "Each line of JOBS is a JSON object with \"project\" and \"goal\" "
+            "(or \"goal_file\"), and optionally \"name\" and \"execute\". "
+            "Exit status: 0 if every job succeeded, else 1 (2 for usage errors)."
+        ),
+    )
+    batch.add_argument("jobs", type=Path, help="JSON-lines job file")
+    batch.add_argument(
+        "--state-dir", type=Path, default=None,
+        help="keep each job's workflow files in STATE_DIR/<name> instead of its project",
+    )
+    batch.add_argument("--max-jobs", type=int, default=None, help="override batch.max_jobs")
+    batch.add_argument("--execute", action="store_true", help="execute every plan once approved")
+    batch.add_argument("--json", action="store_true", help="write JSON lines instead of plain text")
+    batch.add_argument(
+        "--max-iterations", type=int, default=None,
+        help="override workflow.max_iterations",
+    )
+    return parser.parse_args(argv)
+
+
+def _read_goal(goal_file: str | None) -> str | None:
+    """Read the goal from a file, or stdin if given '-' or piped."""
+    if goal_file == "-" or (goal_file is None and not sys.stdin.isatty()):
+        return sys.stdin.read().strip() or None
+    if goal_file is None:
+        return None
+    return Path(goal_file).read_text().strip() or None
+
+
+def _load_config(project_root: Path, config_path: Path | None) -> Config:
+    if config_path is None:
+        default = project_root / "config.toml"
+        config_path = default if default.exists() else None
+    return load_config(config_path)
+
+
+def _run_headless(project_root: Path, config: Config, args: argparse.Namespace) -> int:
+    # Imported here so the TUI-less path stays light
+    from .headless import EXIT_USAGE, HeadlessRunner
+
+    if args.max_iterations is not None:
+        config.workflow.max_iterations = args.max_iterations
+    if args.time_budget is not None:
+        config.workflow.time_budget = args.time_budget
+    try:
+        goal = _read_goal(args.goal_file)
+    except OSError as e:
+        print(f"agent-collab: cannot read goal: {e}", file=sys.stderr)
+        return EXIT_USAGE
+
+    try:
+        runner = HeadlessRunner(project_root, config, json_output=args.json)
+    except ValueError as e:
+        print(f"agent-collab: {e}", file=sys.stderr)
+        return EXIT_USAGE
+    try:
+        return asyncio.run(runner.run(goal, execute=args.execute))
+    except KeyboardInterrupt:
+        return 130
+
+
+def _run_batch(config: Config, args: argparse.Namespace) -> int:
+    from .batch import BatchRunner, load_jobs
+    from .headless import EXIT_USAGE
+
+    if args.max_jobs is not None:
+        config.batch.max_jobs = args.max_jobs
+    if args.max_iterations is not None:
+        config.workflow.max_iterations = args.max_iterations
+    try:
+        jobs = load_jobs(args.jobs)
+        runner = BatchRunner(
+            jobs, config, state_dir=args.state_dir, execute=args.execute, json_output=args.json
+        )
+    except (OSError, ValueError) as e:
+        print(f"agent-collab: {e}", file=sys.stderr)
+        return EXIT_USAGE
+    try:
+        return asyncio.run(runner.run())
+    except KeyboardInterrupt:
+        return 130
+
+
+def main(argv: list[str] | None = None) -> None:
     """Entry point for agent-collab CLI."""
-    # Use current directory as project root
-    project_root = Path.cwd()
+    args = _parse_args(argv)
+    project_root = (args.project or Path.cwd()).resolve()
+    config = _load_config(project_root, args.config)
 
-    # Load config from project root or use defaults
-    config_path = project_root / "config.toml"
-    config = load_config(config_path if config_path.exists() else None)
+    if args.command == "batch":
+        # Jobs name their own projects; only the config comes from here
+        sys.exit(_run_batch(config, args))
 
     # Ensure workdir exists
     workdir = config.get_workdir(project_root)
     workdir.mkdir(parents=True, exist_ok=True)
 
-    # Run the TUI app
+    if args.command == "run":
+        sys.exit(_run_headless(project_root, config, args))
+
+    # Textual is only needed (and only imported) for the interactive UI
+    from .tui import AgentCollabApp
+
     app = AgentCollabApp(project_root=project_root, config=config)
     app.run()
 
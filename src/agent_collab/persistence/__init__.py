@@ -6,6 +6,8 @@ from .state import (
     delete_state,
     state_exists,
 )
+from .journal import BACKENDS, StateJournal
+from .objects import ObjectStore
 
 __all__ = [
     "WorkflowState",
@@ -13,4 +15,7 @@ __all__ = [
     "load_state",
     "delete_state",
     "state_exists",
+    "BACKENDS",
+    "StateJournal",
+    "ObjectStore",
 ]
@@ -0,0 +1,147 @@
+"""Append-only journal backend for workflow state."""
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, TextIO
+
+from .state import (
+    WorkflowState,
+    _write_snapshot,
+    history_path,
+    journal_path,
+    load_state_dict,
+    read_journal,
+)
+
+FSYNC_POLICIES = ("never", "always")
+# Values of persistence.backend: rewrite state.json, or append to this journal
+BACKENDS = ("snapshot", "journal")
+
+
+class StateJournal:
+    """Records workflow state changes as an append-only JSON-lines journal.
+
+    Each save appends one small entry holding only the fields that changed,
+    instead of rewriting the whole state file. Dict fields that only gained
+    or changed keys (such as the per-iteration ``history``) record just
+    those keys, so entries don't grow with the number of iterations. Every ``compact_every``
+    entries the journal is folded into the state.json snapshot and its
+    entries are moved to a history file, which keeps the full audit trail.
+
+    ``load_state`` reads the snapshot and replays the journal tail, so the
+    journal is a drop-in replacement for ``save_state``.
+    """
+
+    def __init__(self, path: Path, fsync: str = "never", compact_every: int = 100) -> None:
+        """Open the journal for a state.json path.
+
+        Args:
+            path: Path to state.json (the journal and history files sit next to it).
+            fsync: "always" to fsync after every entry, "never" to leave
+                flushing to the OS.
+            compact_every: Entries between compactions (0 disables compaction).
+
+        Raises:
+            ValueError: If fsync is not a known policy or compact_every is negative.
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}, got {fsync!r}")
+        if compact_every < 0:
+            raise ValueError(f"compact_every must be non-negative, got {compact_every}")
+        self.path = path
+        self.journal_path = journal_path(path)
+        self.history_path = history_path(path)
+        self.fsync = fsync
+        self.compact_every = compact_every
+
+        self._drop_torn_tail()
+        data = load_state_dict(path) or {}
+        self.seq: int = data.pop("journal_seq", 0)
+        self._last: dict[str, Any] = data
+        self._pending = len(read_journal(self.journal_path))
+        self._file: TextIO | None = None
+
+    def append(self, state: WorkflowState) -> bool:
+        """Record the fields of state that changed since the last entry.
+
+        Returns:
+            True if an entry was written (False if nothing changed).
+        """
+        current = state.to_dict()
+        changed: dict[str, Any] = {}
+        merged: dict[str, dict[str, Any]] = {}
+        for key, value in current.items():
+            if key in self._last and self._last[key] == value:
+                continue
+            previous = self._last.get(key)
+            if isinstance(value, dict) and isinstance(previous, dict) and previous.keys() <= value.keys():
+                merged[key] = {k: v for k, v in value.items() if k not in previous or previous[k] != v}
+            else:
+                changed[key] = value
+        if not changed and not merged:
+            return False
+
+        self.seq += 1
+        entry: dict[str, Any] = {"seq": self.seq, "time": time.time(), "set": changed}
+        if merged:
+            entry["merge"] = merged
+        file = self._open()
+        file.write(json.dumps(entry) + "\n")
+        file.flush()
+        if self.fsync == "always":
+            os.fsync(file.fileno())
+        self._last = current
+        self._pending += 1
+
+        if self.compact_every and self._pending >= self.compact_every:
+            self.compact()
+        return True
+
+    def compact(self) -> None:
+        """Fold the journal into the snapshot and archive its entries."""
+        entries = read_journal(self.journal_path)
+        if not entries and self.path.exists():
+            return
+        sync = self.fsync == "always"
+        # Snapshot first: if we crash before truncating, the snapshot's
+        # journal_seq makes the stale entries no-ops on replay
+        _write_snapshot({**self._last, "journal_seq": self.seq}, self.path, fsync=sync)
+        with open(self.history_path, "a") as history:
+            for entry in entries:
+                history.write(json.dumps(entry) + "\n")
+            if sync:
+                history.flush()
+                os.fsync(history.fileno())
+        self.close()
+        self.journal_path.write_text("")
+        self._pending = 0
+
+    def history(self) -> list[dict[str, Any]]:
+        """Get every recorded entry, compacted or not, in order."""
+        entries: dict[int, dict[str, Any]] = {}
+        for entry in read_journal(self.history_path) + read_journal(self.journal_path):
+            entries[entry["seq"]] = entry
+        return [entries[seq] for seq in sorted(entries)]
+
+    def _drop_torn_tail(self) -> None:
+        # A crash mid-append leaves a partial last line; later entries
+        # appended after it would be unreadable
+        if not self.journal_path.exists():
+            return
+        data = self.journal_path.read_bytes()
+        if data and not data.endswith(b"\n"):
+            with open(self.journal_path, "r+b") as f:
+                f.truncate(data.rfind(b"\n") + 1)
+
+    def _open(self) -> TextIO:
+        if self._file is None:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.journal_path, "a")
+        return self._file
+
+    def close(self) -> None:
+        """Close the journal file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,111 @@
+"""Content-addressed, compressed store for versions of workflow files."""
+import hashlib
+import zlib
+from pathlib import Path
+
+from ..fileio import write_atomic
+
+# Object headers: a full object is zlib-compressed content; a delta is
+# compressed with its base object's content as the zlib preset dictionary.
+_FULL = b"F"
+_DELTA = b"D"
+_HASH_LEN = 64
+
+# zlib only uses the last 32 KiB of a preset dictionary
+_MAX_DICT = 32 * 1024
+
+
+class ObjectStore:
+    """Stores blobs under their SHA-256, deduplicated and compressed.
+
+    Objects live in ``root/<first 2 hex digits>/<remaining digits>`` like
+    git's loose objects. A blob may be stored as a delta against a similar
+    earlier blob (typically the previous iteration's version): it is
+    compressed with the base's content as zlib's preset dictionary, so the
+    unchanged text costs almost nothing. zlib only uses the last 32 KiB of
+    a preset dictionary, so for blobs larger than that only text matching
+    the end of the base is cheap, and versions that change early on are
+    usually stored in full. Deltas are always against a full object, never
+    another delta, so reading any version takes at most two decompressions
+    regardless of how many versions exist.
+    """
+
+    def __init__(self, root: Path) -> None:
+        """Initialize store.
+
+        Args:
+            root: Directory objects are stored in (created on first write).
+        """
+        self.root = root
+
+    def _path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest[2:]
+
+    def __contains__(self, digest: str) -> bool:
+        return self._path(digest).exists()
+
+    def put(self, data: bytes, base: str | None = None) -> str:
+        """Store a blob.
+
+        Args:
+            data: Content to store.
+            base: Hash of a similar stored blob to delta-compress against.
+                If it is itself a delta, its full base is used instead. Only
+                the base's last 32 KiB serve as the dictionary. The delta is
+                only kept if it is under half the size of plain compression.
+
+        Returns:
+            The blob's SHA-256 hex digest.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if path.exists():
+            return digest
+
+        record = _FULL + zlib.compress(data, 9)
+        base = self._full_base(base) if base is not None else None
+        if base is not None and base != digest:
+            base_data = self._read_full(base)
+            compressor = zlib.compressobj(9, zdict=base_data[-_MAX_DICT:])
+            delta = _DELTA + base.encode() + compressor.compress(data) + compressor.flush()
+            # A delta that saves little means the base has drifted too far;
+            # storing a full copy gives later versions a closer base
+            if len(delta) < len(record) // 2:
+                record = delta
+
+        write_atomic(path, record)
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        """Read a blob back.
+
+        Raises:
+            KeyError: If no blob has this hash.
+        """
+        record = self._read(digest)
+        if record[:1] == _FULL:
+            return zlib.decompress(record[1:])
+        base = record[1:1 + _HASH_LEN].decode()
+        base_data = self._read_full(base)
+        decompressor = zlib.decompressobj(zdict=base_data[-_MAX_DICT:])
+        return decompressor.decompress(record[1 + _HASH_LEN:]) + decompressor.flush()
+
+    def _read(self, digest: str) -> bytes:
+        try:
+            return self._path(digest).read_bytes()
+        except (FileNotFoundError, ValueError):
+            raise KeyError(digest) from None
+
+    def _read_full(self, digest: str) -> bytes:
+        record = self._read(digest)
+        return zlib.decompress(record[1:])
+
+    def _full_base(self, digest: str) -> str | None:
+        """Get the full object a delta should be taken against."""
+        try:
+            record = self._read(digest)
+        except KeyError:
+            return None
+        if record[:1] == _FULL:
+            return digest
+        return record[1:1 + _HASH_LEN].decode()
@@ -1,12 +1,11 @@
 """Workflow state persistence."""
 import json
-import os
-import tempfile
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from pathlib import Path
 from typing import Any
 
 from ..engine.state_machine import Phase
+from ..fileio import write_atomic
 
 
 @dataclass
@@ -16,6 +15,8 @@ class WorkflowState:
     iteration: int = 0
     planner_session: str | None = None
     reviewer_session: str | None = None
+    # iteration -> {"plan": hash, "comments": hash} in the object store
+    history: dict[int, dict[str, str]] = field(default_factory=dict)
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -24,6 +25,7 @@ class WorkflowState:
             "iteration": self.iteration,
             "planner_session": self.planner_session,
             "reviewer_session": self.reviewer_session,
+            "history": {str(k): v for k, v in self.history.items()},
         }
 
     @classmethod
@@ -34,66 +36,128 @@ class WorkflowState:
             iteration=data.get("iteration", 0),
             planner_session=data.get("planner_session"),
             reviewer_session=data.get("reviewer_session"),
+            history={int(k): dict(v) for k, v in data.get("history", {}).items()},
         )
 
 
+def journal_path(path: Path) -> Path:
+    """Get the journal file that goes with a state.json path."""
+    return path.with_name(f"{path.stem}.journal.jsonl")
+
+
+def history_path(path: Path) -> Path:
+    """Get the archive of compacted journal entries for a state.json path."""
+    return path.with_name(f"{path.stem}.history.jsonl")
+
+
+def _write_snapshot(data: dict[str, Any], path: Path, fsync: bool = False) -> None:
+    """Atomically write a state snapshot."""
+    write_atomic(path, json.dumps(data, indent=2), fsync=fsync)
+
+
+def read_journal(path: Path, after_seq: int = 0) -> list[dict[str, Any]]:
+    """Read journal entries with a sequence number above after_seq.
+
+    A torn final line (from a crash mid-append) is ignored.
+
+    Args:
+        path: Journal file.
+        after_seq: Skip entries up to and including this sequence number.
+
+    Returns:
+        Entries in order; each has "seq", "time" and "set" (changed fields),
+        and possibly "merge" (changed keys of dict fields).
+    """
+    if not path.exists():
+        return []
+    entries = []
+    with open(path) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                break
+            if entry.get("seq", 0) > after_seq:
+                entries.append(entry)
+    return entries
+
+
 def save_state(state: WorkflowState, path: Path) -> None:
     """Save workflow state to JSON file.
 
     Uses atomic write (write to temp file, then rename) to prevent corruption.
+    The snapshot replaces any journal left by the journaled backend.
 
     Args:
         state: The workflow state to save.
         path: Path to state.json file.
     """
-    # Ensure parent directory exists
-    path.parent.mkdir(parents=True, exist_ok=True)
-
-    # Atomic write: write to temp file first, then rename
-    fd, tmp_path = tempfile.mkstemp(
-        dir=path.parent,
-        prefix=".state_",
-        suffix=".tmp"
-    )
-    try:
-        with os.fdopen(fd, "w") as f:
-            json.dump(state.to_dict(), f, indent=2)
-        os.rename(tmp_path, path)
-    except Exception:
-        # Clean up temp file on failure
-        if os.path.exists(tmp_path):
-            os.unlink(tmp_path)
-        raise
+    _write_snapshot(state.to_dict(), path)
+    journal = journal_path(path)
+    if journal.exists():
+        journal.unlink()
 
 
 def load_state(path: Path) -> WorkflowState | None:
     """Load workflow state from JSON file.
 
+    If a journal exists next to the file (see StateJournal), its entries
+    newer than the snapshot are replayed on top of it.
+
     Args:
         path: Path to state.json file.
 
     Returns:
         WorkflowState if file exists and is valid, None otherwise.
     """
-    if not path.exists():
+    data = load_state_dict(path)
+    if data is None:
         return None
-
     try:
-        with open(path) as f:
-            data = json.load(f)
         return WorkflowState.from_dict(data)
-    except (json.JSONDecodeError, KeyError, ValueError):
+    except (KeyError, ValueError):
         return None
 
 
+def load_state_dict(path: Path) -> dict[str, Any] | None:
+    """Load the raw state dict (snapshot plus journal tail).
+
+    The returned dict includes "journal_seq", the sequence number of the
+    last journal entry applied.
+    """
+    data: dict[str, Any] | None = None
+    if path.exists():
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except json.JSONDecodeError:
+            data = None
+        if not isinstance(data, dict):
+            data = None
+
+    seq = data.get("journal_seq", 0) if data else 0
+    entries = read_journal(journal_path(path), after_seq=seq)
+    if data is None and not entries:
+        return None
+    data = dict(data or {})
+    for entry in entries:
+        data.update(entry["set"])
+        for key, changes in entry.get("merge", {}).items():
+            data[key] = {**data.get(key, {}), **changes}
+        data["journal_seq"] = entry["seq"]
+    data.setdefault("journal_seq", seq)
+    return data
+
+
 def delete_state(path: Path) -> None:
-    """Delete state file if it exists.
+    """Delete state file (and any journal and history) if it exists.
 
     Args:
         path: Path to state.json file.
     """
-    if path.exists():
-        path.unlink()
+    for file in (path, journal_path(path), history_path(path)):
+        if file.exists():
+            file.unlink()
 
 
 def state_exists(path: Path) -> bool:
@@ -103,6 +167,6 @@ def state_exists(path: Path) -> bool:
         path: Path to state.json file.
 
     Returns:
-        True if state file exists.
+        True if state file (or its journal) exists.
     """
-    return path.exists()
+    return path.exists() or journal_path(path).exists()
@@ -0,0 +1,11 @@
+"""Workflow instrumentation."""
+from .metrics import Histogram, MetricsRegistry
+from .tracing import Span, Tracer, read_trace
+
+__all__ = [
+    "Histogram",
+    "MetricsRegistry",
+    "Span",
+    "Tracer",
+    "read_trace",
+]
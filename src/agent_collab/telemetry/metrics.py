@@ -0,0 +1,169 @@
+"""In-process latency and throughput histograms with file export."""
+import bisect
+import contextlib
+import json
+import math
+import time
+from pathlib import Path
+from typing import Any, Iterator
+
+from ..fileio import write_atomic
+
+# Upper bounds (seconds) for latency histograms, from disk writes to long turns
+SECONDS_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0,
+)
+# Upper bounds for per-turn sizes (bytes or chunks)
+SIZE_BUCKETS = (1, 10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    def __init__(self, buckets: tuple[float, ...] = SECONDS_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def observe(self, value: float) -> None:
+        """Record one value."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by interpolating within its bucket.
+
+        Returns:
+            The estimate (0.0 if nothing was recorded).
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                lower, upper = max(lower, self.min), min(upper, self.max)
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.max
+
+    def to_dict(self) -> dict[str, Any]:
+        """Summary for JSON export."""
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "buckets": {
+                _format_bound(bound): count
+                for bound, count in zip((*self.buckets, math.inf), self.counts)
+            },
+        }
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == math.inf else repr(bound)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(labels: Labels, extra: tuple[str, str] | None = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+class MetricsRegistry:
+    """Named, labelled histograms for one workflow run.
+
+    Metrics are kept in memory and written out with ``export`` as a JSON
+    summary and a Prometheus text-format file (for node_exporter's textfile
+    collector or ad-hoc inspection).
+    """
+
+    def __init__(self, prefix: str = "agent_collab_") -> None:
+        self.prefix = prefix
+        self._histograms: dict[str, dict[Labels, Histogram]] = {}
+        self._buckets: dict[str, tuple[float, ...]] = {}
+
+    def histogram(
+        self, name: str, buckets: tuple[float, ...] = SECONDS_BUCKETS, **labels: str
+    ) -> Histogram:
+        """Get (or create) the histogram for a name and label set."""
+        series = self._histograms.setdefault(name, {})
+        self._buckets.setdefault(name, buckets)
+        key = tuple(sorted(labels.items()))
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = Histogram(self._buckets[name])
+        return histogram
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Record a latency value (seconds)."""
+        self.histogram(name, **labels).observe(value)
+
+    def observe_size(self, name: str, value: float, **labels: str) -> None:
+        """Record a size value (bytes, chunks)."""
+        self.histogram(name, SIZE_BUCKETS, **labels).observe(value)
+
+    def total(self, name: str) -> float:
+        """Sum of all values recorded under a name, across label sets."""
+        return sum(histogram.sum for histogram in self._histograms.get(name, {}).values())
+
+    @contextlib.contextmanager
+    def time(self, name: str, **labels: str) -> Iterator[None]:
+        """Time the enclosed block into a latency histogram."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def to_dict(self) -> dict[str, list[dict[str, Any]]]:
+        """All series, grouped by metric name."""
+        return {
+            name: [
+                {"labels": dict(labels), **histogram.to_dict()}
+                for labels, histogram in sorted(series.items())
+            ]
+            for name, series in sorted(self._histograms.items())
+        }
+
+    def to_prometheus(self) -> str:
+        """Render all series in the Prometheus text exposition format."""
+        lines = []
+        for name, series in sorted(self._histograms.items()):
+            metric = self.prefix + name
+            lines.append(f"# TYPE {metric} histogram")
+            for labels, histogram in sorted(series.items()):
+                cumulative = 0
+                for bound, count in zip((*histogram.buckets, math.inf), histogram.counts):
+                    cumulative += count
+                    le = ("le", _format_bound(bound))
+                    lines.append(f"{metric}_bucket{_label_text(labels, le)} {cumulative}")
+                lines.append(f"{metric}_sum{_label_text(labels)} {histogram.sum!r}")
+                lines.append(f"{metric}_count{_label_text(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def export(self, json_path: Path, prometheus_path: Path) -> None:
+        """Write the JSON summary and Prometheus file (atomically)."""
+        write_atomic(json_path, json.dumps(self.to_dict(), indent=2))
+        write_atomic(prometheus_path, self.to_prometheus())
+
@@ -0,0 +1,185 @@
+"""Lightweight tracing spans written in the Chrome trace event format."""
+import asyncio
+import contextlib
+import contextvars
+import itertools
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Iterator, TextIO
+
+_current_span: contextvars.ContextVar["Span | None"] = contextvars.ContextVar(
+    "agent_collab_span", default=None
+)
+
+
+class Span:
+    """One timed operation, linked to the span it ran under."""
+
+    def __init__(
+        self,
+        tracer: "Tracer",
+        name: str,
+        category: str,
+        span_id: int,
+        parent: "Span | None",
+        args: dict[str, Any],
+    ) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.span_id = span_id
+        self.parent_id = parent.span_id if parent is not None else None
+        self.args = args
+        self.tid = tracer._thread_id()
+        self._wall_us = time.time_ns() // 1000
+        self._start = time.perf_counter()
+        self._ended = False
+
+    def set(self, **args: Any) -> None:
+        """Attach extra attributes to the span."""
+        self.args.update(args)
+
+    def event(self, name: str, **args: Any) -> None:
+        """Record an instant event inside the span (e.g. first output)."""
+        self.tracer._write({
+            "name": name,
+            "cat": self.category,
+            "ph": "i",
+            "s": "t",
+            "ts": self._wall_us + int((time.perf_counter() - self._start) * 1e6),
+            "pid": self.tracer.pid,
+            "tid": self.tid,
+            "args": {"span_id": self.span_id, **args},
+        })
+
+    def end(self) -> None:
+        """Finish the span and write it out (only the first call counts)."""
+        if self._ended:
+            return
+        self._ended = True
+        self.tracer._write({
+            "name": self.name,
+            "cat": self.category,
+            "ph": "X",
+            "ts": self._wall_us,
+            "dur": int((time.perf_counter() - self._start) * 1e6),
+            "pid": self.tracer.pid,
+            "tid": self.tid,
+            "args": {"span_id": self.span_id, "parent_id": self.parent_id, **self.args},
+        })
+
+
+class Tracer:
+    """Records spans to a trace file.
+
+    The file uses the Chrome trace event "JSON array" format with one event
+    per line: it opens directly in chrome://tracing, Perfetto or Speedscope
+    (which accept the array without its closing bracket), and can still be
+    tailed or grepped line by line. Runs append to the same file and are
+    told apart by process ID.
+
+    Spans opened with ``span`` become the parent of spans started inside
+    them, including in asyncio tasks created there. Each asyncio task is
+    shown as its own track so concurrent work doesn't overlap.
+
+    A tracer without a path is disabled and records nothing.
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        """Initialize tracer.
+
+        Args:
+            path: Trace file to append to, or None to disable tracing.
+        """
+        self.path = path
+        self.pid = os.getpid()
+        self._file: TextIO | None = None
+        self._ids = itertools.count(1)
+        self._tids: dict[int, int] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """Whether spans are recorded."""
+        return self.path is not None
+
+    def start_span(self, name: str, category: str = "workflow", **args: Any) -> Span | None:
+        """Start a span under the current one without making it current.
+
+        For spans that outlive the block that starts them, such as an agent
+        stream consumed from several places. Call ``end()`` when finished.
+
+        Returns:
+            The span, or None if tracing is disabled.
+        """
+        if not self.enabled:
+            return None
+        return Span(self, name, category, next(self._ids), _current_span.get(), args)
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str = "workflow", **args: Any) -> Iterator[Span | None]:
+        """Time the enclosed block as a span and make it the current parent.
+
+        Yields:
+            The span (None if tracing is disabled).
+        """
+        span = self.start_span(name, category, **args)
+        if span is None:
+            yield None
+            return
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set(error=type(e).__name__)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+
+    def _thread_id(self) -> int:
+        """Track number for the running asyncio task (0 outside tasks)."""
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        if task is None:
+            return 0
+        key = id(task)
+        tid = self._tids.get(key)
+        if tid is None:
+            tid = self._tids[key] = len(self._tids) + 1
+            self._write({
+                "name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid,
+                "args": {"name": task.get_name()},
+            })
+        return tid
+
+    def _write(self, event: dict[str, Any]) -> None:
+        if self.path is None:
+            return
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a")
+            if self._file.tell() == 0:
+                self._file.write("[\n")
+        self._file.write(json.dumps(event) + ",\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        """Close the trace file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def read_trace(path: Path) -> list[dict[str, Any]]:
+    """Read the events of a trace file written by Tracer."""
+    events = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip().rstrip(",")
+            if line.startswith("{"):
+                events.append(json.loads(line))
+    return events
@@ -1,66 +1,73 @@
 """TUI application for agent-collab."""
+import asyncio
+from collections import deque
 from pathlib import Path
 
 from textual.app import App, ComposeResult
 from textual.binding import Binding
+from textual.worker import Worker, WorkerState
 from textual.widgets import Footer, Header, TabbedContent, TabPane, TextArea, Static, Input
 from textual.containers import Vertical
 
+from ..adapters import AgentProcessError
 from ..config import Config, load_config
-from ..engine import Phase, WorkflowController
+from ..engine import AutopilotResult, Phase, WorkflowController
 from ..persistence import WorkflowState, load_state, save_state, state_exists
+from .conversation import ConversationLog
+from .file_watch import WatchedFile, apply_minimal_edit, watch_files
+from .output import OutputCoalescer
 
 
 class ConversationPane(Vertical):
     """Pane for conversation with agents."""
 
+    def __init__(self, max_lines: int, transcript_path: Path) -> None:
+        super().__init__()
+        self.max_lines = max_lines
+        self.transcript_path = transcript_path
+
     def compose(self) -> ComposeResult:
-        yield TextArea(id="conversation", read_only=True)
+        yield ConversationLog(self.max_lines, self.transcript_path, id="conversation")
         yield Input(placeholder="Type your message (or /plan to write plan)...", id="user-input")
 
 
-class PlanTab(Static):
-    """Tab for displaying plan.md content."""
+class FileTab(Static):
+    """Tab showing a workflow file, updated in place when it changes."""
 
-    def __init__(self, plan_path: Path) -> None:
+    TEXT_AREA_ID = ""
+    PLACEHOLDER = ""
+
+    def __init__(self, path: Path) -> None:
         super().__init__()
-        self.plan_path = plan_path
+        self.path = path
+        self.watched = WatchedFile(path)
 
     def compose(self) -> ComposeResult:
-        yield TextArea(id="plan-content", read_only=True)
+        yield TextArea(id=self.TEXT_AREA_ID, read_only=True)
 
     def on_mount(self) -> None:
         self.refresh_content()
 
     def refresh_content(self) -> None:
-        """Refresh plan content from file."""
-        text_area = self.query_one("#plan-content", TextArea)
-        if self.plan_path.exists():
-            text_area.load_text(self.plan_path.read_text())
-        else:
-            text_area.load_text("(No plan yet)")
+        """Show the file's current content if it changed since last shown."""
+        content = self.watched.read_if_changed()
+        if content is not None:
+            text_area = self.query_one(f"#{self.TEXT_AREA_ID}", TextArea)
+            apply_minimal_edit(text_area, content or self.PLACEHOLDER)
 
 
-class CommentsTab(Static):
-    """Tab for displaying comments.md content."""
+class PlanTab(FileTab):
+    """Tab for displaying plan.md content."""
 
-    def __init__(self, comments_path: Path) -> None:
-        super().__init__()
-        self.comments_path = comments_path
+    TEXT_AREA_ID = "plan-content"
+    PLACEHOLDER = "(No plan yet)"
 
-    def compose(self) -> ComposeResult:
-        yield TextArea(id="comments-content", read_only=True)
 
-    def on_mount(self) -> None:
-        self.refresh_content()
+class CommentsTab(FileTab):
+    """Tab for displaying comments.md content."""
 
-    def refresh_content(self) -> None:
-        """Refresh comments content from file."""
-        text_area = self.query_one("#comments-content", TextArea)
-        if self.comments_path.exists():
-            text_area.load_text(self.comments_path.read_text())
-        else:
-            text_area.load_text("(No comments yet)")
+    TEXT_AREA_ID = "comments-content"
+    PLACEHOLDER = "(No comments yet)"
 
 
 class StatusBar(Static):
@@ -75,7 +82,7 @@ class StatusBar(Static):
         yield Static(self._format_status(), id="phase-display")
 
     def _format_status(self) -> str:
-        return f"Phase: {self.phase.value} | Iteration: {self.iteration} | [Enter] Proceed [R] Refresh [Q] Quit"
+        return f"Phase: {self.phase.value} | Iteration: {self.iteration} | [Enter] Proceed [Esc] Cancel [R] Refresh [Q] Quit"
 
     def update_status(self, phase: Phase, iteration: int) -> None:
         """Update displayed status."""
@@ -125,6 +132,7 @@ class AgentCollabApp(App):
     BINDINGS = [
         Binding("q", "quit", "Quit", show=False),
         Binding("r", "refresh", "Refresh", show=False),
+        Binding("escape", "cancel_turn", "Cancel", show=False),
     ]
 
     def __init__(
@@ -135,6 +143,15 @@ class AgentCollabApp(App):
         super().__init__()
         self.project_root = project_root
         self.config = config or load_config()
+        # All conversation text goes through one coalescer so app messages
+        # stay in order with buffered agent output
+        self._output = OutputCoalescer(
+            self._write_conversation,
+            interval=self.config.tui.output_interval,
+            max_pending=self.config.tui.output_max_pending,
+        )
+        self._turn: Worker | None = None
+        self._input_queue: deque[str] = deque()
         self._init_workflow()
 
     def _init_workflow(self) -> None:
@@ -146,20 +163,23 @@ class AgentCollabApp(App):
             on_phase_change=self._on_phase_change,
         )
 
-    def _on_agent_output(self, text: str) -> None:
-        """Handle agent output."""
-        self.call_from_thread(self.update_conversation, text)
+    def _on_agent_output(self, text: str) -> asyncio.Future | None:
+        """Handle agent output (the returned future applies backpressure)."""
+        return self._output.write(text)
 
     def _on_phase_change(self, phase: Phase) -> None:
         """Handle phase change."""
-        self.call_from_thread(self._update_status_bar)
-        self.call_from_thread(self.action_refresh)
+        self._update_status_bar()
+        self.action_refresh()
 
     def compose(self) -> ComposeResult:
         yield Header()
         with TabbedContent():
             with TabPane("Conversation", id="tab-conversation"):
-                yield ConversationPane()
+                yield ConversationPane(
+                    self.config.tui.conversation_lines,
+                    self.config.get_transcript_path(self.project_root),
+                )
             with TabPane("Plan", id="tab-plan"):
                 yield PlanTab(self.config.get_plan_path(self.project_root))
             with TabPane("Comments", id="tab-comments"):
@@ -169,6 +189,7 @@ class AgentCollabApp(App):
 
     async def on_mount(self) -> None:
         """Handle app mount - check for existing session."""
+        self.workflow.warm_up()
         state_path = self.config.get_state_path(self.project_root)
         if state_exists(state_path) and self.workflow.state.phase != Phase.DONE:
             self.update_conversation(
@@ -182,28 +203,116 @@ class AgentCollabApp(App):
             "Describe your goal, then type /plan when ready to create a plan.\n\n"
         )
 
-    async def on_input_submitted(self, event: Input.Submitted) -> None:
-        """Handle user input submission."""
+        if self.config.tui.watch_files:
+            self.run_worker(self._watch_files(), name="file-watch", group="file-watch")
+
+    async def _watch_files(self) -> None:
+        """Refresh the Plan and Comments tabs as agents write the files."""
+        tabs = list(self.query(FileTab))
+        by_path = {tab.path.resolve(): tab for tab in tabs}
+        async for changed in watch_files([tab.path for tab in tabs], self.config.tui.watch_debounce):
+            for path in changed:
+                if path in by_path:
+                    with self.workflow.tracer.span("file_changed", "ui", file=path.name):
+                        by_path[path].refresh_content()
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        """Handle user input submission.
+
+        Agent turns run as a background worker so the UI stays responsive
+        and the turn can be cancelled; input submitted meanwhile is queued
+        and run when the turn finishes.
+        """
         user_input = event.value.strip()
-        if not user_input:
+        event.input.value = ""
+
+        if user_input.lower() == "/cancel":
+            self.action_cancel_turn()
             return
 
-        # Clear input
-        event.input.value = ""
+        if self.turn_running:
+            if user_input:
+                self._input_queue.append(user_input)
+                self.update_conversation(f"[Queued: {user_input}]\n\n")
+            return
+
+        # Enter on an empty input proceeds one review iteration
+        if not user_input and self.workflow.state.phase not in (Phase.REVIEW, Phase.RESPOND):
+            return
+        self._start_turn(user_input)
+
+    @property
+    def turn_running(self) -> bool:
+        """Whether an agent turn is in progress."""
+        return self._turn is not None and self._turn.is_running
+
+    def _start_turn(self, user_input: str) -> None:
+        """Run one user input as a cancellable worker."""
+        self._turn = self.run_worker(
+            self._run_turn(user_input), name="agent-turn", group="agent-turn", exit_on_error=False
+        )
+
+    async def _run_turn(self, user_input: str) -> None:
+        """Dispatch one user input, rolling state back if it is cancelled."""
+        if user_input.startswith("/"):
+            command = user_input.split()[0].lower()
+        else:
+            command = "message" if user_input else "continue"
+        try:
+            with self.workflow.tracer.span("command", "ui", command=command):
+                async with self.workflow.cancellable():
+                    await self._dispatch_input(user_input)
+        except AgentProcessError as e:
+            self.update_conversation(f"\n\n[Agent failed: {e}]\n\n")
+        except asyncio.CancelledError:
+            self.update_conversation(
+                f"\n\n[Cancelled - back to phase {self.workflow.state.phase.value}]\n\n"
+            )
+            self.action_refresh()
+            self._update_status_bar()
+            raise
+
+    async def _dispatch_input(self, user_input: str) -> None:
+        """Route one user input to its command handler."""
+        if not user_input:
+            if self.workflow.state.phase in (Phase.REVIEW, Phase.RESPOND):
+                await self._handle_continue_command()
+            return
 
         # Add user message to conversation
         self.update_conversation(f"You: {user_input}\n\n")
 
-        # Handle commands
         if user_input.lower() == "/plan":
             await self._handle_plan_command()
         elif user_input.lower() == "/approve":
             await self._handle_approve_command()
         elif user_input.lower() == "/execute":
             await self._handle_execute_command()
+        elif user_input.lower() == "/auto":
+            await self._handle_auto_command()
         else:
             await self._handle_user_message(user_input)
 
+    def on_worker_state_changed(self, event: Worker.StateChanged) -> None:
+        """Start the next queued input once a turn finishes."""
+        if event.worker is not self._turn or not event.worker.is_finished:
+            return
+        self._turn = None
+        if event.state == WorkerState.ERROR:
+            self.update_conversation(f"\n\n[Error: {event.worker.error}]\n\n")
+        if event.state == WorkerState.CANCELLED and self._input_queue:
+            self.update_conversation(f"[Discarded {len(self._input_queue)} queued input(s)]\n\n")
+            self._input_queue.clear()
+        elif self._input_queue:
+            self._start_turn(self._input_queue.popleft())
+
+    def action_cancel_turn(self) -> None:
+        """Cancel the running agent turn, killing its agent processes."""
+        if self.turn_running:
+            self._turn.cancel()
+        else:
+            self.update_conversation("[Nothing to cancel]\n\n")
+
     async def _handle_user_message(self, message: str) -> None:
         """Handle regular user message."""
         phase = self.workflow.state.phase
@@ -224,12 +333,73 @@ class AgentCollabApp(App):
         self.update_conversation("\n\n")
         self.action_refresh()
 
+        if self.config.workflow.autopilot and not self.workflow.is_approved():
+            await self._handle_auto_command()
+        else:
+            self._report_review()
+
+    async def _handle_continue_command(self) -> None:
+        """Handle Enter in the review loop: run the next respond/review turn."""
+        if self.workflow.state.phase == Phase.RESPOND:
+            if self.workflow.is_max_iterations():
+                self.update_conversation(
+                    "[Max iterations reached. Type /approve to force approve.]\n\n"
+                )
+                return
+            self.update_conversation("Agent (Planner): ")
+            await self.workflow.respond_to_comments()
+            self.update_conversation("\n\n")
+
+        self.update_conversation("Agent (Reviewer): ")
+        await self.workflow.review_plan()
+        self.update_conversation("\n\n")
+        self.action_refresh()
+        self._report_review()
+
+    async def _handle_auto_command(self) -> None:
+        """Handle /auto command: run the review loop without manual Enter presses."""
+        if self.workflow.state.phase not in (Phase.REVIEW, Phase.RESPOND):
+            self.update_conversation(
+                f"[Cannot start autopilot in phase: {self.workflow.state.phase.value}]\n\n"
+            )
+            return
+
+        self.update_conversation("[Autopilot: running review loop...]\n\n")
+        result = await self.workflow.run_autopilot()
+        self.update_conversation("\n\n")
+        self.action_refresh()
+
+        if result == AutopilotResult.APPROVED:
+            self._report_review()
+        elif result == AutopilotResult.MAX_ITERATIONS:
+            self.update_conversation(
+                f"[Autopilot stopped: max iterations ({self.config.workflow.max_iterations}) reached. "
+                "Type /approve to force approve.]\n\n"
+            )
+        elif result == AutopilotResult.STALLED:
+            self.update_conversation(
+                f"[Autopilot stopped: review loop stalled ({self.workflow.last_stall.detail}). "
+                "Press Enter or type /auto to continue, or /approve to accept the plan.]\n\n"
+            )
+        elif result == AutopilotResult.BUDGET_EXHAUSTED:
+            self.update_conversation(
+                f"[Autopilot stopped: time budget exhausted (phase: {self.workflow.state.phase.value}). "
+                "Press Enter or type /auto to continue.]\n\n"
+            )
+        else:
+            self.update_conversation(
+                f"[Autopilot paused before {self.workflow.state.phase.value}. "
+                "Press Enter or type /auto to continue.]\n\n"
+            )
+
+    def _report_review(self) -> None:
+        """Show the outcome of the latest review."""
         if self.workflow.is_approved():
             self.update_conversation("[Plan APPROVED! Type /execute to begin execution.]\n\n")
         else:
             self.update_conversation(
                 f"[Review complete - Iteration {self.workflow.state.iteration}. "
-                "Press Enter to continue iteration or type /approve to force approve.]\n\n"
+                "Press Enter to continue iteration, /auto to run unattended, or /approve to force approve.]\n\n"
             )
 
     async def _handle_approve_command(self) -> None:
@@ -244,45 +414,91 @@ class AgentCollabApp(App):
             self.update_conversation(f"[Cannot approve in phase: {self.workflow.state.phase.value}]\n\n")
 
     async def _handle_execute_command(self) -> None:
-        """Handle /execute command."""
-        if self.workflow.state.phase != Phase.APPROVED:
+        """Handle /execute command: walk the plan's pending steps in order."""
+        if self.workflow.state.phase not in (Phase.APPROVED, Phase.EXECUTE):
             self.update_conversation(f"[Cannot execute - plan not approved (phase: {self.workflow.state.phase.value})]\n\n")
             return
 
-        self.update_conversation("[Execution phase - implement steps one by one]\n")
-        self.update_conversation("[Note: In MVP, agent will read plan and execute. Press Enter after each step.]\n\n")
+        pending = self.workflow.get_plan_index().pending()
+        if not pending:
+            self.update_conversation("[No pending steps found in plan.]\n\n")
+            return
+
+        if self.config.workflow.max_parallel_steps > 1:
+            await self._execute_parallel(len(pending))
+            return
+
+        self.update_conversation(f"[Executing {len(pending)} pending step(s)]\n\n")
+
+        def on_step(step) -> None:
+            self.update_conversation(f"\n\n[Step {step.number}: {step.title}]\n\nAgent (Planner): ")
+
+        await self.workflow.execute_plan(on_step=on_step)
+        self.update_conversation("\n\n")
+        self.action_refresh()
+        self._update_status_bar()
+
+        remaining = self.workflow.get_plan_index().pending()
+        if remaining:
+            numbers = ", ".join(str(step.number) for step in remaining)
+            self.update_conversation(
+                f"[Steps not marked complete: {numbers}. Type /execute to retry.]\n\n"
+            )
+        else:
+            self.update_conversation("[All steps complete.]\n\n")
+
+    async def _execute_parallel(self, count: int) -> None:
+        """Run pending steps concurrently in git worktrees and report merges."""
+        self.update_conversation(
+            f"[Executing {count} pending step(s), up to "
+            f"{self.config.workflow.max_parallel_steps} at a time in git worktrees]\n\n"
+        )
+
+        def on_step(step) -> None:
+            self.update_conversation(f"[Step {step.number} started: {step.title}]\n")
 
-        # For MVP, just transition to execute phase
-        self.workflow.state.phase = Phase.EXECUTE
-        self.workflow._save_state()
+        try:
+            outcomes = await self.workflow.execute_plan_parallel(on_step=on_step)
+        except ValueError as e:
+            self.update_conversation(f"[Cannot execute in parallel: {e}]\n\n")
+            return
+        self.action_refresh()
         self._update_status_bar()
 
+        lines = []
+        for outcome in outcomes:
+            line = f"  Step {outcome.number}: {outcome.status.value}"
+            if outcome.conflicts:
+                line += f" in {', '.join(outcome.conflicts)} (branch {outcome.branch})"
+            elif outcome.error:
+                line += f" - {outcome.error.splitlines()[0]}"
+            lines.append(line)
+        self.update_conversation("\n[Execution finished]\n" + "\n".join(lines) + "\n\n")
+
+    async def on_unmount(self) -> None:
+        """Handle app unmount - stop any warm agent processes."""
+        self._output.flush()
+        await self.workflow.close()
+
     def action_quit(self) -> None:
         """Quit the application."""
         self.exit()
 
     def action_refresh(self) -> None:
-        """Refresh file contents."""
-        try:
-            plan_tab = self.query_one(PlanTab)
-            plan_tab.refresh_content()
-        except Exception:
-            pass
-
-        try:
-            comments_tab = self.query_one(CommentsTab)
-            comments_tab.refresh_content()
-        except Exception:
-            pass
+        """Refresh file contents (only files that changed are updated)."""
+        with self.workflow.tracer.span("refresh_tabs", "ui"):
+            for tab in self.query(FileTab):
+                tab.refresh_content()
 
     def update_conversation(self, text: str) -> None:
-        """Add text to conversation area."""
+        """Queue text for the conversation log (shown on the next frame)."""
+        self._output.write(text)
+
+    def _write_conversation(self, text: str) -> None:
+        """Append text to the conversation log."""
         try:
-            conv = self.query_one("#conversation", TextArea)
-            current = conv.text
-            conv.load_text(current + text)
-            # Scroll to bottom
-            conv.scroll_end()
+            with self.workflow.tracer.span("write_conversation", "ui", chars=len(text)):
+                self.query_one("#conversation", ConversationLog).write(text)
         except Exception:
             pass
 
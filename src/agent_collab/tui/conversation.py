@@ -0,0 +1,193 @@
+"""Append-only conversation log widget."""
+import re
+from collections import deque
+from pathlib import Path
+from typing import BinaryIO
+
+from rich.cells import cell_len
+from rich.text import Text
+from textual.cache import LRUCache
+from textual.geometry import Size
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+# Lines are read back from the spill file this many at a time
+SPILL_PAGE_LINES = 256
+
+_CONTROL_RE = re.compile("[\x00-\x08\x0b-\x1f\x7f]")
+
+
+class ConversationBuffer:
+    """Append-only transcript held as a bounded ring buffer of lines.
+
+    The most recent ``max_lines`` lines are kept in memory. Older lines are
+    spilled to a file on disk as they fall out of the buffer and can be read
+    back by line number, so the whole transcript stays addressable while
+    memory use stays bounded.
+    """
+
+    def __init__(self, max_lines: int = 5000, spill_path: Path | None = None) -> None:
+        """Initialize an empty buffer.
+
+        Args:
+            max_lines: Lines kept in memory (including the unterminated last line).
+            spill_path: File older lines are written to. It is truncated on
+                creation. Without one, older lines are dropped.
+
+        Raises:
+            ValueError: If max_lines is less than 1.
+        """
+        if max_lines < 1:
+            raise ValueError(f"max_lines must be at least 1, got {max_lines}")
+        self.max_lines = max_lines
+        self.spill_path = spill_path
+        self.lines: deque[str] = deque([""])
+        self.first_line = 0  # line number of lines[0]
+        self._spill: BinaryIO | None = None
+        self._offsets: list[int] = []  # byte offset of each spilled line
+        if spill_path is not None:
+            spill_path.parent.mkdir(parents=True, exist_ok=True)
+            self._spill = open(spill_path, "w+b")
+
+    @property
+    def line_count(self) -> int:
+        """Total lines in the transcript, spilled or not.
+
+        The unterminated last line only counts once it has text.
+        """
+        return self.first_line + len(self.lines) - (self.lines[-1] == "")
+
+    def append(self, text: str) -> tuple[int, int]:
+        """Append text, continuing the unterminated last line.
+
+        Cost depends only on the size of text, not on the transcript length.
+
+        Returns:
+            (first, end) line numbers of the lines that changed.
+        """
+        first = self.first_line + len(self.lines) - 1
+        parts = text.replace("\r\n", "\n").split("\n")
+        self.lines[-1] += parts[0]
+        self.lines.extend(parts[1:])
+        while len(self.lines) > self.max_lines:
+            self._spill_line(self.lines.popleft())
+        return first, self.first_line + len(self.lines)
+
+    def _spill_line(self, line: str) -> None:
+        if self._spill is not None:
+            self._spill.seek(0, 2)
+            self._offsets.append(self._spill.tell())
+            self._spill.write(line.encode("utf-8") + b"\n")
+        self.first_line += 1
+
+    def get_line(self, number: int) -> str | None:
+        """Get an in-memory line (None if it was spilled or doesn't exist)."""
+        index = number - self.first_line
+        if 0 <= index < len(self.lines):
+            return self.lines[index]
+        return None
+
+    def read_spilled(self, start: int, count: int) -> list[str]:
+        """Read spilled lines back from disk.
+
+        Args:
+            start: First line number.
+            count: Maximum number of lines.
+
+        Returns:
+            The lines (fewer than count at the end of the spilled range, and
+            none if nothing was spilled to disk).
+        """
+        end = min(start + count, len(self._offsets))
+        if self._spill is None or start >= end:
+            return []
+        self._spill.flush()
+        stop = self._offsets[end] if end < len(self._offsets) else self._spill.seek(0, 2)
+        self._spill.seek(self._offsets[start])
+        data = self._spill.read(stop - self._offsets[start])
+        return data.decode("utf-8", errors="replace").split("\n")[: end - start]
+
+    def close(self) -> None:
+        """Close the spill file."""
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+
+
+class ConversationLog(ScrollView, can_focus=True):
+    """Virtualized, append-only view of a ConversationBuffer.
+
+    Only the visible lines are rendered, and appending only refreshes the
+    lines that changed. Scrolling back past the in-memory window pages
+    spilled lines in from disk.
+    """
+
+    DEFAULT_CSS = """
+    ConversationLog {
+        background: $surface;
+        color: $text;
+        overflow-x: auto;
+        overflow-y: scroll;
+    }
+    """
+
+    def __init__(
+        self,
+        max_lines: int = 5000,
+        spill_path: Path | None = None,
+        id: str | None = None,
+    ) -> None:
+        """Initialize log.
+
+        Args:
+            max_lines: Lines kept in memory.
+            spill_path: Transcript file older lines are spilled to.
+            id: Widget ID.
+        """
+        super().__init__(id=id)
+        self.buffer = ConversationBuffer(max_lines, spill_path)
+        self._width = 0
+        self._pages: LRUCache[int, list[str]] = LRUCache(16)
+
+    def write(self, text: str) -> None:
+        """Append text and scroll to it if the view was at the end."""
+        if not text:
+            return
+        at_end = self.is_vertical_scroll_end
+        first, end = self.buffer.append(text)
+        for number in range(max(first, self.buffer.first_line), end):
+            self._width = max(self._width, cell_len(self.buffer.get_line(number)))
+        self.virtual_size = Size(self._width, self.buffer.line_count)
+        self.refresh_lines(first, end - first)
+        if at_end:
+            self.scroll_end(animate=False, immediate=True, x_axis=False)
+
+    def _get_line(self, number: int) -> str:
+        line = self.buffer.get_line(number)
+        if line is not None:
+            return line
+        page = number // SPILL_PAGE_LINES
+        index = number - page * SPILL_PAGE_LINES
+        lines = self._pages.get(page)
+        if lines is None or index >= len(lines):
+            # Not cached, or cached before the rest of the page was spilled
+            lines = self.buffer.read_spilled(page * SPILL_PAGE_LINES, SPILL_PAGE_LINES)
+            self._pages[page] = lines
+        return lines[index] if index < len(lines) else ""
+
+    def render_line(self, y: int) -> Strip:
+        """Render one visible row."""
+        scroll_x, scroll_y = self.scroll_offset
+        number = scroll_y + y
+        width = self.size.width
+        style = self.rich_style
+        if number >= self.buffer.line_count:
+            return Strip.blank(width, style)
+        line = _CONTROL_RE.sub("\ufffd", self._get_line(number).expandtabs())
+        text = Text(line, no_wrap=True, style=style)
+        strip = Strip(text.render(self.app.console), cell_len(line))
+        return strip.crop_extend(scroll_x, scroll_x + width, style).apply_offsets(scroll_x, number)
+
+    def on_unmount(self) -> None:
+        """Close the spill file."""
+        self.buffer.close()
@@ -0,0 +1,109 @@
+"""Live refresh of workflow files shown in the TUI."""
+import hashlib
+from pathlib import Path
+from typing import AsyncIterator
+
+from textual.widgets import TextArea
+from watchfiles import awatch
+
+
+class WatchedFile:
+    """Tracks a file's content so unchanged files are not reloaded.
+
+    The file is only read when its mtime or size changes, and reported as
+    changed only when its content hash differs from the last read.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._stat: tuple[int, int] | None = None
+        self._hash: str | None = None
+
+    def read_if_changed(self) -> str | None:
+        """Get the file's content if it changed since the last call.
+
+        Returns:
+            New content ("" for a missing file), or None if unchanged.
+        """
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            if self._hash == "":
+                return None
+            self._stat, self._hash = None, ""
+            return ""
+
+        key = (stat.st_mtime_ns, stat.st_size)
+        if key == self._stat:
+            return None
+        self._stat = key
+        content = self.path.read_text()
+        digest = hashlib.sha1(content.encode()).hexdigest()
+        if digest == self._hash:
+            return None
+        self._hash = digest
+        return content
+
+
+def apply_minimal_edit(text_area: TextArea, new_text: str) -> bool:
+    """Update a TextArea to new_text by replacing only the changed lines.
+
+    Lines shared at the start and end of the old and new text are left in
+    place, so appending to or editing part of a long document doesn't
+    re-layout all of it.
+
+    Returns:
+        True if the text area was changed.
+    """
+    old_text = text_area.text
+    if old_text == new_text:
+        return False
+
+    old_lines = old_text.splitlines(keepends=True)
+    new_lines = new_text.splitlines(keepends=True)
+    limit = min(len(old_lines), len(new_lines))
+    prefix = 0
+    while prefix < limit and old_lines[prefix] == new_lines[prefix]:
+        prefix += 1
+    suffix = 0
+    while (
+        suffix < limit - prefix
+        and old_lines[-1 - suffix] == new_lines[-1 - suffix]
+    ):
+        suffix += 1
+
+    old_end = len(old_lines) - suffix
+    start = (prefix, 0)
+    end = (old_end, 0) if suffix else text_area.document.end
+    insert = "".join(new_lines[prefix:len(new_lines) - suffix])
+    text_area.replace(insert, start, end, maintain_selection_offset=True)
+    # Programmatic refreshes shouldn't be undoable
+    text_area.history.clear()
+    return True
+
+
+async def watch_files(paths: list[Path], debounce: float = 0.2) -> AsyncIterator[set[Path]]:
+    """Yield sets of changed paths as the files are written.
+
+    Watches the files' parent directories, so files that don't exist yet
+    (or are replaced by rename) are picked up too.
+
+    Args:
+        paths: Files to watch.
+        debounce: Seconds to wait for a burst of writes to settle.
+
+    Yields:
+        The watched paths that changed in each settled batch.
+    """
+    watched = {path.resolve() for path in paths}
+    directories = {path.parent for path in watched}
+    for directory in directories:
+        directory.mkdir(parents=True, exist_ok=True)
+
+    async for changes in awatch(
+        *directories,
+        watch_filter=lambda change, path: Path(path) in watched,
+        debounce=int(debounce * 1000),
+        recursive=False,
+    ):
+        yield {Path(path) for _, path in changes}
@@ -0,0 +1,90 @@
+"""Rate-limited delivery of streamed output to the UI."""
+import asyncio
+import time
+from typing import Callable
+
+
+class OutputCoalescer:
+    """Buffers streamed text and hands it to a sink at a bounded frame rate.
+
+    Chunks written between frames are joined and delivered in one sink call
+    at most every ``interval`` seconds, so a fast agent costs one UI update
+    per frame rather than one per chunk. If more than ``max_pending``
+    characters pile up before the next frame, ``write`` returns an awaitable
+    that completes once they have been delivered and the UI has had a turn
+    of the event loop; a producer that awaits it cannot get unboundedly
+    ahead of the screen.
+    """
+
+    def __init__(
+        self,
+        sink: Callable[[str], None],
+        interval: float = 0.033,
+        max_pending: int = 64 * 1024,
+    ) -> None:
+        """Initialize coalescer.
+
+        Args:
+            sink: Receives the joined text of each frame.
+            interval: Minimum seconds between sink calls.
+            max_pending: Buffered characters above which writers must wait.
+        """
+        self.sink = sink
+        self.interval = interval
+        self.max_pending = max_pending
+        self.flush_count = 0
+        self._pending: list[str] = []
+        self._size = 0
+        self._last_flush = 0.0
+        self._timer: asyncio.TimerHandle | None = None
+        self._flushed: asyncio.Future | None = None
+
+    @property
+    def pending(self) -> int:
+        """Characters waiting for the next frame."""
+        return self._size
+
+    def write(self, text: str) -> asyncio.Future | None:
+        """Queue text for the next frame.
+
+        Must be called from the event loop thread.
+
+        Returns:
+            None, or a future to await if the buffer is over max_pending.
+        """
+        if not text:
+            return None
+        self._pending.append(text)
+        self._size += len(text)
+        if self._timer is None:
+            loop = asyncio.get_running_loop()
+            delay = max(0.0, self._last_flush + self.interval - time.monotonic())
+            self._timer = loop.call_later(delay, self.flush)
+        if self._size > self.max_pending:
+            if self._flushed is None:
+                self._flushed = asyncio.get_running_loop().create_future()
+            return self._flushed
+        return None
+
+    def flush(self) -> None:
+        """Deliver everything buffered now."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._pending:
+            text = "".join(self._pending)
+            self._pending.clear()
+            self._size = 0
+            self._last_flush = time.monotonic()
+            self.flush_count += 1
+            self.sink(text)
+        if self._flushed is not None:
+            # Resolve on a later loop turn so the UI repaints before the
+            # producer resumes
+            asyncio.get_running_loop().call_soon(_resolve, self._flushed)
+            self._flushed = None
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
@@ -0,0 +1,51 @@
+"""Test doubles shared by the test modules."""
+import asyncio
+
+from agent_collab.adapters import AgentAdapter, TextDelta
+
+
+class ScriptedAdapter(AgentAdapter):
+    """Test adapter whose turns run a side effect and stream canned output.
+
+    Each turn records its prompt, waits ``delay`` seconds, calls
+    ``on_turn(prompt)`` (which may raise to fail the turn), then yields
+    ``chunks`` as TextDelta events. With ``hang`` set the turn then never
+    finishes on its own.
+    """
+
+    def __init__(
+        self,
+        on_turn=None,
+        delay: float = 0.0,
+        chunks=("ok",),
+        hang: bool = False,
+        working_dir: str = "/project",
+    ):
+        super().__init__(working_dir)
+        self.on_turn = on_turn or (lambda prompt: None)
+        self.delay = delay
+        self.chunks = list(chunks)
+        self.hang = hang
+        self.prompts: list[str] = []
+
+    async def _open_stream(self, prompt):
+        self.prompts.append(prompt)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.on_turn(prompt)
+        for chunk in self.chunks:
+            yield TextDelta(chunk)
+        if self.hang:
+            await asyncio.sleep(3600)
+
+    async def check_available(self) -> bool:
+        return True
+
+    def get_cli_command(self) -> list[str]:
+        return ["scripted"]
+
+    def build_command(self) -> list[str]:
+        return ["scripted"]
+
+    async def resume_session(self, session_id: str) -> bool:
+        return True
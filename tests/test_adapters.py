@@ -5,9 +5,12 @@ from agent_collab.adapters import (
     AgentAdapter,
     CodexAdapter,
     ClaudeAdapter,
+    TextDelta,
     create_adapter,
 )
 
+from agent_stubs import ScriptedAdapter
+
 
 class TestCodexAdapter:
     """Tests for CodexAdapter."""
@@ -95,3 +98,9 @@ class TestAdapterInterface:
         """Test ClaudeAdapter implements AgentAdapter."""
         adapter = ClaudeAdapter("/project")
         assert isinstance(adapter, AgentAdapter)
+
+    def test_plain_text_defaults(self):
+        """Test adapters without a structured format get working line defaults."""
+        adapter = ScriptedAdapter()
+        assert adapter.parse_events("hello") == [TextDelta("hello\n")]
+        assert adapter.encode_turn("hi") == b"hi\n"
@@ -0,0 +1,164 @@
+"""Tests for the batch runner."""
+import asyncio
+import io
+import json
+import re
+from pathlib import Path
+
+import pytest
+
+from agent_collab.adapters import AgentProcessError
+from agent_collab.batch import BatchJob, BatchRunner, load_jobs
+from agent_collab.config import AgentLimit, Config
+from agent_collab.engine import workflow as workflow_module
+from agent_collab.headless import EXIT_AGENT_ERROR, EXIT_OK
+
+from agent_stubs import ScriptedAdapter
+
+
+class FakeAgent(ScriptedAdapter):
+    """Writes plans and approving reviews where the prompt asks, tracking concurrency."""
+
+    running: dict[str, int] = {}
+    peak: dict[str, int] = {}
+
+    def __init__(self, agent_type: str, working_dir: str):
+        super().__init__(self._write, delay=0.01, chunks=["ok\n"], working_dir=working_dir)
+        self.agent_type = agent_type
+
+    async def _open_stream(self, prompt):
+        running = FakeAgent.running
+        running[self.agent_type] = running.get(self.agent_type, 0) + 1
+        FakeAgent.peak[self.agent_type] = max(FakeAgent.peak.get(self.agent_type, 0), running[self.agent_type])
+        try:
+            async for event in super()._open_stream(prompt):
+                yield event
+        finally:
+            running[self.agent_type] -= 1
+
+    def _write(self, prompt: str) -> None:
+        if "fail" in Path(self.working_dir).name:
+            raise AgentProcessError([self.agent_type], 1, "boom")
+        if match := re.search(r"Write the plan to `([^`]+)`", prompt):
+            Path(match.group(1)).write_text("# Plan\n\n- [ ] Step 1: build\n")
+        if match := re.search(r"Write your review to `([^`]+)`", prompt):
+            Path(match.group(1)).write_text("[APPROVED]\n")
+
+
+@pytest.fixture
+def fake_agents(monkeypatch):
+    FakeAgent.running = {}
+    FakeAgent.peak = {}
+    monkeypatch.setattr(
+        workflow_module,
+        "create_adapter",
+        lambda agent_type, working_dir, **kwargs: FakeAgent(agent_type, working_dir),
+    )
+    return FakeAgent
+
+
+def _jobs(tmp_path: Path, *names: str) -> list[BatchJob]:
+    jobs = []
+    for name in names:
+        (tmp_path / name).mkdir()
+        jobs.append(BatchJob(name, tmp_path / name, f"goal for {name}"))
+    return jobs
+
+
+class TestLoadJobs:
+    """Tests for reading job files."""
+
+    def test_load(self, tmp_path):
+        """Test projects resolve against the file and names are made unique."""
+        (tmp_path / "goal.md").write_text("from a file\n")
+        path = tmp_path / "jobs.jsonl"
+        path.write_text(
+            "# comment\n"
+            '{"project": "repos/a", "goal": "do a"}\n'
+            "\n"
+            '{"project": "other/a", "goal_file": "goal.md", "execute": true}\n'
+            '{"project": "repos/b", "goal": "do b", "name": "bee"}\n'
+        )
+
+        jobs = load_jobs(path)
+
+        assert [job.name for job in jobs] == ["a", "a-2", "bee"]
+        assert jobs[0].project_root == tmp_path / "repos" / "a"
+        assert jobs[1].goal == "from a file"
+        assert jobs[1].execute
+        assert not jobs[0].execute
+
+    def test_invalid(self, tmp_path):
+        """Test bad lines are reported with their line number."""
+        path = tmp_path / "jobs.jsonl"
+        path.write_text('{"project": "a", "goal": "x"}\n{"project": "b"}\n')
+        with pytest.raises(ValueError, match="jobs.jsonl:2"):
+            load_jobs(path)
+
+        path.write_text("not json\n")
+        with pytest.raises(ValueError, match="invalid JSON"):
+            load_jobs(path)
+
+
+class TestBatchRunner:
+    """Tests for BatchRunner."""
+
+    def test_runs_all_jobs_within_limits(self, tmp_path, fake_agents):
+        """Test jobs run concurrently with agent turns capped per agent type."""
+        config = Config()
+        config.batch.max_jobs = 3
+        config.limits = {"claude": AgentLimit(max_concurrent=1), "codex": AgentLimit(max_concurrent=2)}
+        out = io.StringIO()
+        runner = BatchRunner(_jobs(tmp_path, "a", "b", "c", "d"), config, out=out, json_output=True)
+
+        code = asyncio.run(runner.run())
+
+        assert code == 0
+        assert fake_agents.peak == {"codex": 2, "claude": 1}
+        assert all(p.exit_code == EXIT_OK and p.status == "approved" for p in runner.progress)
+        assert (tmp_path / "a" / ".agent-collab" / "run.log").read_text().count("ok\n") == 3
+
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert {"type": "job", "name": "a", "state": "running"}.items() <= records[0].items()
+        assert any(r["type"] == "job" and r["phase"] == "review" for r in records)
+        summary = records[-1]
+        assert summary["type"] == "summary"
+        assert summary["jobs"] == 4
+        assert summary["statuses"] == {"approved": 4}
+        # With one claude slot for four jobs, reviews had to queue
+        assert summary["queue_seconds"] > 0
+        assert summary["agent_seconds"] > 0
+
+    def test_failed_job_doesnt_stop_batch(self, tmp_path, fake_agents):
+        """Test one failing job is reported while the others finish."""
+        out = io.StringIO()
+        runner = BatchRunner(_jobs(tmp_path, "good", "fail"), Config(), out=out)
+
+        code = asyncio.run(runner.run())
+
+        assert code == 1
+        good, failed = runner.progress
+        assert good.exit_code == EXIT_OK
+        assert failed.exit_code == EXIT_AGENT_ERROR
+        assert "boom" in failed.error
+        text = out.getvalue()
+        assert "[2/2 finished, 0 running]" in text
+        assert "2 jobs in" in text
+        assert "fail (" in text
+
+    def test_state_dir(self, tmp_path, fake_agents):
+        """Test a state directory gives each job its own workdir."""
+        (tmp_path / "repo").mkdir()
+        jobs = [
+            BatchJob("one", tmp_path / "repo", "goal one"),
+            BatchJob("two", tmp_path / "repo", "goal two"),
+        ]
+        with pytest.raises(ValueError, match="share workdir"):
+            BatchRunner(jobs, Config())
+
+        runner = BatchRunner(jobs, Config(), state_dir=tmp_path / "state", out=io.StringIO())
+        assert asyncio.run(runner.run()) == 0
+
+        assert (tmp_path / "state" / "one" / "plan.md").exists()
+        assert (tmp_path / "state" / "two" / "state.json").exists()
+        assert not (tmp_path / "repo" / ".agent-collab").exists()
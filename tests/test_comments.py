@@ -0,0 +1,76 @@
+"""Tests for structured review comments."""
+from agent_collab.engine.comments import (
+    Comment,
+    CommentStatus,
+    assign_comment_ids,
+    format_comments,
+    parse_comments,
+)
+
+COMMENTS = """[CHANGES_REQUIRED]
+
+Overall this is close.
+
+- [C1] (critical) [open] Step 2 has no rollback
+  and no error handling.
+- [C2] (minor) [fixed] Typo in step 3
+- [C4] [resolved] Unclear goal
+- [C5] (huge) [pending] Odd severity and status
+"""
+
+
+class TestParseComments:
+    """Tests for parse_comments."""
+
+    def test_fields(self):
+        """Test IDs, severity, status and continuation lines are parsed."""
+        index = parse_comments(COMMENTS)
+        assert [c.id for c in index] == [1, 2, 4, 5]
+        first = index.get(1)
+        assert first.severity == "critical"
+        assert first.status == CommentStatus.OPEN
+        assert first.text == "Step 2 has no rollback and no error handling."
+        assert index.get(4).severity == "major"
+        assert index.get(3) is None
+
+    def test_unknown_values_fall_back(self):
+        """Test unknown severity and status use the defaults."""
+        comment = parse_comments(COMMENTS).get(5)
+        assert comment.severity == "major"
+        assert comment.status == CommentStatus.OPEN
+
+    def test_counts(self):
+        """Test open count and max ID."""
+        index = parse_comments(COMMENTS)
+        assert index.open_count == 3
+        assert index.max_id == 5
+        assert [c.id for c in index.with_status(CommentStatus.FIXED)] == [2]
+        assert parse_comments("[APPROVED]\n").max_id == 0
+
+    def test_duplicate_ids_keep_first(self):
+        """Test a repeated ID doesn't replace the first comment."""
+        index = parse_comments("- [C1] [open] first\n- [C1] [resolved] second\n")
+        assert len(index) == 1
+        assert index.get(1).text == "first"
+
+
+class TestAssignCommentIds:
+    """Tests for assign_comment_ids."""
+
+    def test_numbers_bare_items(self):
+        """Test free-form top-level items get new IDs and others are kept."""
+        content = "[CHANGES_REQUIRED]\n\n- [C1] [open] kept\n- new one\n  - nested detail\n2. another\n"
+        numbered = assign_comment_ids(content, 7)
+        assert numbered == (
+            "[CHANGES_REQUIRED]\n\n- [C1] [open] kept\n"
+            "- [C7] (major) [open] new one\n  - nested detail\n"
+            "- [C8] (major) [open] another\n"
+        )
+        assert assign_comment_ids(numbered, 9) == numbered
+
+    def test_format_comments(self):
+        """Test comments render back to the list format."""
+        comment = Comment(3, "minor", CommentStatus.FIXED, "done")
+        assert format_comments([comment]) == "- [C3] (minor) [fixed] done"
+        assert format_comments([]) == "(none)"
+        assert parse_comments(comment.render()).get(3) == comment
@@ -3,6 +3,7 @@ from pathlib import Path
 import tempfile
 
 from agent_collab.config import (
+    AgentLimit,
     Config,
     RolesConfig,
     WorkflowConfig,
@@ -65,6 +66,7 @@ def test_config_path_helpers():
     assert config.get_plan_path(project_root) == Path("/project/.agent-collab/plan.md")
     assert config.get_comments_path(project_root) == Path("/project/.agent-collab/comments.md")
     assert config.get_state_path(project_root) == Path("/project/.agent-collab/state.json")
+    assert config.get_transcript_path(project_root) == Path("/project/.agent-collab/conversation.log")
 
 
 def test_partial_config_uses_defaults():
@@ -81,3 +83,47 @@ planner = "claude"
     assert config.roles.planner == "claude"
     assert config.roles.reviewer == "claude"  # default
     assert config.workflow.max_iterations == 5  # default
+
+
+def test_multiple_reviewers():
+    """Test reviewers list overrides the single reviewer."""
+    toml_content = """
+[roles]
+reviewer = "claude"
+reviewers = ["claude", "codex"]
+
+[workflow]
+review_policy = "majority"
+"""
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".toml", delete=False) as f:
+        f.write(toml_content)
+        f.flush()
+        config = load_config(Path(f.name))
+
+    assert config.roles.get_reviewers() == ["claude", "codex"]
+    assert config.workflow.review_policy == "majority"
+    assert Config().roles.get_reviewers() == ["claude"]
+    assert config.get_reviewer_comments_path(Path("/project"), 1) == Path(
+        "/project/.agent-collab/comments.2.md"
+    )
+
+
+def test_agent_limits():
+    """Test per-agent scheduling limits, merged over the defaults."""
+    toml_content = """
+[batch]
+max_jobs = 8
+
+[limits.claude]
+max_concurrent = 3
+requests_per_minute = 30
+burst = 5
+"""
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".toml", delete=False) as f:
+        f.write(toml_content)
+        f.flush()
+        config = load_config(Path(f.name))
+
+    assert config.batch.max_jobs == 8
+    assert config.limits["claude"] == AgentLimit(max_concurrent=3, requests_per_minute=30, burst=5)
+    assert config.limits["codex"] == AgentLimit(max_concurrent=4)
@@ -0,0 +1,92 @@
+"""Tests for review-loop stall detection."""
+import hashlib
+
+from agent_collab.engine.convergence import (
+    IterationRecord,
+    StallReason,
+    detect_stall,
+    plan_change,
+    same_issue,
+)
+
+PLAN = "".join(f"- [ ] Step {i}: do part {i}\n" for i in range(1, 21))
+
+
+def _record(iteration: int, plan: str, comments: str = "[CHANGES_REQUIRED]\n") -> IterationRecord:
+    digest = hashlib.sha256(plan.encode()).hexdigest()
+    return IterationRecord(iteration, digest, plan, comments)
+
+
+class TestHelpers:
+    """Tests for the similarity helpers."""
+
+    def test_plan_change(self):
+        """Test plan change is the fraction of changed lines."""
+        assert plan_change(PLAN, PLAN) == 0.0
+        assert 0 < plan_change(PLAN, PLAN.replace("part 3", "part three")) < 0.1
+        assert plan_change("a\nb\n", "c\nd\n") == 1.0
+
+    def test_same_issue(self):
+        """Test near-duplicate comment texts match and different ones don't."""
+        assert same_issue("Step 2 has no rollback plan.", "step 2 has no rollback plan")
+        assert not same_issue("Step 2 has no rollback plan", "Step 5 needs more tests")
+
+
+class TestDetectStall:
+    """Tests for detect_stall."""
+
+    def test_progressing_loop(self):
+        """Test substantial revisions with new comments are not a stall."""
+        records = [
+            _record(1, PLAN, "- [C1] [open] Step 2 is vague\n"),
+            _record(2, PLAN + "- [ ] Step 21: test everything\n- [ ] Step 22: ship\n",
+                    "- [C1] [resolved] Step 2 is vague\n- [C2] [open] Add monitoring\n"),
+            _record(3, PLAN.replace("do part", "carefully do part"),
+                    "- [C1] [resolved] Step 2 is vague\n- [C2] [resolved] Add monitoring\n"),
+        ]
+        assert detect_stall(records) is None
+        assert detect_stall(records[:1]) is None
+
+    def test_plan_oscillation(self):
+        """Test returning to an earlier plan version is an oscillation."""
+        other = PLAN.replace("Step 1: do part 1", "Step 1: do it differently")
+        stall = detect_stall([_record(1, PLAN), _record(2, other), _record(3, PLAN)])
+        assert stall is not None
+        assert stall.reason == StallReason.OSCILLATION
+        assert "iteration 1" in stall.detail
+
+    def test_reopened_comment(self):
+        """Test a resolved issue raised again is an oscillation."""
+        records = [
+            _record(1, PLAN, "- [C1] [open] Step 2 has no rollback plan\n"),
+            _record(2, PLAN + "x\n" * 5, "- [C1] [resolved] Step 2 has no rollback plan\n"),
+            _record(3, PLAN + "y\n" * 5, "- [C1] [resolved] Step 2 has no rollback plan\n"
+                                        "- [C4] [open] Step 2 has no rollback plan.\n"),
+        ]
+        stall = detect_stall(records)
+        assert stall is not None
+        assert stall.reason == StallReason.OSCILLATION
+        assert "C4 reopens C1" in stall.detail
+
+    def test_repeated_comments(self):
+        """Test the same unresolved issues for patience reviews is a stall."""
+        comments = "- [C1] [open] Step 2 has no rollback plan\n- [C2] [fixed] Add load tests for the API\n"
+        renumbered = "- [C3] [open] Step 2 has no rollback plan!\n- [C4] [open] add load tests for the API\n"
+        plans = [PLAN, PLAN + "- [ ] Step 21: a\n- [ ] Step 22: b\n", PLAN + "- [ ] Step 23: c\n- [ ] Step 24: d\n"]
+        records = [_record(i + 1, plan, c) for i, (plan, c) in enumerate(zip(plans, [comments, comments, renumbered]))]
+        stall = detect_stall(records, patience=2)
+        assert stall is not None
+        assert stall.reason == StallReason.REPEATED_COMMENTS
+        assert detect_stall(records[:2], patience=2) is None
+
+    def test_small_changes(self):
+        """Test revisions below min_plan_change for patience rounds are a stall."""
+        records = [
+            _record(1, PLAN, "- [C1] [open] one\n"),
+            _record(2, PLAN + "tweak\n", "- [C2] [open] two things\n"),
+            _record(3, PLAN + "tweak again\n", "- [C3] [open] three more things\n"),
+        ]
+        stall = detect_stall(records, min_plan_change=0.1, patience=2)
+        assert stall is not None
+        assert stall.reason == StallReason.SMALL_CHANGES
+        assert detect_stall(records, min_plan_change=0.01, patience=2) is None
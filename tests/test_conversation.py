@@ -0,0 +1,91 @@
+"""Tests for the conversation log."""
+import asyncio
+import tempfile
+from pathlib import Path
+
+import pytest
+from textual.app import App, ComposeResult
+
+from agent_collab.tui.conversation import ConversationBuffer, ConversationLog
+
+
+class TestConversationBuffer:
+    """Tests for ConversationBuffer."""
+
+    def test_append_continues_last_line(self):
+        """Test chunks split mid-line join into one line."""
+        buffer = ConversationBuffer()
+        buffer.append("Hel")
+        buffer.append("lo\nWor")
+        buffer.append("ld\n")
+        assert list(buffer.lines) == ["Hello", "World", ""]
+        assert buffer.line_count == 2
+
+    def test_append_returns_changed_range(self):
+        """Test the changed range covers only the touched lines."""
+        buffer = ConversationBuffer()
+        buffer.append("a\nb\n")
+        assert buffer.append("c") == (2, 3)
+        assert buffer.append("d\ne") == (2, 4)
+
+    def test_ring_buffer_bounded(self):
+        """Test memory holds at most max_lines lines."""
+        buffer = ConversationBuffer(max_lines=3)
+        buffer.append("".join(f"line {i}\n" for i in range(10)))
+        assert len(buffer.lines) == 3
+        assert buffer.first_line == 8
+        assert buffer.line_count == 10
+        assert buffer.get_line(8) == "line 8"
+        assert buffer.get_line(2) is None
+
+    def test_spill_and_read_back(self):
+        """Test evicted lines are written to disk and can be paged back."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            spill = Path(tmpdir) / "conversation.log"
+            buffer = ConversationBuffer(max_lines=3, spill_path=spill)
+            buffer.append("".join(f"line {i} ✓\n" for i in range(10)))
+
+            assert buffer.read_spilled(0, 3) == ["line 0 ✓", "line 1 ✓", "line 2 ✓"]
+            assert buffer.read_spilled(6, 5) == ["line 6 ✓", "line 7 ✓"]
+            assert buffer.read_spilled(8, 1) == []
+            assert spill.read_text().startswith("line 0 ✓\n")
+            buffer.close()
+
+    def test_invalid_max_lines(self):
+        """Test max_lines must be positive."""
+        with pytest.raises(ValueError, match="max_lines"):
+            ConversationBuffer(max_lines=0)
+
+
+class _LogApp(App):
+    def __init__(self, log: ConversationLog) -> None:
+        super().__init__()
+        self.log_widget = log
+
+    def compose(self) -> ComposeResult:
+        yield self.log_widget
+
+
+class TestConversationLog:
+    """Tests for the ConversationLog widget."""
+
+    def test_write_and_page_back(self):
+        """Test writes follow the end and spilled lines render from disk."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log = ConversationLog(max_lines=20, spill_path=Path(tmpdir) / "conversation.log")
+
+            async def run():
+                app = _LogApp(log)
+                async with app.run_test(size=(40, 10)) as pilot:
+                    for i in range(100):
+                        log.write(f"line {i}\n")
+                    await pilot.pause()
+                    assert log.virtual_size.height == 100
+                    assert log.is_vertical_scroll_end
+
+                    log.scroll_to(y=0, animate=False)
+                    await pilot.pause()
+                    assert log.render_line(0).text.rstrip() == "line 0"
+                    assert log.render_line(3).text.rstrip() == "line 3"
+
+            asyncio.run(run())
@@ -0,0 +1,127 @@
+"""Tests for live refresh of workflow files."""
+import asyncio
+import os
+import tempfile
+from pathlib import Path
+
+from textual.app import App, ComposeResult
+from textual.widgets import TextArea
+
+from agent_collab.tui.file_watch import WatchedFile, apply_minimal_edit, watch_files
+
+
+class TestWatchedFile:
+    """Tests for WatchedFile."""
+
+    def test_reports_only_content_changes(self):
+        """Test unchanged files and same-content rewrites are skipped."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "plan.md"
+            watched = WatchedFile(path)
+            assert watched.read_if_changed() == ""
+            assert watched.read_if_changed() is None
+
+            path.write_text("v1")
+            assert watched.read_if_changed() == "v1"
+            assert watched.read_if_changed() is None
+
+            # Rewritten with the same content: new mtime, same hash
+            path.write_text("v1")
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            assert watched.read_if_changed() is None
+
+            path.write_text("v2")
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000))
+            assert watched.read_if_changed() == "v2"
+
+
+class _EditorApp(App):
+    def compose(self) -> ComposeResult:
+        yield TextArea(id="text")
+
+
+def _run_edits(initial: str, updates: list[str]) -> list[tuple[str, tuple, tuple]]:
+    """Apply updates to a TextArea, returning its text and edit ranges."""
+    results = []
+
+    async def run():
+        app = _EditorApp()
+        async with app.run_test():
+            text_area = app.query_one("#text", TextArea)
+            text_area.load_text(initial)
+            calls = []
+            original = text_area.replace
+
+            def spy(insert, start, end, **kwargs):
+                calls.append((start, end))
+                return original(insert, start, end, **kwargs)
+
+            text_area.replace = spy
+            for update in updates:
+                calls.clear()
+                apply_minimal_edit(text_area, update)
+                results.append((text_area.text, *(calls[0] if calls else (None, None))))
+
+    asyncio.run(run())
+    return results
+
+
+class TestApplyMinimalEdit:
+    """Tests for apply_minimal_edit."""
+
+    def test_append_touches_only_the_end(self):
+        """Test appending lines edits from the end of the old text."""
+        lines = "".join(f"line {i}\n" for i in range(1000))
+        [(text, start, end)] = _run_edits(lines, [lines + "line 1000\n"])
+        assert text == lines + "line 1000\n"
+        assert start == (1000, 0)
+        assert end == (1000, 0)
+
+    def test_middle_edit(self):
+        """Test changing one line replaces only that line."""
+        old = "a\nb\nc\nd\n"
+        [(text, start, end)] = _run_edits(old, ["a\nB\nc\nd\n"])
+        assert text == "a\nB\nc\nd\n"
+        assert (start, end) == ((1, 0), (2, 0))
+
+    def test_various_updates(self):
+        """Test inserts, deletions, replacement and unchanged text."""
+        updates = [
+            "a\nb\n",
+            "a\nx\ny\nb\n",
+            "a\nb",
+            "",
+            "fresh\ncontent",
+            "fresh\ncontent",
+        ]
+        results = _run_edits("a\nb\nc\n", updates)
+        assert [text for text, _, _ in results] == updates
+        assert results[-1][1] is None
+
+
+class TestWatchFiles:
+    """Tests for watch_files."""
+
+    def test_yields_changed_watched_file(self):
+        """Test writes to watched files are reported and others ignored."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            plan = Path(tmpdir) / "plan.md"
+            other = Path(tmpdir) / "state.json"
+
+            async def run():
+                changes = watch_files([plan], debounce=0.05)
+
+                async def write_later():
+                    await asyncio.sleep(0.3)
+                    other.write_text("{}")
+                    plan.write_text("new plan")
+
+                writer = asyncio.create_task(write_later())
+                changed = await asyncio.wait_for(changes.__anext__(), 10)
+                await writer
+                await changes.aclose()
+                return changed
+
+            assert asyncio.run(run()) == {plan.resolve()}
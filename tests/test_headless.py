@@ -0,0 +1,219 @@
+"""Tests for the headless runner."""
+import asyncio
+import io
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from agent_collab.adapters import AgentProcessError, ClaudeAdapter
+from agent_collab.config import Config
+from agent_collab.engine import Phase
+from agent_collab.headless import (
+    EXIT_AGENT_ERROR,
+    EXIT_EXECUTION_FAILED,
+    EXIT_NOT_APPROVED,
+    EXIT_OK,
+    EXIT_USAGE,
+    HeadlessRunner,
+)
+
+from agent_stubs import ScriptedAdapter
+
+
+def _records(out: io.StringIO) -> list[dict]:
+    return [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+class TestHeadlessRunner:
+    """Tests for HeadlessRunner."""
+
+    def _runner(self, tmpdir: str, approve_on: int = 1, **workflow) -> tuple[HeadlessRunner, io.StringIO]:
+        project_root = Path(tmpdir)
+        config = Config()
+        for key, value in workflow.items():
+            setattr(config.workflow, key, value)
+        config.get_workdir(project_root).mkdir(parents=True, exist_ok=True)
+        plan_path = config.get_plan_path(project_root)
+        comments_path = config.get_comments_path(project_root)
+
+        def plan(prompt):
+            plan_path.write_text("# Plan\n\n- [ ] Step 1: build\n")
+
+        reviews = []
+
+        def review(prompt):
+            reviews.append(prompt)
+            verdict = "[APPROVED]" if len(reviews) >= approve_on else "[CHANGES_REQUIRED]"
+            comments_path.write_text(f"{verdict}\n\n- feedback {len(reviews)}\n")
+
+        out = io.StringIO()
+        runner = HeadlessRunner(project_root, config, out=out, json_output=True)
+        runner.workflow.planner = ScriptedAdapter(plan, chunks=["ok\n"])
+        runner.workflow.reviewer = ScriptedAdapter(review, chunks=["ok\n"])
+        return runner, out
+
+    def test_goal_to_approval(self):
+        """Test a new goal is refined, planned and reviewed until approved."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            runner, out = self._runner(tmpdir, approve_on=2)
+
+            code = asyncio.run(runner.run("build a thing"))
+
+            assert code == EXIT_OK
+            assert "User: build a thing" in runner.workflow.planner.prompts[0]
+            records = _records(out)
+            assert {"type": "output", "text": "ok\n"} in records
+            phases = [r["phase"] for r in records if r["type"] == "phase"]
+            assert phases[0] == "refine_goal"
+            assert phases[-1] == "approved"
+            assert records[-1]["type"] == "result"
+            assert records[-1]["status"] == "approved"
+            assert records[-1]["iteration"] == 2
+
+    def test_not_approved(self):
+        """Test the exit code when the loop ends without approval."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            runner, out = self._runner(tmpdir, approve_on=99, max_iterations=2, stall_detection=False)
+
+            code = asyncio.run(runner.run("build a thing"))
+
+            assert code == EXIT_NOT_APPROVED
+            result = _records(out)[-1]
+            assert result["status"] == "max_iterations"
+            assert result["open_comments"] == 1
+
+    def test_requires_goal(self):
+        """Test a new workflow without a goal is a usage error."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            runner, out = self._runner(tmpdir)
+
+            code = asyncio.run(runner.run(None))
+
+            assert code == EXIT_USAGE
+            assert _records(out)[-1]["status"] == "no_goal"
+            assert runner.workflow.planner.prompts == []
+
+    def test_resumes_review(self):
+        """Test a workflow in the review loop resumes without a goal."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            runner, out = self._runner(tmpdir)
+            runner.workflow.state.phase = Phase.REVIEW
+
+            code = asyncio.run(runner.run(None))
+
+            assert code == EXIT_OK
+            assert runner.workflow.state.phase == Phase.APPROVED
+            assert runner.workflow.planner.prompts == []
+
+    def test_retries_unfinished_plan(self):
+        """Test a run that stopped while writing the plan writes it again."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            runner, out = self._runner(tmpdir)
+            runner.workflow.state.phase = Phase.WRITE_PLAN
+
+            code = asyncio.run(runner.run(None))
+
+            assert code == EXIT_OK
+            assert "Write the plan to" in runner.workflow.planner.prompts[0]
+            assert runner.workflow.state.phase == Phase.APPROVED
+
+    def test_unfinished_execution_is_not_success(self):
+        """Test a partly executed plan isn't reported as approved without --execute."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            runner, out = self._runner(tmpdir)
+            runner.workflow.state.phase = Phase.EXECUTE
+
+            code = asyncio.run(runner.run(None))
+
+            assert code == EXIT_EXECUTION_FAILED
+            assert _records(out)[-1]["status"] == "execution_incomplete"
+
+    def test_execute(self):
+        """Test executing the approved plan, step by step."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            runner, out = self._runner(tmpdir)
+            plan_path = runner.workflow.config.get_plan_path(Path(tmpdir))
+            plan_path.write_text("- [ ] Step 1: build\n- [ ] Step 2: test\n")
+            runner.workflow.state.phase = Phase.APPROVED
+            runner.workflow.planner = ScriptedAdapter(
+                lambda prompt: plan_path.write_text(plan_path.read_text().replace("- [ ]", "- [x]", 1))
+            )
+
+            code = asyncio.run(runner.run(None, execute=True))
+
+            assert code == EXIT_OK
+            records = _records(out)
+            assert [r["title"] for r in records if r["type"] == "step"] == ["build", "test"]
+            assert records[-1]["status"] == "done"
+
+    def test_execute_incomplete(self):
+        """Test steps left unchecked after execution fail the run."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            runner, out = self._runner(tmpdir)
+            runner.workflow.config.get_plan_path(Path(tmpdir)).write_text("- [ ] Step 1: build\n")
+            runner.workflow.state.phase = Phase.APPROVED
+
+            code = asyncio.run(runner.run(None, execute=True))
+
+            assert code == EXIT_EXECUTION_FAILED
+            assert _records(out)[-1]["incomplete_steps"] == [1]
+
+    def test_agent_error(self):
+        """Test a failed agent process is reported with its own exit code."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            runner, out = self._runner(tmpdir)
+
+            def fail(prompt):
+                raise AgentProcessError(["planner-cli"], 1, "boom")
+
+            runner.workflow.planner = ScriptedAdapter(fail)
+
+            code = asyncio.run(runner.run("build a thing"))
+
+            assert code == EXIT_AGENT_ERROR
+            assert "boom" in _records(out)[-1]["error"]
+
+    def test_missing_cli(self):
+        """Test an agent CLI that can't be started is an agent error, not a crash."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            runner, out = self._runner(tmpdir)
+            missing = str(Path(tmpdir) / "no-such-cli")
+
+            class MissingAdapter(ClaudeAdapter):
+                def get_cli_command(self) -> list[str]:
+                    return [missing]
+
+            runner.workflow.planner = MissingAdapter(tmpdir)
+
+            code = asyncio.run(runner.run("build a thing"))
+
+            assert code == EXIT_AGENT_ERROR
+            assert "could not be started" in _records(out)[-1]["error"]
+
+    def test_plain_text_output(self):
+        """Test plain text mode streams agent output with status lines."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            runner, out = self._runner(tmpdir)
+            runner.json_output = False
+
+            asyncio.run(runner.run("build a thing"))
+
+            text = out.getvalue()
+            assert "\nok\n" in text
+            assert "[result: status=approved exit_code=0" in text
+
+
+class TestMain:
+    """Tests for the CLI entry point."""
+
+    def test_textual_imported_lazily(self):
+        """Test importing the CLI and headless runner doesn't load Textual."""
+        code = (
+            "import sys, agent_collab.main, agent_collab.headless; "
+            "sys.exit('textual' in sys.modules)"
+        )
+        src = Path(__file__).parent.parent / "src"
+        result = subprocess.run([sys.executable, "-c", code], env={"PYTHONPATH": str(src)})
+        assert result.returncode == 0
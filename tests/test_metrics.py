@@ -0,0 +1,85 @@
+"""Tests for metrics histograms and export."""
+import json
+import math
+
+import pytest
+
+from agent_collab.telemetry import Histogram, MetricsRegistry
+
+
+class TestHistogram:
+    """Tests for Histogram."""
+
+    def test_observe(self):
+        """Test values land in the right buckets and update the summary."""
+        histogram = Histogram((1.0, 2.0))
+        for value in (0.5, 1.0, 1.5, 3.0):
+            histogram.observe(value)
+        assert histogram.counts == [2, 1, 1]
+        assert histogram.count == 4
+        assert histogram.sum == 6.0
+        assert (histogram.min, histogram.max) == (0.5, 3.0)
+
+    def test_quantile(self):
+        """Test quantiles are interpolated within buckets and clamped to observed values."""
+        histogram = Histogram((1.0, 2.0, 4.0))
+        assert histogram.quantile(0.5) == 0.0
+        for _ in range(10):
+            histogram.observe(1.5)
+        assert histogram.quantile(0.5) == pytest.approx(1.5)
+        histogram.observe(100.0)
+        assert histogram.quantile(1.0) == 100.0
+
+    def test_to_dict(self):
+        """Test JSON summary fields."""
+        histogram = Histogram((1.0,))
+        histogram.observe(2.0)
+        data = histogram.to_dict()
+        assert data["count"] == 1
+        assert data["buckets"] == {"1.0": 0, "+Inf": 1}
+        assert Histogram().to_dict()["min"] is None
+
+
+class TestMetricsRegistry:
+    """Tests for MetricsRegistry."""
+
+    def test_series_by_labels(self):
+        """Test each label set is its own series, regardless of label order."""
+        metrics = MetricsRegistry()
+        metrics.observe("turn_seconds", 1.0, agent="planner", phase="review")
+        metrics.observe("turn_seconds", 2.0, phase="review", agent="planner")
+        metrics.observe("turn_seconds", 3.0, agent="reviewer", phase="review")
+        assert metrics.histogram("turn_seconds", agent="planner", phase="review").count == 2
+        assert len(metrics.to_dict()["turn_seconds"]) == 2
+
+    def test_time(self):
+        """Test the timer records the block's duration."""
+        metrics = MetricsRegistry()
+        with metrics.time("save_seconds", backend="journal"):
+            pass
+        histogram = metrics.histogram("save_seconds", backend="journal")
+        assert histogram.count == 1
+        assert 0 <= histogram.sum < 1
+
+    def test_prometheus_format(self):
+        """Test cumulative buckets, sum and count in text exposition format."""
+        metrics = MetricsRegistry()
+        metrics.observe_size("stream_bytes", 50, agent='a"b')
+        metrics.observe_size("stream_bytes", 5000, agent='a"b')
+        text = metrics.to_prometheus()
+        assert "# TYPE agent_collab_stream_bytes histogram" in text
+        assert 'agent_collab_stream_bytes_bucket{agent="a\\"b",le="100"} 1' in text
+        assert 'agent_collab_stream_bytes_bucket{agent="a\\"b",le="+Inf"} 2' in text
+        assert 'agent_collab_stream_bytes_sum{agent="a\\"b"} 5050' in text
+        assert 'agent_collab_stream_bytes_count{agent="a\\"b"} 2' in text
+        assert MetricsRegistry().to_prometheus() == ""
+
+    def test_export(self, tmp_path):
+        """Test JSON and Prometheus files are written."""
+        metrics = MetricsRegistry()
+        metrics.observe("turn_seconds", 0.2, agent="planner")
+        metrics.export(tmp_path / "m" / "metrics.json", tmp_path / "m" / "metrics.prom")
+        data = json.loads((tmp_path / "m" / "metrics.json").read_text())
+        assert data["turn_seconds"][0]["labels"] == {"agent": "planner"}
+        assert math.isclose(data["turn_seconds"][0]["sum"], 0.2)
+        assert "agent_collab_turn_seconds_count" in (tmp_path / "m" / "metrics.prom").read_text()
@@ -0,0 +1,98 @@
+"""Tests for rate-limited UI output."""
+import asyncio
+import tempfile
+from pathlib import Path
+
+from agent_collab.config import Config
+from agent_collab.engine import WorkflowController
+from agent_collab.tui.output import OutputCoalescer
+
+from agent_stubs import ScriptedAdapter
+
+
+class TestOutputCoalescer:
+    """Tests for OutputCoalescer."""
+
+    def test_chunks_coalesce_into_one_frame(self):
+        """Test chunks written before a frame are delivered together."""
+        frames = []
+
+        async def run():
+            out = OutputCoalescer(frames.append, interval=0.01)
+            for chunk in ("a", "b", "c"):
+                assert out.write(chunk) is None
+            assert frames == []
+            await asyncio.sleep(0.05)
+
+        asyncio.run(run())
+        assert frames == ["abc"]
+
+    def test_frames_rate_limited(self):
+        """Test the sink is called at most once per interval."""
+        frames = []
+
+        async def run():
+            out = OutputCoalescer(frames.append, interval=0.05)
+            for _ in range(20):
+                out.write("x")
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.1)
+
+        asyncio.run(run())
+        assert "".join(frames) == "x" * 20
+        assert 2 <= len(frames) <= 6
+
+    def test_backpressure(self):
+        """Test writers over max_pending get a future resolved after delivery."""
+        frames = []
+
+        async def run():
+            out = OutputCoalescer(frames.append, interval=0.01, max_pending=4)
+            assert out.write("abc") is None
+            waiter = out.write("def")
+            assert waiter is not None
+            assert out.write("g") is waiter
+            await waiter
+            assert frames == ["abcdefg"]
+            assert out.pending == 0
+
+        asyncio.run(run())
+
+    def test_flush(self):
+        """Test flush delivers immediately and cancels the timer."""
+        frames = []
+
+        async def run():
+            out = OutputCoalescer(frames.append, interval=10)
+            out.write("now")
+            out.flush()
+            assert frames == ["now"]
+
+        asyncio.run(run())
+
+    def test_stream_bounded_by_backpressure(self):
+        """Test a flooding agent never gets far ahead of delivered output."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project_root = Path(tmpdir)
+            config = Config()
+            config.get_workdir(project_root).mkdir(parents=True, exist_ok=True)
+            peak = []
+
+            async def run():
+                out = OutputCoalescer(lambda text: None, interval=0.005, max_pending=1000)
+
+                def on_output(text):
+                    waiter = out.write(text)
+                    peak.append(out.pending)
+                    return waiter
+
+                controller = WorkflowController(project_root, config, on_output=on_output)
+                text = await controller._stream_agent(ScriptedAdapter(chunks=["x" * 100] * 200), "go")
+                out.flush()
+                return text, out.flush_count
+
+            text, flushes = asyncio.run(run())
+
+            assert len(text) == 20000
+            assert max(peak) <= 1100
+            assert flushes >= 18
@@ -0,0 +1,196 @@
+"""Tests for parallel plan execution in git worktrees."""
+import asyncio
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from agent_collab.engine import (
+    ParallelExecutor,
+    StepStatus,
+    dependency_order,
+    parse_plan,
+)
+
+needs_git = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+def _init_repo(path: Path) -> None:
+    """Create a git repository with one commit."""
+    for args in (
+        ["init", "-q", "-b", "main"],
+        ["config", "user.name", "Test"],
+        ["config", "user.email", "test@example.com"],
+    ):
+        subprocess.run(["git", *args], cwd=path, check=True)
+    (path / "README").write_text("base\n")
+    subprocess.run(["git", "add", "README"], cwd=path, check=True)
+    subprocess.run(["git", "commit", "-q", "-m", "init"], cwd=path, check=True)
+
+
+class TestDependencyOrder:
+    """Tests for dependency_order."""
+
+    def test_orders_after_dependencies(self):
+        """Test steps come after the steps they depend on."""
+        index = parse_plan(
+            "- [ ] Step 1: a (depends on step 3)\n"
+            "- [ ] Step 2: b\n"
+            "- [ ] Step 3: c\n"
+        )
+        assert [s.number for s in dependency_order(index.pending())] == [2, 3, 1]
+
+    def test_done_dependencies_satisfied(self):
+        """Test dependencies on finished steps are ignored."""
+        index = parse_plan("- [x] Step 1: a\n- [ ] Step 2: b (depends on step 1)\n")
+        assert [s.number for s in dependency_order(index.pending())] == [2]
+
+    def test_cycle_raises(self):
+        """Test cyclic dependencies are rejected."""
+        index = parse_plan(
+            "- [ ] Step 1: a (depends on step 2)\n"
+            "- [ ] Step 2: b (depends on step 1)\n"
+        )
+        with pytest.raises(ValueError, match="cycle"):
+            dependency_order(index.pending())
+
+
+@needs_git
+class TestParallelExecutor:
+    """Tests for ParallelExecutor."""
+
+    def test_independent_steps_run_concurrently(self):
+        """Test independent steps overlap and all get merged."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            repo = Path(tmpdir)
+            _init_repo(repo)
+            index = parse_plan("- [ ] Step 1: a\n- [ ] Step 2: b\n- [ ] Step 3: c\n")
+            active = []
+            peak = []
+
+            async def run_step(step, worktree):
+                active.append(step.number)
+                peak.append(len(active))
+                await asyncio.sleep(0.3)
+                (worktree / f"file{step.number}.txt").write_text(f"{step.number}\n")
+                active.remove(step.number)
+
+            outcomes = asyncio.run(ParallelExecutor(repo, run_step, max_parallel=3).run(index))
+
+            assert [o.status for o in outcomes] == [StepStatus.MERGED] * 3
+            assert max(peak) == 3
+            for n in (1, 2, 3):
+                assert (repo / f"file{n}.txt").read_text() == f"{n}\n"
+
+    def test_max_parallel_limits_concurrency(self):
+        """Test no more than max_parallel steps run at once."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            repo = Path(tmpdir)
+            _init_repo(repo)
+            index = parse_plan("- [ ] a\n- [ ] b\n- [ ] c\n")
+            active = []
+            peak = []
+
+            async def run_step(step, worktree):
+                active.append(step.number)
+                peak.append(len(active))
+                await asyncio.sleep(0.3)
+                active.remove(step.number)
+
+            outcomes = asyncio.run(ParallelExecutor(repo, run_step, max_parallel=2).run(index))
+
+            assert max(peak) == 2
+            assert [o.status for o in outcomes] == [StepStatus.NO_CHANGES] * 3
+
+    def test_dependent_step_sees_merged_changes(self):
+        """Test a step starts from a base that includes its dependencies."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            repo = Path(tmpdir)
+            _init_repo(repo)
+            index = parse_plan("- [ ] Step 1: write\n- [ ] Step 2: extend (depends on step 1)\n")
+            seen = {}
+
+            async def run_step(step, worktree):
+                if step.number == 1:
+                    (worktree / "data.txt").write_text("one\n")
+                else:
+                    seen[2] = (worktree / "data.txt").read_text()
+                    (worktree / "data.txt").write_text("one\ntwo\n")
+
+            merged = []
+            executor = ParallelExecutor(repo, run_step, on_merged=lambda s: merged.append(s.number))
+            asyncio.run(executor.run(index))
+
+            assert seen[2] == "one\n"
+            assert merged == [1, 2]
+            assert (repo / "data.txt").read_text() == "one\ntwo\n"
+
+    def test_conflict_reported_and_dependents_skipped(self):
+        """Test a conflicting merge is aborted, reported and blocks dependents."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            repo = Path(tmpdir)
+            _init_repo(repo)
+            index = parse_plan(
+                "- [ ] Step 1: first\n"
+                "- [ ] Step 2: second\n"
+                "- [ ] Step 3: third (depends on step 2)\n"
+            )
+
+            async def run_step(step, worktree):
+                # Step 2 finishes last, so it is the one that conflicts
+                await asyncio.sleep(0.1 if step.number == 2 else 0)
+                (worktree / "README").write_text(f"changed by {step.number}\n")
+
+            outcomes = asyncio.run(ParallelExecutor(repo, run_step).run(index))
+            by_number = {o.number: o for o in outcomes}
+
+            assert by_number[1].status == StepStatus.MERGED
+            assert by_number[2].status == StepStatus.CONFLICT
+            assert by_number[2].conflicts == ["README"]
+            assert by_number[3].status == StepStatus.SKIPPED
+            assert (repo / "README").read_text() == "changed by 1\n"
+            # Conflicting branch is kept for manual resolution
+            branches = subprocess.run(
+                ["git", "branch", "--list", by_number[2].branch],
+                cwd=repo, capture_output=True, text=True, check=True,
+            ).stdout
+            assert by_number[2].branch in branches
+
+            # A second run uses its own branches, leaving the kept one untouched
+            kept = subprocess.run(
+                ["git", "rev-parse", by_number[2].branch],
+                cwd=repo, capture_output=True, text=True, check=True,
+            ).stdout
+            rerun = asyncio.run(ParallelExecutor(repo, run_step).run(parse_plan("- [ ] Step 2: second\n")))
+            assert rerun[0].branch != by_number[2].branch
+            assert subprocess.run(
+                ["git", "rev-parse", by_number[2].branch],
+                cwd=repo, capture_output=True, text=True, check=True,
+            ).stdout == kept
+
+    def test_failed_step(self):
+        """Test an exception in a step marks it failed and skips dependents."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            repo = Path(tmpdir)
+            _init_repo(repo)
+            index = parse_plan("- [ ] Step 1: boom\n- [ ] Step 2: after (depends on step 1)\n")
+
+            async def run_step(step, worktree):
+                raise RuntimeError("agent crashed")
+
+            outcomes = asyncio.run(ParallelExecutor(repo, run_step).run(index))
+
+            assert outcomes[0].status == StepStatus.FAILED
+            assert "agent crashed" in outcomes[0].error
+            assert outcomes[1].status == StepStatus.SKIPPED
+
+    def test_requires_git_repo(self):
+        """Test a non-repository project is rejected."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            async def run_step(step, worktree):
+                pass
+
+            with pytest.raises(ValueError, match="git repository"):
+                asyncio.run(ParallelExecutor(Path(tmpdir), run_step).run(parse_plan("- [ ] a\n")))
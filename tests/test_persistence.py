@@ -1,15 +1,43 @@
 """Tests for state persistence."""
+import json
 import tempfile
 from pathlib import Path
 
+import pytest
+
 from agent_collab.engine import Phase
+from agent_collab.fileio import write_atomic
 from agent_collab.persistence import (
     WorkflowState,
     save_state,
     load_state,
     delete_state,
     state_exists,
+    StateJournal,
+    ObjectStore,
 )
+from agent_collab.persistence.state import history_path, journal_path
+
+
+class TestWriteAtomic:
+    """Tests for write_atomic."""
+
+    def test_replaces_content(self, tmp_path):
+        """Test text and bytes replace the file, creating its directory."""
+        path = tmp_path / "sub" / "file.txt"
+        write_atomic(path, "first")
+        write_atomic(path, b"second", fsync=True)
+        assert path.read_text() == "second"
+        assert [p.name for p in path.parent.iterdir()] == ["file.txt"]
+
+    def test_failed_write_leaves_old_content(self, tmp_path):
+        """Test a failed write keeps the old file and removes the temp file."""
+        path = tmp_path / "file.txt"
+        path.write_text("old")
+        with pytest.raises(TypeError):
+            write_atomic(path, 42)
+        assert path.read_text() == "old"
+        assert [p.name for p in tmp_path.iterdir()] == ["file.txt"]
 
 
 class TestWorkflowState:
@@ -113,3 +141,202 @@ class TestPersistence:
     def test_delete_nonexistent_state(self):
         """Test deleting nonexistent state doesn't error."""
         delete_state(Path("/nonexistent/state.json"))  # Should not raise
+
+
+class TestStateJournal:
+    """Tests for the append-only state journal."""
+
+    def test_entries_hold_only_changed_fields(self):
+        """Test each save appends one entry with the changed fields."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "state.json"
+            journal = StateJournal(path, compact_every=0)
+            state = WorkflowState(phase=Phase.INIT)
+            assert journal.append(state)
+            state.phase = Phase.REFINE_GOAL
+            assert journal.append(state)
+            assert not journal.append(state)
+            journal.close()
+
+            lines = journal_path(path).read_text().splitlines()
+            assert len(lines) == 2
+            assert json.loads(lines[1])["set"] == {"phase": "refine_goal"}
+            assert not path.exists()
+
+            loaded = load_state(path)
+            assert loaded is not None
+            assert loaded.phase == Phase.REFINE_GOAL
+            assert state_exists(path)
+
+    def test_history_entries_hold_only_new_iterations(self):
+        """Test an iteration bump journals only that iteration's history."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "state.json"
+            journal = StateJournal(path, compact_every=0)
+            state = WorkflowState(phase=Phase.REVIEW)
+            for iteration in range(1, 4):
+                state.iteration = iteration
+                state.history[iteration] = {"plan": f"p{iteration}", "comments": f"c{iteration}"}
+                journal.append(state)
+            journal.close()
+
+            last = json.loads(journal_path(path).read_text().splitlines()[-1])
+            assert last["set"] == {"iteration": 3}
+            assert last["merge"] == {"history": {"3": {"plan": "p3", "comments": "c3"}}}
+
+            loaded = load_state(path)
+            assert loaded is not None
+            assert loaded.history == state.history
+
+    def test_compaction_keeps_state_and_history(self):
+        """Test compaction writes a snapshot and archives the entries."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "state.json"
+            journal = StateJournal(path, compact_every=3)
+            state = WorkflowState(phase=Phase.INIT)
+            for iteration in range(5):
+                state.iteration = iteration
+                journal.append(state)
+            journal.close()
+
+            snapshot = json.loads(path.read_text())
+            assert snapshot["journal_seq"] == 3
+            assert snapshot["iteration"] == 2
+            assert len(journal_path(path).read_text().splitlines()) == 2
+
+            loaded = load_state(path)
+            assert loaded is not None
+            assert loaded.iteration == 4
+            assert [entry["seq"] for entry in journal.history()] == [1, 2, 3, 4, 5]
+
+    def test_reopen_continues_sequence(self):
+        """Test a reopened journal continues after the existing entries."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "state.json"
+            journal = StateJournal(path, compact_every=0)
+            journal.append(WorkflowState(phase=Phase.INIT))
+            journal.close()
+
+            journal = StateJournal(path, compact_every=0)
+            assert not journal.append(WorkflowState(phase=Phase.INIT))
+            journal.append(WorkflowState(phase=Phase.REVIEW, iteration=1))
+            journal.close()
+            assert [entry["seq"] for entry in journal.history()] == [1, 2]
+
+    def test_torn_last_line_ignored(self):
+        """Test a partially written last entry is dropped on load and reopen."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "state.json"
+            journal = StateJournal(path, compact_every=0)
+            journal.append(WorkflowState(phase=Phase.REVIEW))
+            journal.close()
+            with open(journal_path(path), "a") as f:
+                f.write('{"seq": 2, "set": {"pha')
+
+            loaded = load_state(path)
+            assert loaded is not None
+            assert loaded.phase == Phase.REVIEW
+
+            journal = StateJournal(path, compact_every=0)
+            journal.append(WorkflowState(phase=Phase.RESPOND))
+            journal.close()
+            loaded = load_state(path)
+            assert loaded is not None
+            assert loaded.phase == Phase.RESPOND
+
+    def test_snapshot_save_supersedes_journal(self):
+        """Test save_state replaces a journal left by the journal backend."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "state.json"
+            journal = StateJournal(path, compact_every=0)
+            journal.append(WorkflowState(phase=Phase.REVIEW))
+            journal.close()
+
+            save_state(WorkflowState(phase=Phase.INIT), path)
+            loaded = load_state(path)
+            assert loaded is not None
+            assert loaded.phase == Phase.INIT
+
+    def test_delete_removes_journal_files(self):
+        """Test delete_state removes the journal and history."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "state.json"
+            journal = StateJournal(path, compact_every=1)
+            journal.append(WorkflowState(phase=Phase.INIT))
+            journal.append(WorkflowState(phase=Phase.REFINE_GOAL))
+            journal.close()
+
+            delete_state(path)
+            assert not state_exists(path)
+            assert not history_path(path).exists()
+
+    def test_invalid_options(self):
+        """Test invalid fsync policy and compaction interval are rejected."""
+        with pytest.raises(ValueError):
+            StateJournal(Path("/nonexistent/state.json"), fsync="sometimes")
+        with pytest.raises(ValueError):
+            StateJournal(Path("/nonexistent/state.json"), compact_every=-1)
+
+    def test_fsync_always(self):
+        """Test the always-fsync policy still round-trips."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "state.json"
+            journal = StateJournal(path, fsync="always", compact_every=1)
+            journal.append(WorkflowState(phase=Phase.APPROVED, iteration=3))
+            journal.close()
+
+            loaded = load_state(path)
+            assert loaded is not None
+            assert loaded.phase == Phase.APPROVED
+            assert loaded.iteration == 3
+
+
+class TestObjectStore:
+    """Tests for the content-addressed version store."""
+
+    def test_round_trip_and_dedup(self):
+        """Test blobs are stored once under their hash and read back."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = ObjectStore(Path(tmpdir) / "objects")
+            digest = store.put(b"# Plan\n")
+            assert store.put(b"# Plan\n") == digest
+            assert digest in store
+            assert store.get(digest) == b"# Plan\n"
+            assert len(list((Path(tmpdir) / "objects").rglob("*"))) == 2
+
+    def test_missing_object(self):
+        """Test reading an unknown hash raises KeyError."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = ObjectStore(Path(tmpdir))
+            with pytest.raises(KeyError):
+                store.get("0" * 64)
+
+    def test_delta_against_previous_version(self):
+        """Test similar versions are stored as small deltas of one full object."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir) / "objects"
+            store = ObjectStore(root)
+            text = "".join(f"- [ ] Step {i}: do thing number {i * 7919 % 1000}\n" for i in range(300))
+            versions = [text]
+            for i in range(50):
+                versions.append(versions[-1] + f"- revision {i}\n")
+
+            digests = []
+            base = None
+            for version in versions:
+                base = store.put(version.encode(), base=base)
+                digests.append(base)
+
+            def size(digest):
+                return (root / digest[:2] / digest[2:]).stat().st_size
+
+            assert size(digests[1]) < size(digests[0]) // 5
+            assert size(digests[-1]) < size(digests[0]) // 2
+            for digest, version in zip(digests, versions):
+                assert store.get(digest).decode() == version
+
+    def test_state_history_round_trip(self):
+        """Test the iteration index survives to_dict/from_dict."""
+        state = WorkflowState(phase=Phase.REVIEW, history={1: {"plan": "a", "comments": "b"}})
+        loaded = WorkflowState.from_dict(state.to_dict())
+        assert loaded.history == {1: {"plan": "a", "comments": "b"}}
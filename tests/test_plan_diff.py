@@ -0,0 +1,67 @@
+"""Tests for section-level plan diffs."""
+from agent_collab.engine.plan_diff import diff_plans, split_sections
+
+PLAN = """# Plan
+
+Intro text.
+
+## Step 1: Set up
+- create the project
+
+## Step 2: Build
+- write the code
+
+## Notes
+- keep it small
+"""
+
+
+class TestSplitSections:
+    """Tests for split_sections."""
+
+    def test_headings(self):
+        """Test sections start at each heading."""
+        sections = split_sections(PLAN)
+        assert [s.key for s in sections] == [
+            "# Plan", "## Step 1: Set up", "## Step 2: Build", "## Notes",
+        ]
+        assert sections[2].text == "## Step 2: Build\n- write the code\n\n"
+        assert "".join(s.text for s in sections) == PLAN
+
+    def test_checkbox_items_and_preamble(self):
+        """Test top-level checkbox items are sections and nested bullets are not."""
+        text = "Goal: ship\n- [ ] Step 1: a\n  - detail\n- [x] Step 2: b\n"
+        sections = split_sections(text)
+        assert [s.key for s in sections] == ["", "- [ ] Step 1: a", "- [ ] Step 2: b"]
+
+    def test_repeated_headings_are_distinct(self):
+        """Test repeated headings get numbered keys."""
+        sections = split_sections("## Notes\na\n## Notes\nb\n")
+        assert [s.key for s in sections] == ["## Notes", "## Notes#1"]
+
+
+class TestDiffPlans:
+    """Tests for diff_plans."""
+
+    def test_identical(self):
+        """Test identical plans have an empty diff."""
+        diff = diff_plans(PLAN, PLAN)
+        assert diff.empty
+        assert diff.total == 4
+
+    def test_changed_added_removed(self):
+        """Test edited, new and deleted sections are reported."""
+        new = (
+            PLAN.replace("- write the code", "- write the code\n- add tests")
+            .replace("## Notes\n- keep it small\n", "## Step 3: Ship\n- release\n")
+        )
+        diff = diff_plans(PLAN, new)
+        assert [s.key for s in diff.changed] == ["## Step 2: Build", "## Step 3: Ship"]
+        assert [s.key for s in diff.removed] == ["## Notes"]
+        assert diff.changed_size == sum(len(s.text) for s in diff.changed)
+
+    def test_checking_off_a_step_is_a_change(self):
+        """Test a checked box keeps the section key but counts as a change."""
+        diff = diff_plans("- [ ] Step 1: a\n", "- [x] Step 1: a\n")
+        assert [s.text for s in diff.changed] == ["- [x] Step 1: a\n"]
+        assert not diff.removed
@@ -0,0 +1,142 @@
+"""Tests for plan parsing and the step index."""
+import os
+import tempfile
+from pathlib import Path
+
+from agent_collab.engine import PlanCache, mark_step_done, parse_plan
+
+CHECKBOX_PLAN = """# Plan
+
+## Summary
+- Add a cache layer
+- Keep it small
+
+## Steps
+- [ ] Step 1: Create `src/cache.py` module
+  Use an LRU dict.
+- [x] Step 2: Add tests in tests/test_cache.py (depends on step 1)
+- [ ] Wire the cache into `app.py`, after steps 1 and 2
+
+## Notes
+Not a step.
+"""
+
+HEADING_PLAN = """# Plan
+
+## Step 1: Setup
+Edit `config.toml`.
+
+#### Details
+Keep defaults.
+
+## Step 2: Build [x]
+Dependencies: 1
+
+# Appendix
+Not a step.
+"""
+
+
+class TestParsePlan:
+    """Tests for parse_plan."""
+
+    def test_checkbox_steps(self):
+        """Test checkbox items are steps and summary bullets are not."""
+        index = parse_plan(CHECKBOX_PLAN)
+        assert [s.number for s in index] == [1, 2, 3]
+        assert index.get(1).title == "Create `src/cache.py` module"
+        assert index.get(1).body == "Use an LRU dict."
+        assert index.get(3).title == "Wire the cache into `app.py`, after steps 1 and 2"
+
+    def test_done_and_pending(self):
+        """Test checked steps are done and excluded from pending."""
+        index = parse_plan(CHECKBOX_PLAN)
+        assert index.get(2).done is True
+        assert [s.number for s in index.pending()] == [1, 3]
+
+    def test_dependencies(self):
+        """Test declared dependencies are extracted."""
+        index = parse_plan(CHECKBOX_PLAN)
+        assert index.get(1).depends_on == []
+        assert index.get(2).depends_on == [1]
+        assert index.get(3).depends_on == [1, 2]
+
+    def test_file_hints(self):
+        """Test backticked and bare paths become file hints."""
+        index = parse_plan(CHECKBOX_PLAN)
+        assert index.get(1).files == ["src/cache.py"]
+        assert index.get(2).files == ["tests/test_cache.py"]
+        assert index.get(3).files == ["app.py"]
+
+    def test_heading_steps(self):
+        """Test "## Step N" headings, with sub-headings kept in the body."""
+        index = parse_plan(HEADING_PLAN)
+        assert [s.number for s in index] == [1, 2]
+        assert "Keep defaults." in index.get(1).body
+        assert index.get(2).done is True
+        assert index.get(2).depends_on == [1]
+        assert "Appendix" not in index.get(2).body
+
+    def test_missing_step(self):
+        """Test lookup of an unknown step returns None."""
+        assert parse_plan(CHECKBOX_PLAN).get(9) is None
+
+
+class TestPlanCache:
+    """Tests for the cached, incrementally updated index."""
+
+    def test_unchanged_file_not_reparsed(self):
+        """Test the same index is returned while the file is unchanged."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "plan.md"
+            path.write_text(CHECKBOX_PLAN)
+            cache = PlanCache(path)
+            assert cache.get() is cache.get()
+
+    def test_only_changed_steps_reparsed(self):
+        """Test unchanged steps keep their parsed objects after an edit."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "plan.md"
+            path.write_text(CHECKBOX_PLAN)
+            cache = PlanCache(path)
+            before = cache.get()
+
+            path.write_text(CHECKBOX_PLAN.replace("- [ ] Wire", "- [x] Wire"))
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            after = cache.get()
+
+            assert after is not before
+            assert after.get(1) is before.get(1)
+            assert after.get(3) is not before.get(3)
+            assert after.get(3).done is True
+
+    def test_missing_file(self):
+        """Test a missing plan gives an empty index."""
+        assert len(PlanCache(Path("/nonexistent/plan.md")).get()) == 0
+
+
+class TestMarkStepDone:
+    """Tests for mark_step_done."""
+
+    def test_checkbox(self):
+        """Test an unchecked box is checked."""
+        text = mark_step_done(CHECKBOX_PLAN, 3)
+        assert "- [x] Wire the cache" in text
+        assert parse_plan(text).get(3).done is True
+
+    def test_heading(self):
+        """Test a heading step gets a trailing marker."""
+        text = mark_step_done(HEADING_PLAN, 1)
+        assert "## Step 1: Setup [x]" in text
+        assert parse_plan(text).get(1).done is True
+
+    def test_numbered_item(self):
+        """Test a plain numbered item gets a checkbox."""
+        text = mark_step_done("1. First\n2. Second\n", 2)
+        assert text == "1. First\n2. [x] Second\n"
+
+    def test_done_or_missing_unchanged(self):
+        """Test done and unknown steps leave the text as is."""
+        assert mark_step_done(CHECKBOX_PLAN, 2) == CHECKBOX_PLAN
+        assert mark_step_done(CHECKBOX_PLAN, 9) == CHECKBOX_PLAN
@@ -0,0 +1,197 @@
+"""Tests for the warm agent process pool."""
+import asyncio
+import sys
+import textwrap
+
+import pytest
+
+from agent_collab.adapters import (
+    AgentProcessError,
+    ClaudeAdapter,
+    ProcessPool,
+    TextDelta,
+    TurnResult,
+    create_adapter,
+)
+
+# Minimal stand-in for `claude --input-format stream-json --output-format stream-json`:
+# echoes each user message back as an assistant message, then a result.
+FAKE_CLAUDE = textwrap.dedent("""
+    import json, os, sys
+    for line in sys.stdin:
+        msg = json.loads(line)
+        text = msg["message"]["content"][0]["text"]
+        if text == "crash":
+            print("fatal: simulated crash", file=sys.stderr)
+            sys.exit(1)
+        reply = f"{os.getpid()}:{text}"
+        print(json.dumps({"type": "assistant", "message": {"content": [{"type": "text", "text": reply}]}}), flush=True)
+        print(json.dumps({"type": "result", "session_id": "sess-1"}), flush=True)
+""")
+
+
+class FakeClaudeAdapter(ClaudeAdapter):
+    """ClaudeAdapter running the fake stream-json script."""
+
+    script: str = ""
+
+    def get_cli_command(self) -> list[str]:
+        return [sys.executable, "-c", self.script]
+
+
+async def _collect(adapter, prompt):
+    return "".join([chunk async for chunk in adapter.send(prompt)])
+
+
+class TestProcessPool:
+    """Tests for ProcessPool."""
+
+    def test_reuses_warm_process(self, tmp_path):
+        """Test consecutive turns are served by the same process."""
+        FakeClaudeAdapter.script = FAKE_CLAUDE
+
+        async def run():
+            pool = ProcessPool()
+            adapter = FakeClaudeAdapter(str(tmp_path), pool=pool)
+            first = await _collect(adapter, "one")
+            second = await _collect(adapter, "two")
+            await pool.close()
+            return pool, adapter, first, second
+
+        pool, adapter, first, second = asyncio.run(run())
+        assert first.endswith(":one")
+        assert second.endswith(":two")
+        assert first.split(":")[0] == second.split(":")[0]
+        assert pool.spawn_count == 1
+        assert adapter.session_id == "sess-1"
+
+    def test_respawns_after_crash(self, tmp_path):
+        """Test a crashed process raises and is replaced on the next turn."""
+        FakeClaudeAdapter.script = FAKE_CLAUDE
+
+        async def run():
+            pool = ProcessPool()
+            adapter = FakeClaudeAdapter(str(tmp_path), pool=pool)
+            with pytest.raises(AgentProcessError, match="exited with code 1"):
+                await _collect(adapter, "crash")
+            stderr = adapter.last_stderr
+            result = await _collect(adapter, "again")
+            await pool.close()
+            return pool, stderr, result
+
+        pool, stderr, result = asyncio.run(run())
+        assert stderr == "fatal: simulated crash"
+        assert result.endswith(":again")
+        assert pool.spawn_count == 2
+
+    def test_respawns_after_broken_pipe(self, tmp_path):
+        """Test a process that dies before the write is replaced and the replacement locked."""
+        FakeClaudeAdapter.script = FAKE_CLAUDE
+
+        class LockCheckingAdapter(FakeClaudeAdapter):
+            locked: list[bool] = []
+
+            def parse_events(self, line):
+                self.locked.append(self.pool.get(self).lock.locked())
+                return super().parse_events(line)
+
+        async def run():
+            pool = ProcessPool()
+            adapter = LockCheckingAdapter(str(tmp_path), pool=pool)
+            await _collect(adapter, "one")
+            stale = pool.get(adapter)
+
+            def broken_write(data):
+                raise BrokenPipeError
+
+            stale.process.stdin.write = broken_write
+            adapter.locked.clear()
+            result = await _collect(adapter, "two")
+            fresh = pool.get(adapter)
+            await pool.close()
+            return pool, stale, fresh, adapter.locked, result
+
+        pool, stale, fresh, locked, result = asyncio.run(run())
+        assert result.endswith(":two")
+        assert pool.spawn_count == 2
+        assert fresh is not stale
+        assert locked and all(locked)
+        assert not stale.lock.locked() and not fresh.lock.locked()
+
+    def test_overlong_line(self, tmp_path, monkeypatch):
+        """Test a line over the stream limit fails the turn with AgentProcessError."""
+        monkeypatch.setattr("agent_collab.adapters.pool.MAX_LINE", 1024)
+        FakeClaudeAdapter.script = FAKE_CLAUDE.replace(
+            'if text == "crash":', 'if text == "long":\n        print("x" * 4096, flush=True)\n    if text == "crash":'
+        )
+
+        async def run():
+            pool = ProcessPool()
+            adapter = FakeClaudeAdapter(str(tmp_path), pool=pool)
+            with pytest.raises(AgentProcessError, match="too long"):
+                await _collect(adapter, "long")
+            result = await _collect(adapter, "again")
+            await pool.close()
+            return pool, result
+
+        pool, result = asyncio.run(run())
+        assert result.endswith(":again")
+        assert pool.spawn_count == 2
+
+    def test_idle_eviction(self, tmp_path):
+        """Test processes idle past the timeout are evicted."""
+        FakeClaudeAdapter.script = FAKE_CLAUDE
+
+        async def run():
+            pool = ProcessPool(idle_timeout=0.01)
+            adapter = FakeClaudeAdapter(str(tmp_path), pool=pool)
+            await _collect(adapter, "one")
+            assert len(pool) == 1
+            await asyncio.sleep(0.05)
+            await pool.evict_idle()
+            return pool
+
+        pool = asyncio.run(run())
+        assert len(pool) == 0
+
+    def test_missing_cli(self, tmp_path):
+        """Test a CLI that can't be started raises AgentProcessError, pooled or not."""
+
+        class MissingAdapter(ClaudeAdapter):
+            def get_cli_command(self) -> list[str]:
+                return [str(tmp_path / "no-such-cli")]
+
+        async def run(pool):
+            with pytest.raises(AgentProcessError, match="could not be started"):
+                await _collect(MissingAdapter(str(tmp_path), pool=pool), "hi")
+
+        asyncio.run(run(None))
+        asyncio.run(run(ProcessPool()))
+
+    def test_unpooled_by_default(self):
+        """Test adapters only use the pool when one is supplied."""
+        assert create_adapter("claude", "/project").pooled is False
+        assert create_adapter("claude", "/project", pool=ProcessPool()).pooled is True
+        assert create_adapter("codex", "/project", pool=ProcessPool()).pooled is True
+
+
+class TestPersistentProtocol:
+    """Tests for adapter persistent-mode encoding and parsing."""
+
+    def test_claude_persistent_command_resumes_session(self):
+        """Test respawned Claude process resumes the known session."""
+        adapter = ClaudeAdapter("/project")
+        assert "--resume" not in adapter.get_persistent_command()
+        asyncio.run(adapter.resume_session("abc"))
+        cmd = adapter.get_persistent_command()
+        assert cmd[cmd.index("--resume") + 1] == "abc"
+
+    def test_codex_proto_events(self):
+        """Test Codex protocol events map to text and turn completion."""
+        adapter = create_adapter("codex", "/project")
+        assert adapter.parse_events(
+            '{"id": "1", "msg": {"type": "agent_message_delta", "delta": "hi"}}'
+        ) == [TextDelta("hi")]
+        assert adapter.parse_events(
+            '{"id": "1", "msg": {"type": "task_complete"}}'
+        ) == [TurnResult()]
@@ -1,8 +1,18 @@
 """Tests for prompt loader."""
+import os
 import tempfile
 from pathlib import Path
 
-from agent_collab.engine import load_prompt, substitute_variables, list_prompts
+import pytest
+
+from agent_collab.engine import (
+    MissingVariablesError,
+    PromptRegistry,
+    PromptTemplate,
+    load_prompt,
+    substitute_variables,
+    list_prompts,
+)
 
 
 class TestSubstituteVariables:
@@ -51,6 +61,64 @@ class TestLoadPrompt:
             load_prompt(Path("/nonexistent/template.md"))
 
 
+class TestPromptTemplate:
+    """Tests for precompiled templates."""
+
+    def test_render(self):
+        """Test segments are filled in order, including repeated variables."""
+        template = PromptTemplate("{{a}} and {{b}}, then {{a}} again.")
+        assert template.variables == {"a", "b"}
+        assert template.render(a="X", b="Y", unused="Z") == "X and Y, then X again."
+
+    def test_no_variables(self):
+        """Test a template without placeholders renders unchanged."""
+        assert PromptTemplate("Plain {text}.").render() == "Plain {text}."
+
+    def test_missing_variables(self):
+        """Test unfilled variables are reported by name."""
+        template = PromptTemplate("{{plan_path}} {{comments_path}}", "03_review_plan.md")
+        with pytest.raises(MissingVariablesError) as excinfo:
+            template.render(plan_path="/p")
+        assert excinfo.value.missing == ["comments_path"]
+        assert "03_review_plan.md" in str(excinfo.value)
+        assert "{{comments_path}}" in str(excinfo.value)
+
+
+class TestPromptRegistry:
+    """Tests for the compiled template cache."""
+
+    def test_load_all_and_render(self):
+        """Test warm start loads every template."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            prompts_dir = Path(tmpdir)
+            (prompts_dir / "01_a.md").write_text("Hello {{name}}")
+            (prompts_dir / "02_b.md").write_text("Bye")
+            registry = PromptRegistry(prompts_dir)
+
+            assert registry.load_all() == ["01_a.md", "02_b.md"]
+            assert registry.get("01_a.md") is registry.get("01_a.md")
+            assert registry.render("01_a.md", name="you") == "Hello you"
+
+    def test_reloads_changed_file(self):
+        """Test a template is recompiled when its file changes."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "01_a.md"
+            path.write_text("v1 {{x}}")
+            registry = PromptRegistry(Path(tmpdir))
+            assert registry.render("01_a.md", x="!") == "v1 !"
+
+            path.write_text("v2 {{x}}")
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            assert registry.render("01_a.md", x="!") == "v2 !"
+
+    def test_missing_template(self):
+        """Test an unknown template raises FileNotFoundError."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with pytest.raises(FileNotFoundError):
+                PromptRegistry(Path(tmpdir)).get("nope.md")
+
+
 class TestListPrompts:
     """Tests for listing prompt files."""
 
@@ -0,0 +1,96 @@
+"""Tests for merging parallel reviews."""
+import pytest
+
+from agent_collab.engine import CommentStatus, Verdict, parse_comments
+from agent_collab.engine.review_merge import combine_verdicts, merge_reviews, parse_review
+
+APPROVE = Verdict.APPROVED
+CHANGES = Verdict.CHANGES_REQUIRED
+
+
+class TestParseReview:
+    """Tests for splitting a comments file."""
+
+    def test_verdict_issues_and_notes(self):
+        """Test verdict, list items and prose are separated."""
+        review = parse_review("claude #1", (
+            "[CHANGES_REQUIRED]\n"
+            "\n"
+            "Overall reasonable.\n"
+            "- Step 2 lacks tests\n"
+            "  and error handling\n"
+            "1. Rename module\n"
+        ))
+        assert review.verdict == CHANGES
+        assert review.issues == ["Step 2 lacks tests and error handling", "Rename module"]
+        assert review.notes == ["Overall reasonable."]
+
+    def test_missing_verdict(self):
+        """Test content without a marker has no verdict."""
+        assert parse_review("r", "- something\n").verdict is None
+
+
+class TestCombineVerdicts:
+    """Tests for verdict policies."""
+
+    @pytest.mark.parametrize("policy, verdicts, expected", [
+        ("all", [APPROVE, APPROVE], APPROVE),
+        ("all", [APPROVE, CHANGES], CHANGES),
+        ("any", [CHANGES, APPROVE], APPROVE),
+        ("any", [CHANGES, None], CHANGES),
+        ("majority", [APPROVE, APPROVE, CHANGES], APPROVE),
+        ("majority", [APPROVE, CHANGES], CHANGES),
+    ])
+    def test_policies(self, policy, verdicts, expected):
+        """Test each policy's approval rule."""
+        assert combine_verdicts(verdicts, policy) == expected
+
+    def test_unknown_policy(self):
+        """Test an unknown policy raises."""
+        with pytest.raises(ValueError, match="Unknown review policy"):
+            combine_verdicts([APPROVE], "unanimous")
+
+
+class TestMergeReviews:
+    """Tests for merged comments output."""
+
+    def test_duplicate_issues_merged(self):
+        """Test the same issue from two reviewers appears once with both labels."""
+        verdict, merged = merge_reviews([
+            ("claude #1", "[CHANGES_REQUIRED]\n- Step 2 lacks tests.\n"),
+            ("codex #2", "[APPROVED]\n- step 2 lacks tests\n- Add rollback step\n"),
+        ], policy="all")
+
+        assert verdict == CHANGES
+        assert merged.startswith("[CHANGES_REQUIRED]\n")
+        assert merged.count("lacks tests") == 1
+        assert "- [C1] (major) [open] Step 2 lacks tests. (claude #1, codex #2)" in merged
+        assert "- [C2] (major) [open] Add rollback step (codex #2)" in merged
+
+    def test_structured_comments_renumbered(self):
+        """Test new IDs every reviewer was offered are renumbered, not duplicated."""
+        _, merged = merge_reviews([
+            ("claude #1", "[CHANGES_REQUIRED]\n- [C4] (minor) [open] Step 2 lacks tests\n- [C5] (major) [open] No rollback\n"),
+            ("codex #2", "[CHANGES_REQUIRED]\n- [C4] (critical) [open] step 2 lacks tests.\n- [C5] (major) [open] Pin versions\n"),
+        ], next_id=4)
+
+        assert merged.count("lacks tests") == 1
+        assert "- [C4] (critical) [open] Step 2 lacks tests (claude #1, codex #2)" in merged
+        assert "- [C5] (major) [open] No rollback (claude #1)" in merged
+        assert "- [C6] (major) [open] Pin versions (codex #2)" in merged
+        assert parse_comments(merged).max_id == 6
+        assert len(parse_comments(merged)) == 3
+
+    def test_existing_comment_status_independent_of_order(self):
+        """Test a comment from an earlier round keeps its ID and least settled status."""
+        reviews = [
+            ("claude #1", "[APPROVED]\n- [C1] (major) [resolved] Step 2 lacks tests (claude #1, codex #2)\n"),
+            ("codex #2", "[CHANGES_REQUIRED]\n- [C1] (major) [fixed] Step 2 lacks tests (claude #1)\n"),
+        ]
+        for ordered in (reviews, reviews[::-1]):
+            _, merged = merge_reviews(ordered, next_id=2)
+            [comment] = parse_comments(merged)
+            assert (comment.id, comment.status, comment.text.startswith("Step 2 lacks tests (")) == (
+                1, CommentStatus.FIXED, True,
+            )
+            assert merged.count("lacks tests") == 1
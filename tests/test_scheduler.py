@@ -0,0 +1,171 @@
+"""Tests for the agent turn scheduler."""
+import asyncio
+import time
+
+import pytest
+
+from agent_collab.adapters import AgentScheduler, Priority, TokenBucket
+from agent_collab.config import AgentLimit
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenBucket:
+    """Tests for TokenBucket."""
+
+    def test_burst_then_rate(self):
+        """Test a full bucket allows a burst, then refills at the rate."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, capacity=3, clock=clock)
+
+        assert [bucket.try_take() for _ in range(4)] == [True, True, True, False]
+        assert bucket.wait_time() == pytest.approx(0.5)
+
+        clock.now = 0.5
+        assert bucket.try_take()
+        assert not bucket.try_take()
+
+        clock.now = 100
+        assert [bucket.try_take() for _ in range(4)] == [True, True, True, False]
+
+
+async def _admit_order(scheduler: AgentScheduler, requests: list[tuple[str, Priority]]) -> list[str]:
+    """Queue requests behind one running turn and return the order they were admitted in."""
+    order = []
+    await scheduler.acquire("claude")
+
+    async def turn(flow: str, priority: Priority) -> None:
+        await scheduler.acquire("claude", flow, priority)
+        order.append(flow)
+        await asyncio.sleep(0)
+        scheduler.release("claude")
+
+    tasks = [asyncio.create_task(turn(flow, priority)) for flow, priority in requests]
+    await asyncio.sleep(0)
+    scheduler.release("claude")
+    await asyncio.gather(*tasks)
+    return order
+
+
+class TestAgentScheduler:
+    """Tests for AgentScheduler."""
+
+    def test_concurrency_cap(self):
+        """Test no more turns run at once than the agent's cap."""
+        scheduler = AgentScheduler({"claude": AgentLimit(max_concurrent=2)})
+        peak = 0
+
+        async def turn():
+            nonlocal peak
+            await scheduler.acquire("claude")
+            peak = max(peak, scheduler.running("claude"))
+            await asyncio.sleep(0.01)
+            scheduler.release("claude")
+
+        async def run():
+            await asyncio.gather(*(turn() for _ in range(5)))
+
+        asyncio.run(run())
+
+        assert peak == 2
+        assert scheduler.running("claude") == 0
+
+    def test_unlimited_agents(self):
+        """Test agent types without limits are admitted immediately."""
+        scheduler = AgentScheduler({"claude": AgentLimit(max_concurrent=1)})
+
+        async def run():
+            return [await scheduler.acquire("codex") for _ in range(3)]
+
+        assert asyncio.run(run()) == [0.0, 0.0, 0.0]
+        assert scheduler.running("codex") == 0
+
+    def test_interactive_before_batch(self):
+        """Test waiting interactive turns are admitted before batch turns."""
+        scheduler = AgentScheduler({"claude": AgentLimit(max_concurrent=1)})
+
+        order = asyncio.run(_admit_order(scheduler, [
+            ("b1", Priority.BATCH),
+            ("b2", Priority.BATCH),
+            ("i1", Priority.INTERACTIVE),
+        ]))
+
+        assert order == ["i1", "b1", "b2"]
+
+    def test_fair_across_flows(self):
+        """Test waiting flows are served round-robin, not first-come."""
+        scheduler = AgentScheduler({"claude": AgentLimit(max_concurrent=1)})
+
+        order = asyncio.run(_admit_order(scheduler, [
+            ("a", Priority.BATCH),
+            ("a", Priority.BATCH),
+            ("a", Priority.BATCH),
+            ("b", Priority.BATCH),
+            ("c", Priority.BATCH),
+        ]))
+
+        assert order == ["a", "b", "c", "a", "a"]
+
+    def test_rate_limit(self):
+        """Test turn starts beyond the burst wait for the token bucket."""
+        scheduler = AgentScheduler({"codex": AgentLimit(requests_per_minute=1200, burst=2)})
+
+        async def run():
+            start = time.perf_counter()
+            waits = []
+            for _ in range(4):
+                waits.append(await scheduler.acquire("codex"))
+                scheduler.release("codex")
+            return waits, time.perf_counter() - start
+
+        waits, elapsed = asyncio.run(run())
+
+        # 20 per second: two immediately, then one every 50ms
+        assert waits[:2] == [0.0, 0.0]
+        assert all(wait > 0.03 for wait in waits[2:])
+        assert elapsed >= 0.09
+
+    def test_cancelled_waiter_leaves_queue(self):
+        """Test a turn cancelled while queued neither runs nor holds a slot."""
+        scheduler = AgentScheduler({"claude": AgentLimit(max_concurrent=1)})
+
+        async def run():
+            await scheduler.acquire("claude")
+            waiter = asyncio.create_task(scheduler.acquire("claude", "a"))
+            await asyncio.sleep(0)
+            assert scheduler.waiting("claude") == 1
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+            assert scheduler.waiting("claude") == 0
+            scheduler.release("claude")
+            assert await scheduler.acquire("claude") == 0.0
+
+        asyncio.run(run())
+
+        assert scheduler.running("claude") == 1
+
+    def test_cancelled_waiter_spends_no_token(self):
+        """Test dispatching to an already cancelled waiter keeps the rate token."""
+        scheduler = AgentScheduler({"claude": AgentLimit(max_concurrent=1, requests_per_minute=60, burst=2)})
+
+        async def run():
+            await scheduler.acquire("claude")
+            waiter = asyncio.create_task(scheduler.acquire("claude", "a"))
+            await asyncio.sleep(0)
+            # Cancelled but not yet unqueued when the slot frees up
+            waiter.cancel()
+            scheduler.release("claude")
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+            return await scheduler.acquire("claude")
+
+        assert asyncio.run(run()) == 0.0
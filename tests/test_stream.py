@@ -0,0 +1,333 @@
+"""Tests for structured agent output parsing."""
+import asyncio
+import json
+import os
+import sys
+import textwrap
+import time
+
+import pytest
+
+from agent_collab.adapters import (
+    AgentProcessError,
+    ClaudeAdapter,
+    CodexAdapter,
+    SessionStarted,
+    TextDelta,
+    ToolCall,
+    TurnResult,
+    Usage,
+)
+from agent_collab.adapters.stream import AdaptiveReader, LineDecoder, Utf8Decoder
+
+
+class TestUtf8Decoder:
+    """Tests for incremental UTF-8 decoding."""
+
+    def test_split_multibyte_character(self):
+        """Test a character split across reads is decoded intact."""
+        data = "计划".encode()
+        decoder = Utf8Decoder()
+        text = decoder.feed(data[:2]) + decoder.feed(data[2:4]) + decoder.feed(data[4:])
+        assert text + decoder.flush() == "计划"
+
+    def test_truncated_stream_replaced_on_flush(self):
+        """Test incomplete trailing bytes become a replacement char."""
+        decoder = Utf8Decoder()
+        assert decoder.feed("计".encode()[:2]) == ""
+        assert decoder.flush() == "�"
+
+
+class TestLineDecoder:
+    """Tests for JSON-lines splitting."""
+
+    def test_partial_lines_buffered(self):
+        """Test lines are only returned once complete."""
+        decoder = LineDecoder()
+        assert decoder.feed(b'{"a": 1}\n{"b"') == ['{"a": 1}']
+        assert decoder.feed(b': 2}\n') == ['{"b": 2}']
+        assert decoder.flush() == []
+
+    def test_flush_returns_unterminated_line(self):
+        """Test final line without newline is returned on flush."""
+        decoder = LineDecoder()
+        decoder.feed(b'{"a": 1}')
+        assert decoder.flush() == ['{"a": 1}']
+
+
+    def test_long_line_truncated(self):
+        """Test a line past max_line is cut short instead of buffered whole."""
+        decoder = LineDecoder(max_line=8)
+        for _ in range(100):
+            assert decoder.feed(b"x" * 1000) == []
+        assert len(decoder._buffer) == 8
+        assert decoder.feed(b"yyy\nshort\n0123456789") == ["xxxxxxxx", "short"]
+        assert decoder.flush() == ["01234567"]
+
+
+class TestAdaptiveReader:
+    """Tests for adaptive read sizing."""
+
+    def test_grows_on_full_reads(self):
+        """Test read size grows while reads fill the buffer."""
+        async def run():
+            reader = asyncio.StreamReader()
+            reader.feed_data(b"x" * 10000)
+            reader.feed_eof()
+            adaptive = AdaptiveReader(reader, min_size=1024, max_size=4096)
+            sizes = []
+            async for chunk in adaptive:
+                sizes.append(len(chunk))
+            return sizes
+
+        sizes = asyncio.run(run())
+        assert sizes == [1024, 2048, 4096, 2832]
+
+
+    def test_shrinks_on_small_reads(self):
+        """Test read size shrinks back when output trickles."""
+        async def run():
+            reader = asyncio.StreamReader()
+            adaptive = AdaptiveReader(reader, min_size=1024, max_size=8192)
+            adaptive.size = 8192
+            reader.feed_data(b"x" * 10)
+            await adaptive.read()
+            return adaptive.size
+
+        assert asyncio.run(run()) == 4096
+
+
+class TestClaudeEvents:
+    """Tests for Claude stream-json parsing."""
+
+    def test_full_turn(self):
+        """Test init, assistant and result messages map to typed events."""
+        adapter = ClaudeAdapter("/project")
+        lines = [
+            {"type": "system", "subtype": "init", "session_id": "s-1"},
+            {"type": "assistant", "message": {"content": [
+                {"type": "text", "text": "Writing plan"},
+                {"type": "tool_use", "id": "t1", "name": "Write", "input": {"file_path": "plan.md"}},
+            ]}},
+            {"type": "result", "result": "done", "session_id": "s-1", "is_error": False,
+             "usage": {"input_tokens": 10, "output_tokens": 5, "cache_read_input_tokens": 3}},
+        ]
+        events = [e for line in lines for e in adapter.parse_events(json.dumps(line))]
+        assert events == [
+            SessionStarted("s-1"),
+            TextDelta("Writing plan"),
+            ToolCall(name="Write", input={"file_path": "plan.md"}, call_id="t1"),
+            SessionStarted("s-1"),
+            Usage(input_tokens=10, output_tokens=5, cached_input_tokens=3),
+            TurnResult(text="done"),
+        ]
+
+    def test_non_json_line_ignored(self):
+        """Test stray non-JSON output produces no events."""
+        assert ClaudeAdapter("/project").parse_events("warning: something") == []
+
+    def test_malformed_message_shapes_ignored(self):
+        """Test null messages and non-dict content blocks are skipped."""
+        adapter = ClaudeAdapter("/project")
+        assert adapter.parse_events('{"type": "assistant", "message": null}') == []
+        assert adapter.parse_events('{"type": "assistant", "message": {"content": "hi"}}') == []
+        events = adapter.parse_events(
+            '{"type": "assistant", "message": {"content": [null, "x", {"type": "text", "text": "ok"}]}}'
+        )
+        assert events == [TextDelta("ok")]
+        events = adapter.parse_events('{"type": "result", "usage": [], "result": "done"}')
+        assert events[0] == Usage(input_tokens=0, output_tokens=0, cached_input_tokens=0)
+
+    def test_structured_command(self):
+        """Test structured mode requests stream-json output."""
+        adapter = ClaudeAdapter("/project", structured=True)
+        asyncio.run(adapter.resume_session("s-1"))
+        cmd = adapter.build_command()
+        assert cmd[:2] == ["claude", "--print"]
+        assert "stream-json" in cmd
+        assert cmd[-2:] == ["--resume", "s-1"]
+
+
+class TestCodexEvents:
+    """Tests for `codex exec --json` parsing."""
+
+    def test_exec_turn(self):
+        """Test exec events map to typed events."""
+        adapter = CodexAdapter("/project")
+        lines = [
+            {"type": "thread.started", "thread_id": "th-1"},
+            {"type": "item.started", "item": {"id": "i1", "type": "command_execution", "command": "ls"}},
+            {"type": "item.completed", "item": {"id": "i2", "type": "agent_message", "text": "Done"}},
+            {"type": "turn.completed", "usage": {"input_tokens": 7, "output_tokens": 2}},
+        ]
+        events = [e for line in lines for e in adapter.parse_events(json.dumps(line))]
+        assert events == [
+            SessionStarted("th-1"),
+            ToolCall(name="command_execution", input={"command": "ls"}, call_id="i1"),
+            TextDelta("Done"),
+            Usage(input_tokens=7, output_tokens=2),
+            TurnResult(),
+        ]
+
+    def test_structured_command(self):
+        """Test structured mode uses exec --json reading stdin."""
+        adapter = CodexAdapter("/project", structured=True)
+        assert adapter.build_command() == ["codex", "exec", "--json", "--cd", "/project", "-"]
+
+
+class TestStreamProcess:
+    """Tests for running one-shot turns."""
+
+    def test_structured_stream_sets_session(self, tmp_path):
+        """Test events from a structured process update the session ID."""
+        script = textwrap.dedent("""
+            import json, sys
+            sys.stdin.read()
+            print(json.dumps({"type": "system", "session_id": "s-9"}))
+            print(json.dumps({"type": "assistant", "message": {"content": [{"type": "text", "text": "计划"}]}}))
+            print(json.dumps({"type": "result", "result": "计划"}))
+        """)
+
+        class FakeClaude(ClaudeAdapter):
+            def get_cli_command(self):
+                return [sys.executable, "-c", script]
+
+        async def run():
+            adapter = FakeClaude(str(tmp_path), structured=True)
+            adapter_text = [chunk async for chunk in adapter.send("hi")]
+            return adapter, adapter_text
+
+        adapter, text = asyncio.run(run())
+        assert text == ["计划"]
+        assert adapter.session_id == "s-9"
+
+    def test_text_stream_decodes_utf8(self, tmp_path):
+        """Test plain-text output with multibyte characters is not corrupted."""
+        script = "import sys; sys.stdin.read(); sys.stdout.write('审阅' * 2000)"
+
+        class FakeCodex(CodexAdapter):
+            def build_command(self):
+                return [sys.executable, "-c", script]
+
+        async def run():
+            adapter = FakeCodex(str(tmp_path))
+            return "".join([chunk async for chunk in adapter.send("hi")])
+
+        assert asyncio.run(run()) == "审阅" * 2000
+
+    def test_spawn_time_recorded(self, tmp_path):
+        """Test the time to start the process is recorded for the turn."""
+        class FakeCodex(CodexAdapter):
+            def build_command(self):
+                return [sys.executable, "-c", "import sys; sys.stdin.read(); print('ok')"]
+
+        async def run():
+            adapter = FakeCodex(str(tmp_path))
+            assert adapter.last_spawn_seconds is None
+            [chunk async for chunk in adapter.send("hi")]
+            return adapter.last_spawn_seconds
+
+        spawn = asyncio.run(run())
+        assert spawn is not None and 0 < spawn < 5
+
+
+class TestStderrHandling:
+    """Tests for stderr draining and process errors."""
+
+    def test_chatty_stderr_does_not_stall(self, tmp_path):
+        """Test a process writing far more than a pipe buffer to stderr completes."""
+        script = (
+            "import sys; sys.stdin.read()\n"
+            "for i in range(20000): print('noise', i, file=sys.stderr)\n"
+            "print('ok')"
+        )
+
+        class FakeCodex(CodexAdapter):
+            def build_command(self):
+                return [sys.executable, "-c", script]
+
+        async def run():
+            adapter = FakeCodex(str(tmp_path))
+            text = "".join([chunk async for chunk in adapter.send("hi")])
+            return adapter, text
+
+        adapter, text = asyncio.run(asyncio.wait_for(run(), 10))
+        assert text == "ok\n"
+        assert adapter.last_returncode == 0
+        assert adapter.last_stderr.splitlines()[-1] == "noise 19999"
+        assert len(adapter.last_stderr.splitlines()) == 200
+
+    def test_nonzero_exit_raises(self, tmp_path):
+        """Test a failing process raises AgentProcessError with stderr tail."""
+        script = "import sys; sys.stdin.read(); print('bad auth', file=sys.stderr); sys.exit(3)"
+
+        class FakeCodex(CodexAdapter):
+            def build_command(self):
+                return [sys.executable, "-c", script]
+
+        async def run():
+            adapter = FakeCodex(str(tmp_path))
+            return [chunk async for chunk in adapter.send("hi")]
+
+        with pytest.raises(AgentProcessError) as excinfo:
+            asyncio.run(run())
+        assert excinfo.value.returncode == 3
+        assert excinfo.value.stderr == "bad auth"
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="process groups are POSIX-only")
+class TestCancellation:
+    """Tests for stopping a turn mid-stream."""
+
+    def test_cancel_kills_process_group(self, tmp_path):
+        """Test cancelling a turn kills the agent and the tools it spawned."""
+        pid_file = tmp_path / "child.pid"
+        script = (
+            "import subprocess, sys, time\n"
+            "sys.stdin.read()\n"
+            "child = subprocess.Popen(['sleep', '60'])\n"
+            f"open({str(pid_file)!r}, 'w').write(str(child.pid))\n"
+            "print('working', flush=True)\n"
+            "time.sleep(60)\n"
+        )
+
+        class FakeCodex(CodexAdapter):
+            def build_command(self):
+                return [sys.executable, "-c", script]
+
+        async def consume(adapter, started):
+            async for chunk in adapter.send("hi"):
+                started.set()
+
+        async def run():
+            adapter = FakeCodex(str(tmp_path))
+            started = asyncio.Event()
+            task = asyncio.create_task(consume(adapter, started))
+            await asyncio.wait_for(started.wait(), 10)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            return adapter
+
+        adapter = asyncio.run(asyncio.wait_for(run(), 10))
+        assert adapter.last_returncode is not None
+        child_pid = int(pid_file.read_text())
+        for _ in range(50):
+            if not _alive(child_pid):
+                break
+            time.sleep(0.05)
+        else:
+            pytest.fail("child process survived cancellation")
+
+
+def _alive(pid: int) -> bool:
+    """Whether pid is a running (not zombie) process."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except OSError:
+        return True
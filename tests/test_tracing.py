@@ -0,0 +1,90 @@
+"""Tests for tracing spans."""
+import asyncio
+import json
+
+import pytest
+
+from agent_collab.telemetry import Tracer, read_trace
+
+
+class TestTracer:
+    """Tests for Tracer."""
+
+    def test_disabled_tracer_records_nothing(self, tmp_path):
+        """Test a tracer without a path yields no spans and writes nothing."""
+        tracer = Tracer()
+        with tracer.span("noop") as span:
+            assert span is None
+        assert tracer.start_span("noop") is None
+        assert not tracer.enabled
+
+    def test_parent_links(self, tmp_path):
+        """Test nested spans record their parent and are written on exit."""
+        path = tmp_path / "trace.json"
+        tracer = Tracer(path)
+        with tracer.span("outer", phase="review") as outer:
+            with tracer.span("inner", "persistence") as inner:
+                inner.set(backend="journal")
+            detached = tracer.start_span("stream", "adapter")
+        detached.end()
+        detached.end()
+        tracer.close()
+
+        events = {e["name"]: e for e in read_trace(path)}
+        assert set(events) == {"outer", "inner", "stream"}
+        assert events["outer"]["ph"] == "X"
+        assert events["outer"]["args"]["parent_id"] is None
+        assert events["outer"]["args"]["phase"] == "review"
+        assert events["inner"]["args"]["parent_id"] == outer.span_id
+        assert events["inner"]["args"]["backend"] == "journal"
+        assert events["inner"]["cat"] == "persistence"
+        assert events["stream"]["args"]["parent_id"] == outer.span_id
+        assert events["outer"]["dur"] >= events["inner"]["dur"]
+
+    def test_error_recorded(self, tmp_path):
+        """Test an exception is noted on the span and propagated."""
+        path = tmp_path / "trace.json"
+        tracer = Tracer(path)
+        with pytest.raises(ValueError):
+            with tracer.span("failing"):
+                raise ValueError("boom")
+        tracer.close()
+        assert read_trace(path)[0]["args"]["error"] == "ValueError"
+
+    def test_chrome_array_format(self, tmp_path):
+        """Test the file is a Chrome trace array, appended to across runs."""
+        path = tmp_path / "trace.json"
+        for _ in range(2):
+            tracer = Tracer(path)
+            with tracer.span("run"):
+                pass
+            tracer.close()
+        text = path.read_text()
+        assert text.startswith("[\n")
+        assert text.count("[") == 1
+        # Viewers accept the unterminated array; closing it yields valid JSON
+        events = json.loads(text.rstrip().rstrip(",") + "]")
+        assert [e["name"] for e in events] == ["run", "run"]
+
+    def test_tasks_get_own_tracks(self, tmp_path):
+        """Test concurrent tasks are shown on separate tracks under the parent."""
+        path = tmp_path / "trace.json"
+        tracer = Tracer(path)
+
+        async def child(name):
+            with tracer.span(name):
+                await asyncio.sleep(0.01)
+
+        async def run():
+            with tracer.span("parent") as parent:
+                await asyncio.gather(child("a"), child("b"))
+            return parent.span_id
+
+        parent_id = asyncio.run(run())
+        tracer.close()
+        events = read_trace(path)
+        spans = {e["name"]: e for e in events if e["ph"] == "X"}
+        assert spans["a"]["args"]["parent_id"] == parent_id
+        assert spans["b"]["args"]["parent_id"] == parent_id
+        assert spans["a"]["tid"] != spans["b"]["tid"]
+        assert any(e["ph"] == "M" and e["name"] == "thread_name" for e in events)
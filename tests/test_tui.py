@@ -1,12 +1,17 @@
 """Tests for TUI application."""
+import asyncio
 import tempfile
 from pathlib import Path
 
 import pytest
+from textual.widgets import TextArea
 
 from agent_collab.config import Config
 from agent_collab.engine import Phase
 from agent_collab.tui import AgentCollabApp
+from agent_collab.tui.conversation import ConversationLog
+
+from agent_stubs import ScriptedAdapter
 
 
 class TestAgentCollabApp:
@@ -81,3 +86,94 @@ class TestAppWorkflow:
 
             assert app.workflow is not None
             assert app.workflow.project_root == project_root
+
+
+class TestConversationOutput:
+    """Tests for conversation output delivery."""
+
+    def test_agent_output_reaches_log_in_order(self):
+        """Test agent and app text are delivered to the log in order."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project_root = Path(tmpdir)
+            (project_root / ".agent-collab").mkdir()
+
+            async def run():
+                app = AgentCollabApp(project_root=project_root)
+                async with app.run_test() as pilot:
+                    app.update_conversation("Agent: ")
+                    app._on_agent_output("hel")
+                    app._on_agent_output("lo")
+                    app.update_conversation("\n[done]\n")
+                    await pilot.pause(0.1)
+                    log = app.query_one("#conversation", ConversationLog)
+                    return list(log.buffer.lines)
+
+            lines = asyncio.run(run())
+            assert lines[-3:] == ["Agent: hello", "[done]", ""]
+
+
+class TestAgentTurns:
+    """Tests for running agent turns as cancellable workers."""
+
+    def test_queue_and_cancel(self):
+        """Test input is queued during a turn and cancel stops the turn."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project_root = Path(tmpdir)
+            (project_root / ".agent-collab").mkdir()
+
+            async def run():
+                app = AgentCollabApp(project_root=project_root)
+                planner = ScriptedAdapter(chunks=["thinking"], hang=True)
+                app.workflow.planner = planner
+                async with app.run_test() as pilot:
+                    app.query_one("#user-input").focus()
+                    await pilot.press(*"build it", "enter")
+                    await pilot.pause(0.1)
+                    assert app.turn_running
+                    # The UI stays responsive and queues further input
+                    await pilot.press(*"more", "enter")
+                    await pilot.pause()
+                    assert list(app._input_queue) == ["more"]
+
+                    await pilot.press("escape")
+                    await pilot.pause(0.1)
+                    assert not app.turn_running
+                    assert not app._input_queue
+                    log = app.query_one("#conversation", ConversationLog)
+                    text = "\n".join(log.buffer.lines)
+                    return planner, text, app.workflow.state.phase
+
+            planner, text, phase = asyncio.run(run())
+            assert len(planner.prompts) == 1
+            assert "[Queued: more]" in text
+            assert "[Cancelled - back to phase init]" in text
+            assert "[Discarded 1 queued input(s)]" in text
+            assert phase == Phase.INIT
+
+
+class TestLiveRefresh:
+    """Tests for file-watch driven tab refresh."""
+
+    def test_plan_tab_follows_file(self):
+        """Test the Plan tab updates when plan.md is written."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project_root = Path(tmpdir)
+            config = Config()
+            config.tui.watch_debounce = 0.05
+            config.get_workdir(project_root).mkdir(parents=True, exist_ok=True)
+            plan_path = config.get_plan_path(project_root)
+
+            async def run():
+                app = AgentCollabApp(project_root=project_root, config=config)
+                async with app.run_test() as pilot:
+                    text_area = app.query_one("#plan-content", TextArea)
+                    assert text_area.text == "(No plan yet)"
+                    await pilot.pause(0.3)
+                    plan_path.write_text("# Plan\n\n- [ ] Step 1: go\n")
+                    for _ in range(100):
+                        await pilot.pause(0.05)
+                        if text_area.text.startswith("# Plan"):
+                            break
+                    return text_area.text
+
+            assert asyncio.run(run()) == "# Plan\n\n- [ ] Step 1: go\n"
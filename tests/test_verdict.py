@@ -0,0 +1,54 @@
+"""Tests for review verdict detection."""
+import tempfile
+from pathlib import Path
+
+from agent_collab.engine import Verdict, VerdictParser, parse_verdict, read_verdict
+
+
+class TestParseVerdict:
+    """Tests for single-line verdict parsing."""
+
+    def test_markers(self):
+        """Test both markers are recognized at line start."""
+        assert parse_verdict("[APPROVED] looks good") == Verdict.APPROVED
+        assert parse_verdict("  [CHANGES_REQUIRED]") == Verdict.CHANGES_REQUIRED
+
+    def test_marker_not_at_start(self):
+        """Test markers mid-line are ignored."""
+        assert parse_verdict("I will write [APPROVED] if ready") is None
+
+
+class TestReadVerdict:
+    """Tests for reading the verdict from comments.md."""
+
+    def test_first_non_empty_line(self):
+        """Test the verdict comes from the first non-empty line only."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "comments.md"
+            path.write_text("\n\n[CHANGES_REQUIRED]\n[APPROVED]\n")
+            assert read_verdict(path) == Verdict.CHANGES_REQUIRED
+
+    def test_missing_file(self):
+        """Test a missing file has no verdict."""
+        assert read_verdict(Path("/nonexistent/comments.md")) is None
+
+
+class TestVerdictParser:
+    """Tests for incremental verdict detection."""
+
+    def test_marker_split_across_chunks(self):
+        """Test a marker split across chunks is detected once complete."""
+        parser = VerdictParser()
+        assert parser.feed("Reviewing the plan...\n[APPR") is None
+        assert parser.feed("OVED]") == Verdict.APPROVED
+
+    def test_first_marker_wins(self):
+        """Test later markers don't change the verdict."""
+        parser = VerdictParser()
+        parser.feed("[CHANGES_REQUIRED]\n")
+        assert parser.feed("[APPROVED]\n") == Verdict.CHANGES_REQUIRED
+
+    def test_prose_mention_ignored(self):
+        """Test a marker mentioned mid-sentence is not a verdict."""
+        parser = VerdictParser()
+        assert parser.feed("I would mark this [APPROVED] after fixes\n") is None
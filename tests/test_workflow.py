@@ -1,13 +1,22 @@
 """Tests for workflow controller."""
+import asyncio
+import json
+import shutil
+import subprocess
 import tempfile
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-from agent_collab.config import Config
-from agent_collab.engine import Phase, WorkflowController
+from agent_collab.adapters import AgentScheduler, TextDelta
+from agent_collab.config import AgentLimit, Config
+from agent_collab.engine import AutopilotResult, Phase, Verdict, WorkflowController
+from agent_collab.engine import workflow as workflow_module
 from agent_collab.persistence import load_state
+from agent_collab.telemetry import Tracer, read_trace
+
+from agent_stubs import ScriptedAdapter
 
 
 class TestWorkflowController:
@@ -42,6 +51,32 @@ class TestWorkflowController:
             assert controller.state.phase == Phase.REVIEW
             assert controller.state.iteration == 2
 
+    def test_journal_backend_persists_phase(self):
+        """Test the journal backend records phase changes and reloads them."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project_root = Path(tmpdir)
+            config = Config()
+            config.persistence.backend = "journal"
+            config.get_workdir(project_root).mkdir(parents=True, exist_ok=True)
+
+            controller = WorkflowController(project_root, config)
+            controller._set_phase(Phase.REFINE_GOAL)
+            asyncio.run(controller.close())
+
+            state_path = config.get_state_path(project_root)
+            assert not state_path.exists()
+            assert state_path.with_name("state.journal.jsonl").exists()
+            assert WorkflowController(project_root, config).state.phase == Phase.REFINE_GOAL
+
+    def test_unknown_backend_rejected(self):
+        """Test a misspelled persistence backend raises instead of falling back."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config = Config()
+            config.persistence.backend = "jounral"
+
+            with pytest.raises(ValueError, match="persistence.backend"):
+                WorkflowController(Path(tmpdir), config)
+
     def test_is_approved_true(self):
         """Test is_approved returns True when approved."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -161,3 +196,619 @@ class TestWorkflowController:
             controller = WorkflowController(project_root, config)
 
             assert controller.get_plan_content() == ""
+
+
+def _make_reviewer(comments_path: Path, approve_on: int) -> ScriptedAdapter:
+    """Reviewer that approves on the given review round."""
+    rounds = []
+
+    def review(prompt):
+        rounds.append(prompt)
+        verdict = "[APPROVED]" if len(rounds) >= approve_on else "[CHANGES_REQUIRED]"
+        comments_path.write_text(f"{verdict}\n\n- feedback {len(rounds)}\n")
+
+    return ScriptedAdapter(review)
+
+
+class TestAutopilot:
+    """Tests for the unattended review loop."""
+
+    def _controller(self, tmpdir: str, **workflow) -> WorkflowController:
+        project_root = Path(tmpdir)
+        config = Config()
+        for key, value in workflow.items():
+            setattr(config.workflow, key, value)
+        config.get_workdir(project_root).mkdir(parents=True, exist_ok=True)
+        controller = WorkflowController(project_root, config)
+        controller.state.phase = Phase.REVIEW
+        controller.planner = ScriptedAdapter()
+        return controller
+
+    def test_runs_until_approved(self):
+        """Test loop alternates review/respond until approval."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            controller = self._controller(tmpdir)
+            controller.reviewer = _make_reviewer(controller.config.get_comments_path(Path(tmpdir)), 3)
+
+            result = asyncio.run(controller.run_autopilot())
+
+            assert result == AutopilotResult.APPROVED
+            assert controller.state.phase == Phase.APPROVED
+            assert controller.state.iteration == 3
+            assert len(controller.planner.prompts) == 2
+
+    def test_stops_at_max_iterations(self):
+        """Test loop stops when max iterations are reached."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            controller = self._controller(tmpdir, max_iterations=2)
+            controller.reviewer = _make_reviewer(controller.config.get_comments_path(Path(tmpdir)), 99)
+
+            result = asyncio.run(controller.run_autopilot())
+
+            assert result == AutopilotResult.MAX_ITERATIONS
+            assert controller.state.phase == Phase.RESPOND
+            assert controller.state.iteration == 2
+
+    def test_pause_point(self):
+        """Test loop hands control back before a configured phase."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            controller = self._controller(tmpdir)
+            controller.reviewer = _make_reviewer(controller.config.get_comments_path(Path(tmpdir)), 99)
+
+            result = asyncio.run(controller.run_autopilot(pause_on=["respond"]))
+
+            assert result == AutopilotResult.PAUSED
+            assert controller.state.phase == Phase.RESPOND
+            assert controller.state.iteration == 1
+
+    def test_time_budget_cancels_turn(self):
+        """Test a turn running past the budget is cancelled."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            controller = self._controller(tmpdir)
+            controller.reviewer = ScriptedAdapter(delay=5)
+
+            result = asyncio.run(controller.run_autopilot(time_budget=0.05))
+
+            assert result == AutopilotResult.BUDGET_EXHAUSTED
+            assert controller.state.phase == Phase.REVIEW
+            assert controller.state.iteration == 0
+
+    def test_records_each_iteration(self):
+        """Test every review stores that iteration's plan and comments."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            controller = self._controller(tmpdir)
+            plan_path = controller.config.get_plan_path(Path(tmpdir))
+            plan_path.write_text("# Plan v1\n")
+            controller.planner = ScriptedAdapter(
+                lambda prompt: plan_path.write_text(plan_path.read_text() + "- revised\n")
+            )
+            controller.reviewer = _make_reviewer(controller.config.get_comments_path(Path(tmpdir)), 3)
+
+            asyncio.run(controller.run_autopilot())
+
+            assert sorted(controller.state.history) == [1, 2, 3]
+            assert controller.get_version(1, "plan") == "# Plan v1\n"
+            assert controller.get_version(3, "plan") == "# Plan v1\n- revised\n- revised\n"
+            assert controller.get_version(2, "comments") == "[CHANGES_REQUIRED]\n\n- [C2] (major) [open] feedback 2\n"
+            assert controller.get_version(4, "plan") is None
+
+    def test_later_reviews_see_only_changes(self):
+        """Test reviews after the first get the changed sections and last comments."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            controller = self._controller(tmpdir)
+            plan_path = controller.config.get_plan_path(Path(tmpdir))
+            steps = "".join(f"## Step {i}: part {i}\n- details for part {i}\n\n" for i in range(1, 9))
+            plan_path.write_text("# Plan\n\n" + steps)
+            controller.planner = ScriptedAdapter(
+                lambda prompt: plan_path.write_text(
+                    plan_path.read_text().replace("details for part 3", "clearer details for part 3")
+                )
+            )
+            controller.reviewer = _make_reviewer(controller.config.get_comments_path(Path(tmpdir)), 2)
+
+            asyncio.run(controller.run_autopilot())
+
+            first, second = controller.reviewer.prompts
+            assert first.startswith("Review the implementation plan")
+            assert "clearer details for part 3" in second
+            assert "part 5" not in second
+            assert "- [C1] (major) [open] feedback 1" in second
+
+    def test_incremental_review_can_be_disabled(self):
+        """Test incremental_review = false always reviews the full plan."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            controller = self._controller(tmpdir, incremental_review=False)
+            controller.reviewer = _make_reviewer(controller.config.get_comments_path(Path(tmpdir)), 2)
+
+            asyncio.run(controller.run_autopilot())
+
+            assert all(
+                prompt.startswith("Review the implementation plan")
+                for prompt in controller.reviewer.prompts
+            )
+
+    def test_comment_lifecycle(self):
+        """Test the planner sees open comments and the reviewer sees claimed fixes."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            controller = self._controller(tmpdir)
+            comments_path = controller.config.get_comments_path(Path(tmpdir))
+            plan_path = controller.config.get_plan_path(Path(tmpdir))
+            plan_path.write_text("# Plan\n\n" + "".join(f"## Step {i}\n- do {i}\n\n" for i in range(1, 6)))
+
+            def review(prompt):
+                if len(controller.reviewer.prompts) == 1:
+                    comments_path.write_text(
+                        "[CHANGES_REQUIRED]\n\n- [C1] (critical) [open] Step 2 is vague\n- Missing tests\n"
+                    )
+                else:
+                    comments_path.write_text(
+                        "[CHANGES_REQUIRED]\n\n- [C1] (critical) [resolved] Step 2 is vague\n"
+                        "- [C2] (major) [open] Missing tests\n- Step 4 is slow\n"
+                    )
+
+            def respond(prompt):
+                plan_path.write_text(plan_path.read_text().replace("- do 2", "- do 2 carefully"))
+                comments_path.write_text(comments_path.read_text().replace(
+                    "[C1] (critical) [open]", "[C1] (critical) [fixed]"
+                ))
+
+            controller.reviewer = ScriptedAdapter(review)
+            controller.planner = ScriptedAdapter(respond)
+
+            asyncio.run(controller.run_autopilot(pause_on=["review"]))
+            assert "[C2] (major) [open] Missing tests" in controller.planner.prompts[0]
+            controller.state.phase = Phase.REVIEW
+            asyncio.run(controller.review_plan())
+
+            second = controller.reviewer.prompts[1]
+            fixed, still_open = second.split("These comments are still open:")
+            assert "[C1] (critical) [fixed] Step 2 is vague" in fixed
+            assert "[C2] (major) [open] Missing tests" in still_open
+            assert "numbered from C3" in second
+            assert "- [C3] (major) [open] Step 4 is slow" in comments_path.read_text()
+            assert controller.open_comment_counts() == {1: 2, 2: 2}
+
+    def test_stops_when_loop_stalls(self):
+        """Test autopilot stops when the planner stops changing the plan."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            controller = self._controller(tmpdir, max_iterations=10)
+            controller.config.get_plan_path(Path(tmpdir)).write_text("# Plan\n\n- [ ] Step 1: go\n")
+            controller.reviewer = _make_reviewer(controller.config.get_comments_path(Path(tmpdir)), 99)
+
+            result = asyncio.run(controller.run_autopilot())
+
+            assert result == AutopilotResult.STALLED
+            assert controller.state.iteration == 3
+            assert controller.state.phase == Phase.RESPOND
+            assert "changed under" in controller.last_stall.detail
+
+            controller.config.workflow.stall_detection = False
+            assert asyncio.run(controller.run_autopilot()) == AutopilotResult.MAX_ITERATIONS
+
+    def test_records_metrics(self):
+        """Test turns, saves and phase changes are timed and exported."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            controller = self._controller(tmpdir)
+            controller.reviewer = _make_reviewer(controller.config.get_comments_path(Path(tmpdir)), 2)
+
+            asyncio.run(controller.run_autopilot())
+
+            metrics = controller.metrics
+            assert metrics.histogram("agent_turn_seconds", agent="reviewer", phase="review").count == 2
+            assert metrics.histogram("agent_turn_seconds", agent="planner", phase="respond").count == 1
+            assert metrics.histogram("agent_first_chunk_seconds", agent="planner", phase="respond").count == 1
+            assert metrics.histogram("agent_stream_bytes", agent="planner", phase="respond").sum == 2
+            assert metrics.histogram("phase_transition_seconds", phase="approved").count == 1
+            data = json.loads(controller.config.get_metrics_path(Path(tmpdir)).read_text())
+            assert "state_save_seconds" in data
+            assert controller.config.get_prometheus_path(Path(tmpdir)).exists()
+
+    def test_queue_time_reported_separately(self):
+        """Test time waiting for the scheduler is not counted as agent time."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            controller = self._controller(tmpdir)
+            controller.config.limits = {"claude": AgentLimit(max_concurrent=1)}
+            scheduler = AgentScheduler(controller.config.limits)
+            controller.reviewer = _make_reviewer(controller.config.get_comments_path(Path(tmpdir)), 1)
+            controller.reviewer.lane = scheduler.lane("claude", "test")
+
+            async def run():
+                # Another workflow holds the only claude slot for a while
+                await scheduler.acquire("claude")
+                asyncio.get_running_loop().call_later(0.1, scheduler.release, "claude")
+                await controller.review_plan()
+
+            asyncio.run(run())
+
+            labels = {"agent": "reviewer", "phase": "review"}
+            queued = controller.metrics.histogram("agent_queue_seconds", **labels)
+            assert queued.count == 1
+            assert queued.sum >= 0.09
+            assert controller.metrics.histogram("agent_turn_seconds", **labels).sum < 0.09
+
+    def test_writes_trace(self):
+        """Test commands, turns, prompts, saves and adapter streams become spans."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            controller = self._controller(tmpdir)
+            controller.config.telemetry.trace = True
+            controller.tracer = Tracer(controller.config.get_trace_path(Path(tmpdir)))
+            controller.planner.tracer = controller.tracer
+            controller.reviewer = _make_reviewer(controller.config.get_comments_path(Path(tmpdir)), 2)
+
+            asyncio.run(controller.run_autopilot())
+            asyncio.run(controller.close())
+
+            spans = [e for e in read_trace(controller.config.get_trace_path(Path(tmpdir))) if e["ph"] == "X"]
+            by_id = {e["args"]["span_id"]: e for e in spans}
+            names = {e["name"] for e in spans}
+            assert {"autopilot", "review_plan", "respond_to_comments", "agent_turn",
+                    "load_prompt", "save_state", "set_phase", "adapter.stream"} <= names
+            stream = next(e for e in spans if e["name"] == "adapter.stream")
+            assert by_id[stream["args"]["parent_id"]]["name"] == "agent_turn"
+            review = next(e for e in spans if e["name"] == "review_plan")
+            assert by_id[review["args"]["parent_id"]]["name"] == "autopilot"
+
+    def test_requires_review_loop_phase(self):
+        """Test autopilot refuses to start outside the review loop."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            controller = self._controller(tmpdir)
+            controller.state.phase = Phase.INIT
+
+            with pytest.raises(ValueError, match="Autopilot requires"):
+                asyncio.run(controller.run_autopilot())
+
+
+class TestEarlyVerdict:
+    """Tests for proceeding as soon as the review verdict is final."""
+
+    def test_review_returns_before_turn_finishes(self):
+        """Test review_plan proceeds once the verdict is observed and confirmed."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project_root = Path(tmpdir)
+            config = Config()
+            config.workflow.early_verdict = True
+            config.get_workdir(project_root).mkdir(parents=True, exist_ok=True)
+            comments_path = config.get_comments_path(project_root)
+
+            class SlowTailReviewer(ScriptedAdapter):
+                async def _open_stream(self, prompt):
+                    comments_path.write_text("[CHANGES_REQUIRED]\n\n- fix step 2\n")
+                    yield TextDelta("[CHANGES_REQUIRED]\n")
+                    await asyncio.sleep(0.3)
+                    yield TextDelta("trailing summary")
+
+            output = []
+            controller = WorkflowController(project_root, config, on_output=output.append)
+            controller.state.phase = Phase.REVIEW
+            controller.reviewer = SlowTailReviewer()
+
+            async def run():
+                loop = asyncio.get_running_loop()
+                start = loop.time()
+                await controller.review_plan()
+                elapsed = loop.time() - start
+                phase = controller.state.phase
+                await controller.close()
+                return elapsed, phase
+
+            elapsed, phase = asyncio.run(run())
+
+            assert elapsed < 0.2
+            assert phase == Phase.RESPOND
+            assert output == ["[CHANGES_REQUIRED]\n", "trailing summary"]
+
+    def test_unconfirmed_stream_verdict_waits(self):
+        """Test a stream verdict not yet in comments.md doesn't end the turn early."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project_root = Path(tmpdir)
+            config = Config()
+            config.workflow.early_verdict = True
+            config.get_workdir(project_root).mkdir(parents=True, exist_ok=True)
+            comments_path = config.get_comments_path(project_root)
+
+            class LateWriteReviewer(ScriptedAdapter):
+                async def _open_stream(self, prompt):
+                    yield TextDelta("[APPROVED]\n")
+                    comments_path.write_text("[APPROVED]\n")
+                    yield TextDelta("done")
+
+            controller = WorkflowController(project_root, config)
+            controller.state.phase = Phase.REVIEW
+            controller.reviewer = LateWriteReviewer()
+
+            asyncio.run(controller.review_plan())
+
+            assert controller.state.phase == Phase.APPROVED
+
+
+    def test_previous_round_comments_not_final(self):
+        """Test last round's comments.md doesn't confirm this round's verdict."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project_root = Path(tmpdir)
+            config = Config()
+            config.workflow.early_verdict = True
+            config.get_workdir(project_root).mkdir(parents=True, exist_ok=True)
+            comments_path = config.get_comments_path(project_root)
+            comments_path.write_text("[CHANGES_REQUIRED]\n\n- old issue\n")
+
+            class RewritingReviewer(ScriptedAdapter):
+                async def _open_stream(self, prompt):
+                    yield TextDelta("[CHANGES_REQUIRED]\n")
+                    await asyncio.sleep(0.05)
+                    comments_path.write_text("[CHANGES_REQUIRED]\n\n- new issue\n")
+                    yield TextDelta("done")
+
+            controller = WorkflowController(project_root, config)
+            controller.state.phase = Phase.REVIEW
+            controller.reviewer = RewritingReviewer()
+
+            asyncio.run(controller.review_plan())
+
+            comments = controller.get_version(1, "comments")
+            assert "new issue" in comments
+            assert "old issue" not in comments
+            assert "[C1]" in comments_path.read_text()
+
+
+    def test_unchanged_file_not_reread(self, monkeypatch):
+        """Test streamed chunks only read comments.md after it changes."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project_root = Path(tmpdir)
+            config = Config()
+            config.workflow.early_verdict = True
+            config.get_workdir(project_root).mkdir(parents=True, exist_ok=True)
+            comments_path = config.get_comments_path(project_root)
+            comments_path.write_text("[APPROVED]\n")
+
+            reads = []
+            monkeypatch.setattr(
+                workflow_module, "read_verdict", lambda path: reads.append(path) or Verdict.APPROVED
+            )
+            read_bytes = Path.read_bytes
+
+            def guarded_read_bytes(path):
+                assert path != comments_path, "comments.md read in full"
+                return read_bytes(path)
+
+            monkeypatch.setattr(Path, "read_bytes", guarded_read_bytes)
+
+            class ChattyReviewer(ScriptedAdapter):
+                async def _open_stream(self, prompt):
+                    yield TextDelta("[APPROVED]\n")
+                    for _ in range(50):
+                        yield TextDelta("more ")
+                    comments_path.write_text("[APPROVED]\n\nLooks good.\n")
+                    yield TextDelta("done")
+
+            controller = WorkflowController(project_root, config)
+            controller.state.phase = Phase.REVIEW
+            controller.reviewer = ChattyReviewer()
+
+            asyncio.run(controller.review_plan())
+
+            assert len(reads) == 2  # the early-verdict check, then is_approved()
+            assert controller.state.phase == Phase.APPROVED
+
+
+class TestParallelReviewers:
+    """Tests for multi-reviewer fan-out."""
+
+    def test_unknown_policy_rejected_up_front(self):
+        """Test an unknown review policy fails before any reviewer runs."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config = Config()
+            config.roles.reviewers = ["claude", "codex"]
+            config.workflow.review_policy = "unanimous"
+
+            with pytest.raises(ValueError, match="Unknown review policy"):
+                WorkflowController(Path(tmpdir), config)
+
+    def test_reviewers_run_concurrently_and_merge(self):
+        """Test reviewers overlap in time and their comments are merged."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project_root = Path(tmpdir)
+            config = Config()
+            config.roles.reviewers = ["claude", "codex"]
+            config.workflow.review_policy = "any"
+            config.get_workdir(project_root).mkdir(parents=True, exist_ok=True)
+
+            controller = WorkflowController(project_root, config)
+            controller.state.phase = Phase.REVIEW
+            assert len(controller.reviewers) == 2
+
+            def writer(verdict, issue):
+                def write(prompt):
+                    path = Path(prompt.split("Write your review to `")[1].split("`")[0])
+                    path.write_text(f"{verdict}\n\n- {issue}\n")
+                return write
+
+            controller.reviewers = [
+                ScriptedAdapter(writer("[CHANGES_REQUIRED]", "Add tests"), delay=0.2),
+                ScriptedAdapter(writer("[APPROVED]", "add tests"), delay=0.2),
+            ]
+
+            async def run():
+                loop = asyncio.get_running_loop()
+                start = loop.time()
+                await controller.review_plan()
+                return loop.time() - start
+
+            elapsed = asyncio.run(run())
+
+            assert elapsed < 0.35
+            assert controller.state.phase == Phase.APPROVED
+            merged = controller.get_comments_content()
+            assert merged.startswith("[APPROVED]")
+            assert "- [C1] (major) [open] Add tests (claude #1, codex #2)" in merged
+
+
+class TestExecutePlan:
+    """Tests for walking plan steps."""
+
+    def test_executes_pending_steps_and_finishes(self):
+        """Test each pending step runs once and the workflow completes."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project_root = Path(tmpdir)
+            config = Config()
+            config.get_workdir(project_root).mkdir(parents=True, exist_ok=True)
+            plan_path = config.get_plan_path(project_root)
+            plan_path.write_text("- [x] Step 1: done\n- [ ] Step 2: build\n- [ ] Step 3: test\n")
+
+            def check_off(prompt):
+                number = prompt.split("Execute step ")[1].split(" ")[0]
+                text = plan_path.read_text().replace(f"- [ ] Step {number}:", f"- [x] Step {number}:")
+                plan_path.write_text(text)
+
+            controller = WorkflowController(project_root, config)
+            controller.state.phase = Phase.APPROVED
+            controller.planner = ScriptedAdapter(check_off)
+
+            seen = []
+            executed = asyncio.run(controller.execute_plan(on_step=lambda s: seen.append(s.title)))
+
+            assert executed == [2, 3]
+            assert seen == ["build", "test"]
+            assert controller.state.phase == Phase.DONE
+
+    def test_all_steps_already_done(self):
+        """Test an approved plan with every step checked off finishes without running."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project_root = Path(tmpdir)
+            config = Config()
+            config.get_workdir(project_root).mkdir(parents=True, exist_ok=True)
+            config.get_plan_path(project_root).write_text("- [x] Step 1: build\n")
+
+            controller = WorkflowController(project_root, config)
+            controller.state.phase = Phase.APPROVED
+            controller.planner = ScriptedAdapter()
+
+            assert asyncio.run(controller.execute_plan()) == []
+            assert controller.state.phase == Phase.DONE
+            assert controller.planner.prompts == []
+
+    def test_execute_step_looks_up_content(self):
+        """Test execute_step fills step content from the index."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project_root = Path(tmpdir)
+            config = Config()
+            config.get_workdir(project_root).mkdir(parents=True, exist_ok=True)
+            config.get_plan_path(project_root).write_text("- [ ] Step 1: build the thing\n")
+
+            controller = WorkflowController(project_root, config)
+            controller.state.phase = Phase.APPROVED
+            controller.planner = ScriptedAdapter()
+
+            asyncio.run(controller.execute_step(1))
+
+            assert "build the thing" in controller.planner.prompts[0]
+            with pytest.raises(ValueError, match="no step 7"):
+                asyncio.run(controller.execute_step(7))
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+class TestExecutePlanParallel:
+    """Tests for executing plan steps in git worktrees."""
+
+    def test_steps_run_in_worktrees_and_are_checked_off(self):
+        """Test each step gets its own planner in a worktree and is merged."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project_root = Path(tmpdir)
+            for args in (["init", "-q"], ["config", "user.name", "T"], ["config", "user.email", "t@e.com"]):
+                subprocess.run(["git", *args], cwd=project_root, check=True)
+            (project_root / ".gitignore").write_text(".agent-collab/\n")
+            subprocess.run(["git", "add", "."], cwd=project_root, check=True)
+            subprocess.run(["git", "commit", "-q", "-m", "init"], cwd=project_root, check=True)
+
+            config = Config()
+            config.workflow.max_parallel_steps = 2
+            config.get_workdir(project_root).mkdir(parents=True, exist_ok=True)
+            config.get_plan_path(project_root).write_text(
+                "- [ ] Step 1: one\n- [ ] Step 2: two\n- [ ] Step 3: three (depends on step 1)\n"
+            )
+
+            controller = WorkflowController(project_root, config)
+            controller.state.phase = Phase.APPROVED
+            adapters = {}
+
+            def create(role, agent_type, working_dir=None):
+                adapter = ScriptedAdapter(
+                    lambda prompt: (working_dir / f"{role}.txt").write_text(prompt)
+                )
+                adapters[role] = (adapter, working_dir)
+                return adapter
+
+            controller._create_role_adapter = create
+            outcomes = asyncio.run(controller.execute_plan_parallel())
+
+            assert [o.number for o in outcomes] == [1, 2, 3]
+            assert [o.error for o in outcomes] == ["", "", ""]
+            assert sorted(adapters) == ["step1", "step2", "step3"]
+            assert all(path != project_root for _, path in adapters.values())
+            assert "Execute step 3" in (project_root / "step3.txt").read_text()
+            assert controller.get_plan_index().pending() == []
+            assert controller.state.phase == Phase.DONE
+
+
+class TestCancellable:
+    """Tests for rolling back a cancelled turn."""
+
+    def test_cancel_restores_state_and_files(self):
+        """Test cancelling mid-turn restores phase, sessions and plan file."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project_root = Path(tmpdir)
+            config = Config()
+            config.get_workdir(project_root).mkdir(parents=True, exist_ok=True)
+            plan_path = config.get_plan_path(project_root)
+
+            controller = WorkflowController(project_root, config)
+            controller.state.phase = Phase.REFINE_GOAL
+            controller.state.planner_session = "before"
+            controller.planner = ScriptedAdapter(
+                lambda prompt: plan_path.write_text("half a plan"), chunks=["partial"], hang=True
+            )
+            controller.planner._session_id = "before"
+            phases = []
+            controller.on_phase_change = phases.append
+
+            async def turn():
+                async with controller.cancellable():
+                    controller.planner._session_id = "during"
+                    await controller.write_plan()
+
+            async def run():
+                task = asyncio.create_task(turn())
+                while not plan_path.exists():
+                    await asyncio.sleep(0.01)
+                assert controller.state.phase == Phase.WRITE_PLAN
+                task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await task
+
+            asyncio.run(run())
+
+            assert controller.state.phase == Phase.REFINE_GOAL
+            assert not plan_path.exists()
+            assert controller.planner.session_id == "before"
+            assert phases[-1] == Phase.REFINE_GOAL
+            assert load_state(config.get_state_path(project_root)).phase == Phase.REFINE_GOAL
+
+    def test_completed_turn_untouched(self):
+        """Test a turn that finishes normally keeps its changes."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project_root = Path(tmpdir)
+            config = Config()
+            config.get_workdir(project_root).mkdir(parents=True, exist_ok=True)
+            plan_path = config.get_plan_path(project_root)
+
+            controller = WorkflowController(project_root, config)
+            controller.state.phase = Phase.REFINE_GOAL
+            controller.planner = ScriptedAdapter(lambda prompt: plan_path.write_text("plan"))
+
+            async def turn():
+                async with controller.cancellable():
+                    await controller.write_plan()
+
+            asyncio.run(turn())
+
+            assert controller.state.phase == Phase.REVIEW
+            assert plan_path.read_text() == "plan"